@@ -0,0 +1,145 @@
+package edu.illinois.extension;
+
+import java.io.File;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.OutputStreamWriter;
+import java.io.Writer;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.List;
+
+import org.apache.maven.AbstractMavenLifecycleParticipant;
+import org.apache.maven.MavenExecutionException;
+import org.apache.maven.execution.MavenSession;
+import org.apache.maven.project.DefaultDependencyResolutionRequest;
+import org.apache.maven.project.DependencyResolutionException;
+import org.apache.maven.project.DependencyResolutionResult;
+import org.apache.maven.project.MavenProject;
+import org.apache.maven.project.ProjectDependenciesResolver;
+import org.codehaus.plexus.component.annotations.Component;
+import org.codehaus.plexus.component.annotations.Requirement;
+import org.eclipse.aether.graph.Dependency;
+
+// writes the modules of the reactor with their output directories and resolved
+// classpaths to the file given by -Dexli.reactor.json, does nothing otherwise
+@Component( role = AbstractMavenLifecycleParticipant.class, hint = "reactor-info")
+public class ReactorInfoExtension extends AbstractMavenLifecycleParticipant
+{
+    public static final String OUTPUT_PROPERTY = "exli.reactor.json";
+
+    @Requirement
+    private ProjectDependenciesResolver dependenciesResolver;
+
+    @Override
+    public void afterSessionEnd( MavenSession session )
+        throws MavenExecutionException
+    {
+        String outputPath = session.getUserProperties().getProperty(OUTPUT_PROPERTY);
+        if (outputPath == null) {
+            outputPath = session.getSystemProperties().getProperty(OUTPUT_PROPERTY);
+        }
+        if (outputPath == null) {
+            return;
+        }
+
+        StringBuilder json = new StringBuilder();
+        json.append("{\"root\": ").append(quote(session.getExecutionRootDirectory()));
+        json.append(", \"modules\": [");
+        boolean first = true;
+        for (MavenProject project : session.getProjects()) {
+            if (!first) {
+                json.append(", ");
+            }
+            first = false;
+            appendModule(json, project, session);
+        }
+        json.append("]}\n");
+
+        try (Writer writer = new OutputStreamWriter(new FileOutputStream(outputPath), StandardCharsets.UTF_8)) {
+            writer.write(json.toString());
+        } catch (IOException ioe) {
+            throw new MavenExecutionException("Unable to write reactor info to " + outputPath, ioe);
+        }
+    }
+
+    private void appendModule(StringBuilder json, MavenProject project, MavenSession session) {
+        json.append("{\"group_id\": ").append(quote(project.getGroupId()));
+        json.append(", \"artifact_id\": ").append(quote(project.getArtifactId()));
+        json.append(", \"version\": ").append(quote(project.getVersion()));
+        json.append(", \"packaging\": ").append(quote(project.getPackaging()));
+        json.append(", \"basedir\": ").append(quote(project.getBasedir().getAbsolutePath()));
+        json.append(", \"output_dir\": ").append(quote(project.getBuild().getOutputDirectory()));
+        json.append(", \"test_output_dir\": ").append(quote(project.getBuild().getTestOutputDirectory()));
+
+        // all scopes, same as dependency:build-classpath
+        List<String> classpath = new ArrayList<String>();
+        String error = null;
+        DependencyResolutionResult result;
+        try {
+            result = dependenciesResolver.resolve(
+                new DefaultDependencyResolutionRequest(project, session.getRepositorySession()));
+        } catch (DependencyResolutionException dre) {
+            result = dre.getResult();
+            error = dre.getMessage();
+        }
+        if (result != null) {
+            for (Dependency dependency : result.getDependencies()) {
+                File file = dependency.getArtifact().getFile();
+                if (file != null) {
+                    classpath.add(file.getAbsolutePath());
+                }
+            }
+        }
+        json.append(", \"classpath\": ");
+        if (error != null) {
+            // partially resolved, let the caller fall back to dependency:build-classpath
+            json.append("null");
+        } else {
+            json.append("[");
+            for (int i = 0; i < classpath.size(); i++) {
+                if (i > 0) {
+                    json.append(", ");
+                }
+                json.append(quote(classpath.get(i)));
+            }
+            json.append("]");
+        }
+        json.append(", \"error\": ").append(quote(error));
+        json.append("}");
+    }
+
+    private static String quote(String value) {
+        if (value == null) {
+            return "null";
+        }
+        StringBuilder sb = new StringBuilder("\"");
+        for (int i = 0; i < value.length(); i++) {
+            char c = value.charAt(i);
+            switch (c) {
+                case '"':
+                    sb.append("\\\"");
+                    break;
+                case '\\':
+                    sb.append("\\\\");
+                    break;
+                case '\n':
+                    sb.append("\\n");
+                    break;
+                case '\r':
+                    sb.append("\\r");
+                    break;
+                case '\t':
+                    sb.append("\\t");
+                    break;
+                default:
+                    if (c < 0x20) {
+                        sb.append(String.format("\\u%04x", (int) c));
+                    } else {
+                        sb.append(c);
+                    }
+            }
+        }
+        return sb.append("\"").toString();
+    }
+}
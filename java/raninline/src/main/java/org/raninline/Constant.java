@@ -36,6 +36,12 @@ public class Constant {
         static String r0TestPath;
         static String r1TestPath;
         static String inlineTestName = ""; // default inline test name
+        static int logBufferSize = 64 * 1024; // chars buffered per log file before writing
+        static long logFlushInterval = 1000; // ms, buffered logs older than this are written on the next append
+        final static int MAX_OPEN_LOG_WRITERS = 16;
+        final static String REDUCTION_FULL = "full"; // analyze all classes for every coverage snapshot
+        final static String REDUCTION_DELTA = "delta"; // analyze only classes whose probes changed
+        static String reduction = REDUCTION_FULL; // r1 reduction strategy
         final static String CONFIGURE_FILE_NAME = ".inlinegenrc";
         final static String INLINE_GEN_DIR_NAME = ".inlinegen";
         final static String SERIALIZED_DATA_DIR_NAME = "serialized-data";
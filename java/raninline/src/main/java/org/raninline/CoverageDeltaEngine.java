@@ -0,0 +1,233 @@
+package org.raninline;
+
+import java.io.ByteArrayInputStream;
+import java.io.ByteArrayOutputStream;
+import java.io.File;
+import java.io.IOException;
+import java.io.InputStream;
+import java.nio.file.Files;
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.Set;
+
+import org.jacoco.agent.rt.IAgent;
+import org.jacoco.agent.rt.RT;
+import org.jacoco.core.analysis.Analyzer;
+import org.jacoco.core.analysis.CoverageBuilder;
+import org.jacoco.core.analysis.IClassCoverage;
+import org.jacoco.core.data.ExecutionData;
+import org.jacoco.core.data.ExecutionDataStore;
+import org.jacoco.core.tools.ExecFileLoader;
+
+/**
+ * Coverage delta engine used by the "delta" r1 reduction strategy.
+ *
+ * The full strategy analyzes every class in the classes directory for every
+ * snapshot. This engine reads the class files once, keeps snapshots as the raw
+ * probe arrays of the agent, and only analyzes the classes whose probes differ
+ * between two snapshots. Classes with the same probes have the same line
+ * coverage, so they cannot change the result of
+ * {@link InstrumentHelper#coverageChanged(CoverageBuilder, CoverageBuilder, String)}.
+ */
+public class CoverageDeltaEngine {
+    private static final int MAX_CACHED_ANALYSES = 10000;
+
+    private final Map<String, byte[]> classBytes = new HashMap<String, byte[]>(); // vm class name -> class file
+    private final Map<String, Long> classIds = new HashMap<String, Long>(); // vm class name -> class id in the agent
+    // analysis of a class with a given probe array, most recently used last
+    private final Map<ProbesKey, IClassCoverage> analysisCache = new LinkedHashMap<ProbesKey, IClassCoverage>(16,
+            0.75f, true) {
+        @Override
+        protected boolean removeEldestEntry(Map.Entry<ProbesKey, IClassCoverage> eldest) {
+            return size() > MAX_CACHED_ANALYSES;
+        }
+    };
+
+    public CoverageDeltaEngine(String classesDirectory) {
+        File classesDirectoryFile = new File(classesDirectory);
+        if (!classesDirectoryFile.exists()) {
+            throw new RuntimeException("Classes directory does not exist: " + classesDirectory);
+        }
+        try {
+            loadClasses(classesDirectoryFile, "");
+            loadClass("org/raninline/IT_String",
+                    InstrumentHelper.class.getClassLoader().getResourceAsStream("org/raninline/IT_String.class"));
+            loadClass("org/raninline/IT_Matcher",
+                    InstrumentHelper.class.getClassLoader().getResourceAsStream("org/raninline/IT_Matcher.class"));
+        } catch (IOException e) {
+            throw new RuntimeException(e);
+        }
+    }
+
+    private void loadClasses(File dir, String packagePath) throws IOException {
+        File[] children = dir.listFiles();
+        if (children == null) {
+            return;
+        }
+        for (File child : children) {
+            if (child.isDirectory()) {
+                loadClasses(child, packagePath + child.getName() + "/");
+            } else if (child.getName().endsWith(".class")) {
+                String name = child.getName().substring(0, child.getName().length() - ".class".length());
+                classBytes.put(packagePath + name, Files.readAllBytes(child.toPath()));
+            }
+        }
+    }
+
+    private void loadClass(String name, InputStream in) throws IOException {
+        if (in == null) {
+            return;
+        }
+        try {
+            ByteArrayOutputStream out = new ByteArrayOutputStream();
+            byte[] buffer = new byte[8192];
+            int n;
+            while ((n = in.read(buffer)) != -1) {
+                out.write(buffer, 0, n);
+            }
+            classBytes.put(name, out.toByteArray());
+        } finally {
+            in.close();
+        }
+    }
+
+    /**
+     * Copy the probe arrays of the analyzed classes from the agent
+     *
+     * @return vm class name -> probes
+     */
+    public Map<String, boolean[]> snapshot() {
+        try {
+            IAgent agent = RT.getAgent();
+            ExecFileLoader execFileLoader = new ExecFileLoader();
+            execFileLoader.load(new ByteArrayInputStream(agent.getExecutionData(false)));
+            Map<String, boolean[]> probes = new HashMap<String, boolean[]>();
+            for (ExecutionData data : execFileLoader.getExecutionDataStore().getContents()) {
+                if (classBytes.containsKey(data.getName())) {
+                    probes.put(data.getName(), data.getProbes().clone());
+                    classIds.put(data.getName(), data.getId());
+                }
+            }
+            return probes;
+        } catch (IOException e) {
+            throw new RuntimeException(e);
+        }
+    }
+
+    /**
+     * Names of the classes whose probes differ between two snapshots
+     *
+     * @param oldSnapshot
+     * @param newSnapshot
+     * @return
+     */
+    public static Set<String> changedClasses(Map<String, boolean[]> oldSnapshot, Map<String, boolean[]> newSnapshot) {
+        Set<String> changed = new HashSet<String>();
+        for (Map.Entry<String, boolean[]> entry : newSnapshot.entrySet()) {
+            if (!Arrays.equals(entry.getValue(), oldSnapshot.get(entry.getKey()))) {
+                changed.add(entry.getKey());
+            }
+        }
+        for (String name : oldSnapshot.keySet()) {
+            if (!newSnapshot.containsKey(name)) {
+                changed.add(name);
+            }
+        }
+        return changed;
+    }
+
+    /**
+     * Line coverage of the given classes in a snapshot, classes without probes
+     * in the snapshot are not covered
+     *
+     * @param snapshot
+     * @param classNames vm class names
+     * @return
+     */
+    public CoverageBuilder analyze(Map<String, boolean[]> snapshot, Set<String> classNames) {
+        CoverageBuilder coverageBuilder = new CoverageBuilder();
+        for (String name : classNames) {
+            byte[] bytes = classBytes.get(name);
+            if (bytes == null) {
+                continue;
+            }
+            boolean[] probes = snapshot.get(name);
+            ProbesKey key = new ProbesKey(name, probes);
+            IClassCoverage cc = analysisCache.get(key);
+            if (cc == null) {
+                cc = analyzeClass(name, bytes, probes);
+                if (cc == null) {
+                    continue;
+                }
+                analysisCache.put(key, cc);
+            }
+            coverageBuilder.visitCoverage(cc);
+        }
+        return coverageBuilder;
+    }
+
+    private IClassCoverage analyzeClass(String name, byte[] bytes, boolean[] probes) {
+        ExecutionDataStore store = new ExecutionDataStore();
+        if (probes != null) {
+            store.put(new ExecutionData(classIds.get(name), name, probes.clone()));
+        }
+        CoverageBuilder coverageBuilder = new CoverageBuilder();
+        Analyzer analyzer = new Analyzer(store, coverageBuilder);
+        try {
+            analyzer.analyzeClass(bytes, name);
+        } catch (IOException e) {
+            throw new RuntimeException(e);
+        }
+        for (IClassCoverage cc : coverageBuilder.getClasses()) {
+            return cc;
+        }
+        return null;
+    }
+
+    /**
+     * Check if the coverage increases from the old snapshot to the new snapshot,
+     * same result as comparing the full analyses of both snapshots
+     *
+     * @param oldSnapshot
+     * @param newSnapshot
+     * @param key
+     * @return
+     */
+    public boolean coverageChanged(Map<String, boolean[]> oldSnapshot, Map<String, boolean[]> newSnapshot,
+            String key) {
+        Set<String> changed = changedClasses(oldSnapshot, newSnapshot);
+        if (changed.isEmpty()) {
+            return false;
+        }
+        return InstrumentHelper.coverageChanged(analyze(oldSnapshot, changed), analyze(newSnapshot, changed), key);
+    }
+
+    static class ProbesKey {
+        final String name;
+        final boolean[] probes;
+        final int hash;
+
+        ProbesKey(String name, boolean[] probes) {
+            this.name = name;
+            this.probes = probes == null ? null : probes.clone();
+            this.hash = 31 * name.hashCode() + Arrays.hashCode(probes);
+        }
+
+        @Override
+        public int hashCode() {
+            return hash;
+        }
+
+        @Override
+        public boolean equals(Object o) {
+            if (!(o instanceof ProbesKey)) {
+                return false;
+            }
+            ProbesKey other = (ProbesKey) o;
+            return name.equals(other.name) && Arrays.equals(probes, other.probes);
+        }
+    }
+}
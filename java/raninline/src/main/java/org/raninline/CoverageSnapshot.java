@@ -0,0 +1,100 @@
+package org.raninline;
+
+import java.util.BitSet;
+import java.util.HashMap;
+import java.util.Map;
+import java.util.Set;
+
+import org.jacoco.core.analysis.CoverageBuilder;
+import org.jacoco.core.analysis.IClassCoverage;
+import org.jacoco.core.analysis.ICounter;
+
+/**
+ * Line coverage of a {@link CoverageBuilder} indexed by class name, with the
+ * fully and partly covered lines of each class as bitmaps.
+ */
+public class CoverageSnapshot {
+    final Map<String, ClassLines> classes = new HashMap<String, ClassLines>();
+
+    public CoverageSnapshot(CoverageBuilder coverageBuilder) {
+        for (IClassCoverage cc : coverageBuilder.getClasses()) {
+            ClassLines lines = new ClassLines(cc.getInstructionCounter().getCoveredCount());
+            for (int i = cc.getFirstLine(); i <= cc.getLastLine(); i++) {
+                int status = cc.getLine(i).getStatus();
+                if (status == ICounter.FULLY_COVERED) {
+                    lines.fully.set(i);
+                } else if (status == ICounter.PARTLY_COVERED) {
+                    lines.partly.set(i);
+                }
+            }
+            classes.put(cc.getName(), lines);
+        }
+    }
+
+    CoverageSnapshot() {
+    }
+
+    /**
+     * Lines of a class whose coverage increases from the old snapshot: lines
+     * that become fully covered, and lines that become partly covered from not
+     * covered. All covered lines if the class is not in the old snapshot.
+     *
+     * @param oldSnapshot
+     * @param className
+     * @return
+     */
+    public BitSet changedLines(CoverageSnapshot oldSnapshot, String className) {
+        ClassLines newLines = classes.get(className);
+        if (newLines == null) {
+            return new BitSet();
+        }
+        ClassLines oldLines = oldSnapshot.classes.get(className);
+        if (oldLines == null) {
+            BitSet changed = (BitSet) newLines.fully.clone();
+            changed.or(newLines.partly);
+            return changed;
+        }
+        BitSet changed = (BitSet) newLines.fully.clone();
+        changed.andNot(oldLines.fully);
+        BitSet partly = (BitSet) newLines.partly.clone();
+        partly.andNot(oldLines.fully);
+        partly.andNot(oldLines.partly);
+        changed.or(partly);
+        return changed;
+    }
+
+    /**
+     * Check if the coverage increases from the old snapshot, and record the
+     * newly covered lines of the target statement key
+     *
+     * @param oldSnapshot
+     * @param covered     lines already recorded for the target statement
+     * @return
+     */
+    public boolean coverageChanged(CoverageSnapshot oldSnapshot, Set<String> covered) {
+        boolean changed = false;
+        for (Map.Entry<String, ClassLines> entry : classes.entrySet()) {
+            if (entry.getValue().coveredInstructions == 0) {
+                continue;
+            }
+            String className = entry.getKey();
+            BitSet changedLines = changedLines(oldSnapshot, className);
+            for (int i = changedLines.nextSetBit(0); i >= 0; i = changedLines.nextSetBit(i + 1)) {
+                if (covered.add(className + i)) {
+                    changed = true;
+                }
+            }
+        }
+        return changed;
+    }
+
+    static class ClassLines {
+        final int coveredInstructions;
+        final BitSet fully = new BitSet();
+        final BitSet partly = new BitSet();
+
+        ClassLines(int coveredInstructions) {
+            this.coveredInstructions = coveredInstructions;
+        }
+    }
+}
@@ -0,0 +1,72 @@
+package org.raninline;
+
+import java.util.ArrayList;
+import java.util.List;
+
+import org.junit.internal.TextListener;
+import org.junit.runner.Description;
+import org.junit.runner.Request;
+import org.junit.runner.Result;
+import org.junit.runner.Runner;
+import org.junit.runner.notification.Failure;
+import org.junit.runner.notification.RunListener;
+import org.junit.runner.notification.RunNotifier;
+import org.junit.runner.notification.StoppedByUserException;
+
+/**
+ * Same as org.junit.runner.JUnitCore (same output), but stops at the first
+ * failing test. The failing test is printed after
+ * {@link FailFastLauncher#KILLED_BY}.
+ */
+public class FailFastJUnitCore {
+    public static void main(String[] args) {
+        List<Class<?>> classes = new ArrayList<Class<?>>();
+        for (String className : args) {
+            try {
+                classes.add(Class.forName(className));
+            } catch (ClassNotFoundException cnfe) {
+                System.out.println("Could not find class: " + className);
+            }
+        }
+        Result result = run(classes.toArray(new Class<?>[0]), new TextListener(System.out));
+        System.exit(result.wasSuccessful() ? 0 : 1);
+    }
+
+    public static Result run(Class<?>[] classes, RunListener... listeners) {
+        Runner runner = Request.classes(classes).getRunner();
+        final RunNotifier notifier = new RunNotifier();
+        Result result = new Result();
+        notifier.addListener(result.createListener());
+        for (RunListener listener : listeners) {
+            notifier.addListener(listener);
+        }
+        notifier.addListener(new RunListener() {
+            private boolean killed = false;
+
+            @Override
+            public void testFailure(Failure failure) {
+                if (!killed) {
+                    killed = true;
+                    System.out.println(FailFastLauncher.KILLED_BY + getTestName(failure.getDescription()));
+                }
+                // the next test is not started
+                notifier.pleaseStop();
+            }
+        });
+        notifier.fireTestRunStarted(runner.getDescription());
+        try {
+            runner.run(notifier);
+        } catch (StoppedByUserException sbue) {
+            // stopped at the first failure
+        }
+        notifier.fireTestRunFinished(result);
+        return result;
+    }
+
+    static String getTestName(Description description) {
+        if (description.getMethodName() == null) {
+            return description.getDisplayName();
+        }
+        return description.getClassName() + "#" + description.getMethodName();
+    }
+}
@@ -0,0 +1,229 @@
+package org.raninline;
+
+import static org.junit.platform.engine.discovery.DiscoverySelectors.selectClass;
+import static org.junit.platform.engine.discovery.DiscoverySelectors.selectPackage;
+
+import java.io.File;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.OutputStreamWriter;
+import java.io.Writer;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.List;
+
+import org.junit.platform.engine.DiscoverySelector;
+import org.junit.platform.engine.TestExecutionResult;
+import org.junit.platform.engine.TestSource;
+import org.junit.platform.engine.support.descriptor.ClassSource;
+import org.junit.platform.engine.support.descriptor.MethodSource;
+import org.junit.platform.launcher.Launcher;
+import org.junit.platform.launcher.LauncherDiscoveryRequest;
+import org.junit.platform.launcher.TestExecutionListener;
+import org.junit.platform.launcher.TestIdentifier;
+import org.junit.platform.launcher.TestPlan;
+import org.junit.platform.launcher.core.LauncherDiscoveryRequestBuilder;
+import org.junit.platform.launcher.core.LauncherFactory;
+
+/**
+ * Runs JUnit Platform tests like the console launcher (--select-package,
+ * --select-class, --reports-dir), but stops at the first failing test.
+ * The tests finished so far are written to reports-dir/TEST-junit-jupiter.xml
+ * in the legacy xml format, and the failing test is printed after
+ * {@link #KILLED_BY}. Exits with 1 if a test failed, 0 otherwise.
+ */
+public class FailFastLauncher {
+    public static final String KILLED_BY = "[fail-fast] killed by ";
+    public static final String REPORT_FILE_NAME = "TEST-junit-jupiter.xml";
+
+    public static void main(String[] args) throws IOException {
+        List<DiscoverySelector> selectors = new ArrayList<DiscoverySelector>();
+        String reportsDir = "reports";
+        for (int i = 0; i < args.length; i++) {
+            if ("--select-package".equals(args[i]) && i + 1 < args.length) {
+                selectors.add(selectPackage(args[++i]));
+            } else if ("--select-class".equals(args[i]) && i + 1 < args.length) {
+                selectors.add(selectClass(args[++i]));
+            } else if ("--reports-dir".equals(args[i]) && i + 1 < args.length) {
+                reportsDir = args[++i];
+            } else {
+                System.err.println("Unknown argument: " + args[i]);
+                System.exit(2);
+            }
+        }
+        final File reportFile = new File(reportsDir, REPORT_FILE_NAME);
+        final Listener listener = new Listener();
+        // the platform cannot be cancelled, the jvm exits at the first failure
+        listener.onFailure = new Runnable() {
+            @Override
+            public void run() {
+                try {
+                    listener.writeReport(reportFile);
+                } catch (IOException ioe) {
+                    ioe.printStackTrace();
+                }
+                System.exit(1);
+            }
+        };
+        LauncherDiscoveryRequest request = LauncherDiscoveryRequestBuilder.request().selectors(selectors).build();
+        Launcher launcher = LauncherFactory.create();
+        launcher.execute(request, listener);
+        listener.writeReport(reportFile);
+        System.exit(listener.killer == null ? 0 : 1);
+    }
+
+    static class TestCase {
+        final String className;
+        final String name;
+        // passed, failure, error or skipped
+        final String status;
+        final String message;
+
+        TestCase(String className, String name, String status, String message) {
+            this.className = className;
+            this.name = name;
+            this.status = status;
+            this.message = message;
+        }
+    }
+
+    static class Listener implements TestExecutionListener {
+        final List<TestCase> testCases = new ArrayList<TestCase>();
+        TestPlan testPlan;
+        TestCase killer;
+        Runnable onFailure;
+
+        @Override
+        public void testPlanExecutionStarted(TestPlan testPlan) {
+            this.testPlan = testPlan;
+        }
+
+        @Override
+        public void executionSkipped(TestIdentifier testIdentifier, String reason) {
+            if (testIdentifier.isTest()) {
+                testCases.add(new TestCase(getClassName(testIdentifier), testIdentifier.getLegacyReportingName(), "skipped", reason));
+            }
+        }
+
+        @Override
+        public void executionFinished(TestIdentifier testIdentifier, TestExecutionResult result) {
+            if (!testIdentifier.isTest()) {
+                return;
+            }
+            String status;
+            String message = null;
+            switch (result.getStatus()) {
+                case SUCCESSFUL:
+                    status = "passed";
+                    break;
+                case ABORTED:
+                    status = "skipped";
+                    break;
+                default:
+                    Throwable throwable = result.getThrowable().orElse(null);
+                    // same as the legacy xml report
+                    status = throwable instanceof AssertionError ? "failure" : "error";
+                    message = String.valueOf(throwable);
+            }
+            TestCase testCase = new TestCase(getClassName(testIdentifier), testIdentifier.getLegacyReportingName(), status, message);
+            testCases.add(testCase);
+            if (killer == null && ("failure".equals(status) || "error".equals(status))) {
+                killer = testCase;
+                System.out.println(KILLED_BY + testCase.className + "#" + testCase.name);
+                if (onFailure != null) {
+                    onFailure.run();
+                }
+            }
+        }
+
+        String getClassName(TestIdentifier testIdentifier) {
+            TestSource source = testIdentifier.getSource().orElse(null);
+            if (source instanceof MethodSource) {
+                return ((MethodSource) source).getClassName();
+            }
+            if (source instanceof ClassSource) {
+                return ((ClassSource) source).getClassName();
+            }
+            if (testPlan != null) {
+                TestIdentifier parent = testPlan.getParent(testIdentifier).orElse(null);
+                if (parent != null) {
+                    return getClassName(parent);
+                }
+            }
+            return "";
+        }
+
+        synchronized void writeReport(File reportFile) throws IOException {
+            int failures = 0;
+            int errors = 0;
+            int skipped = 0;
+            for (TestCase testCase : testCases) {
+                if ("failure".equals(testCase.status)) {
+                    failures++;
+                } else if ("error".equals(testCase.status)) {
+                    errors++;
+                } else if ("skipped".equals(testCase.status)) {
+                    skipped++;
+                }
+            }
+            StringBuilder xml = new StringBuilder("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n");
+            xml.append("<testsuite name=\"JUnit Jupiter\" tests=\"").append(testCases.size())
+                .append("\" failures=\"").append(failures)
+                .append("\" errors=\"").append(errors)
+                .append("\" skipped=\"").append(skipped).append("\">\n");
+            for (TestCase testCase : testCases) {
+                xml.append("<testcase name=\"").append(escape(testCase.name))
+                    .append("\" classname=\"").append(escape(testCase.className)).append("\"");
+                if ("passed".equals(testCase.status)) {
+                    xml.append("/>\n");
+                    continue;
+                }
+                xml.append(">\n<").append(testCase.status);
+                if (testCase.message != null) {
+                    xml.append(" message=\"").append(escape(testCase.message)).append("\"");
+                }
+                xml.append("/>\n</testcase>\n");
+            }
+            xml.append("</testsuite>\n");
+            File dir = reportFile.getAbsoluteFile().getParentFile();
+            if (dir != null) {
+                dir.mkdirs();
+            }
+            try (Writer writer = new OutputStreamWriter(new FileOutputStream(reportFile), StandardCharsets.UTF_8)) {
+                writer.write(xml.toString());
+            }
+        }
+    }
+
+    static String escape(String value) {
+        StringBuilder sb = new StringBuilder();
+        for (int i = 0; i < value.length(); i++) {
+            char c = value.charAt(i);
+            switch (c) {
+                case '&':
+                    sb.append("&amp;");
+                    break;
+                case '<':
+                    sb.append("&lt;");
+                    break;
+                case '>':
+                    sb.append("&gt;");
+                    break;
+                case '"':
+                    sb.append("&quot;");
+                    break;
+                case '\n':
+                    sb.append("&#10;");
+                    break;
+                default:
+                    // not allowed in xml 1.0
+                    if (c < 0x20 && c != '\t' && c != '\r') {
+                        sb.append('?');
+                    } else {
+                        sb.append(c);
+                    }
+            }
+        }
+        return sb.toString();
+    }
+}
@@ -1,7 +1,6 @@
 package org.raninline;
 
 import java.io.BufferedReader;
-import java.io.BufferedWriter;
 import java.io.ByteArrayInputStream;
 import java.io.File;
 import java.io.FileReader;
@@ -26,16 +25,18 @@ import org.jacoco.core.analysis.IClassCoverage;
 import org.jacoco.core.analysis.ICounter;
 import org.jacoco.core.tools.ExecFileLoader;
 
-import com.thoughtworks.xstream.XStream;
-
 public class InstrumentHelper {
     static boolean init = false; // init only once
     static Map<String, Integer> srcLineNoCounter = new HashMap<String, Integer>(); // srcPath + lineNo -> counter
     static List<InlineTest> inlineTests = new ArrayList<InlineTest>();
     static Map<String, Integer> allSrcLineNoCounter = new HashMap<String, Integer>();
     static List<InlineTest> allInlineTests = new ArrayList<InlineTest>();
-    static Map<String, CoverageBuilder> classLineNoToCoverageBefore = new HashMap<String, CoverageBuilder>();
-    static Map<String, CoverageBuilder> classLineNoToCoverageAfter = new HashMap<String, CoverageBuilder>();
+    static Map<String, CoverageSnapshot> classLineNoToCoverageBefore = new HashMap<String, CoverageSnapshot>();
+    static Map<String, CoverageSnapshot> classLineNoToCoverageAfter = new HashMap<String, CoverageSnapshot>();
+    // snapshots of the "delta" reduction strategy, see CoverageDeltaEngine
+    static Map<String, Map<String, boolean[]>> classLineNoToSnapshotBefore = new HashMap<String, Map<String, boolean[]>>();
+    static Map<String, Map<String, boolean[]>> classLineNoToSnapshotAfter = new HashMap<String, Map<String, boolean[]>>();
+    static CoverageDeltaEngine coverageDeltaEngine;
     static Map<String, Set<String>> classLineNoToCovered = new HashMap<String, Set<String>>(); // class + lineNo ->
                                                                                                // covered lineNos
     static String inlineGenDir;
@@ -126,20 +127,20 @@ public class InstrumentHelper {
                 // because the unit tests throw exceptions. The target statement is not fully
                 // executed. We choose to save all xml files and delete the unused ones later
                 // (in another script).
-                XStream xstream = new XStream();
-                String serializedString = xstream.toXML(variable);
-                String serializedStringHashCode = Integer.toString(serializedString.hashCode());
+                XmlSerializer serializer = XmlSerializer.get();
+                byte[] serializedData = serializer.serialize(variable);
+                String serializedDataHashCode = serializer.fingerprint(serializedData);
                 // check if the serialized data has been seen before
-                if (serializedDataToFilePathMap.containsKey(serializedStringHashCode)) {
-                    return serializedDataToFilePathMap.get(serializedStringHashCode);
+                if (serializedDataToFilePathMap.containsKey(serializedDataHashCode)) {
+                    return serializedDataToFilePathMap.get(serializedDataHashCode);
                 }
                 // String xmlFileName = varType + serializedDataToFilePathMap.size() + ".xml";
-                String xmlFileName = serializedDataToFilePathMap.size() + ".xml";
-                String filePath = serializedDataDir + "/" + xmlFileName;
-                String escapedFilePath = "\"" + Utils.escapeString(xmlFileName) + "\"";
-                serializedDataToFilePathMap.put(serializedStringHashCode, escapedFilePath);
-                try (BufferedWriter writer = new BufferedWriter(new FileWriter(filePath))) {
-                    writer.write(serializedString);
+                String fileName = serializedDataToFilePathMap.size() + XmlSerializer.EXTENSION;
+                String filePath = serializedDataDir + "/" + fileName;
+                String escapedFilePath = "\"" + Utils.escapeString(fileName) + "\"";
+                serializedDataToFilePathMap.put(serializedDataHashCode, escapedFilePath);
+                try {
+                    Files.write(Paths.get(filePath), serializedData);
                 } catch (IOException e) {
                     throw new RuntimeException(e);
                 }
@@ -221,7 +222,6 @@ public class InstrumentHelper {
     public static void logVariable(String info, String logPath, String srcPath, int targetStmtNum, Object variable,
             String variableName) {
         try {
-            FileWriter writer = new FileWriter(logPath, true);
             String varType = parseVarType(variable);
             // TODO: recurvisely to String
             if (varType.equals("null")) {
@@ -229,10 +229,9 @@ public class InstrumentHelper {
             } else if (varType.endsWith("[]")) {
                 variable = parseArrayValue(varType, variable);
             }
-            writer.write(info + Constant.LOG_SEPARATOR + srcPath + Constant.LOG_SEPARATOR + targetStmtNum
+            LogWriters.append(logPath, info + Constant.LOG_SEPARATOR + srcPath + Constant.LOG_SEPARATOR + targetStmtNum
                     + Constant.LOG_SEPARATOR + varType + Constant.LOG_SEPARATOR + variableName + Constant.LOG_SEPARATOR
-                    + variable + "\n");
-            writer.close();
+                    + variable);
         } catch (Exception e) {
             throw new RuntimeException(e);
         }
@@ -250,9 +249,7 @@ public class InstrumentHelper {
     @Deprecated
     public static void logVariable(String info, String logPath, String srcPath, int targetStmtNum) {
         try {
-            FileWriter writer = new FileWriter(logPath, true);
-            writer.write(info + Constant.LOG_SEPARATOR + srcPath + Constant.LOG_SEPARATOR + targetStmtNum + "\n");
-            writer.close();
+            LogWriters.append(logPath, info + Constant.LOG_SEPARATOR + srcPath + Constant.LOG_SEPARATOR + targetStmtNum);
         } catch (Exception e) {
             throw new RuntimeException(e);
         }
@@ -260,13 +257,15 @@ public class InstrumentHelper {
 
     /**
      * A helper method used by {@link #canAddInlineTest(int, String, String)} to
-     * check if the coverage rate increases
+     * check if the coverage rate increases, replaced by
+     * {@link CoverageSnapshot#coverageChanged(CoverageSnapshot, Set)}
      * 
      * @param oldCC
      * @param newCC
      * @param key
      * @return
      */
+    @Deprecated
     public static boolean isCovered(IClassCoverage oldCC, IClassCoverage newCC, String key) {
         boolean changed = false;
         for (int i = newCC.getFirstLine(); i <= newCC.getLastLine(); i++) {
@@ -291,20 +290,12 @@ public class InstrumentHelper {
 
     public static boolean coverageChanged(CoverageBuilder oldCoverageBuilder, CoverageBuilder newCoverageBuilder,
             String key) {
-        boolean changed = false;
-        for (final IClassCoverage cc : newCoverageBuilder.getClasses()) {
-            // Log.debug("class coverage: " + cc.getName() + ", " +
-            // cc.getInstructionCounter().getCoveredCount());
-            if (cc.getInstructionCounter().getCoveredCount() == 0) {
-                continue;
-            } else {
-                IClassCoverage oldCC = oldCoverageBuilder.getClasses().stream()
-                        .filter(i -> i.getName().equals(cc.getName()))
-                        .findFirst().orElse(null);
-                changed = isCovered(oldCC, cc, key) || changed;
-            }
-        }
-        return changed;
+        return coverageChanged(new CoverageSnapshot(oldCoverageBuilder), new CoverageSnapshot(newCoverageBuilder),
+                key);
+    }
+
+    public static boolean coverageChanged(CoverageSnapshot oldSnapshot, CoverageSnapshot newSnapshot, String key) {
+        return newSnapshot.coverageChanged(oldSnapshot, classLineNoToCovered.get(key));
     }
 
     /**
@@ -316,11 +307,45 @@ public class InstrumentHelper {
      * @return
      */
     public static boolean canAddInlineTest(int lineNumber, String clazzName, String classesDirectory) {
+        if (Constant.reduction.equals(Constant.REDUCTION_DELTA)) {
+            return canAddInlineTestWithDelta(lineNumber, clazzName, classesDirectory);
+        }
         // This is the increased coverage rate after executing the target statement
         String key = clazzName + lineNumber;
-        CoverageBuilder oldCoverageBuilder = classLineNoToCoverageBefore.get(key);
-        CoverageBuilder newCoverageBuilder = classLineNoToCoverageAfter.get(key);
-        if (newCoverageBuilder == null || oldCoverageBuilder == null) {
+        CoverageSnapshot oldSnapshot = classLineNoToCoverageBefore.get(key);
+        CoverageSnapshot newSnapshot = classLineNoToCoverageAfter.get(key);
+        if (newSnapshot == null || oldSnapshot == null) {
+            return false;
+        }
+
+        if (!classLineNoToCovered.containsKey(key)) {
+            classLineNoToCovered.put(key, new HashSet<String>());
+        }
+
+        // coverage rate of target statment itself
+        boolean stmtChanged = coverageChanged(oldSnapshot, newSnapshot, key);
+
+        // coverage rate of context
+        CoverageSnapshot currentSnapshot = new CoverageSnapshot(
+                getCoverageRateFromAllClasses(lineNumber, classesDirectory));
+        boolean contextChanged = coverageChanged(newSnapshot, currentSnapshot, key);
+        return stmtChanged || contextChanged;
+    }
+
+    /**
+     * Same as {@link #canAddInlineTest(int, String, String)}, but only analyzes
+     * the classes whose probes changed between the snapshots
+     *
+     * @param lineNumber
+     * @param clazzName
+     * @param classesDirectory
+     * @return
+     */
+    public static boolean canAddInlineTestWithDelta(int lineNumber, String clazzName, String classesDirectory) {
+        String key = clazzName + lineNumber;
+        Map<String, boolean[]> oldSnapshot = classLineNoToSnapshotBefore.get(key);
+        Map<String, boolean[]> newSnapshot = classLineNoToSnapshotAfter.get(key);
+        if (newSnapshot == null || oldSnapshot == null) {
             return false;
         }
 
@@ -328,15 +353,22 @@ public class InstrumentHelper {
             classLineNoToCovered.put(key, new HashSet<String>());
         }
 
+        CoverageDeltaEngine engine = getCoverageDeltaEngine(classesDirectory);
         // coverage rate of target statment itself
-        boolean stmtChanged = coverageChanged(oldCoverageBuilder, newCoverageBuilder, key);
+        boolean stmtChanged = engine.coverageChanged(oldSnapshot, newSnapshot, key);
 
         // coverage rate of context
-        CoverageBuilder currentCoverageBuilder = getCoverageRateFromAllClasses(lineNumber, classesDirectory);
-        boolean contextChanged = coverageChanged(newCoverageBuilder, currentCoverageBuilder, key);
+        boolean contextChanged = engine.coverageChanged(newSnapshot, engine.snapshot(), key);
         return stmtChanged || contextChanged;
     }
 
+    static CoverageDeltaEngine getCoverageDeltaEngine(String classesDirectory) {
+        if (coverageDeltaEngine == null) {
+            coverageDeltaEngine = new CoverageDeltaEngine(classesDirectory);
+        }
+        return coverageDeltaEngine;
+    }
+
     /**
      * Get the coverage rate of all classes before executing the target statement
      * 
@@ -345,11 +377,15 @@ public class InstrumentHelper {
      * @param clazzDirectory
      */
     public static void addCoverageRateBefore(int lineNumber, String clazzName, String clazzDirectory) {
+        if (Constant.reduction.equals(Constant.REDUCTION_DELTA)) {
+            classLineNoToSnapshotBefore.put(clazzName + lineNumber, getCoverageDeltaEngine(clazzDirectory).snapshot());
+            return;
+        }
         CoverageBuilder coverageBuilder = getCoverageRateFromAllClasses(lineNumber, clazzDirectory);
         if (coverageBuilder == null) {
             return;
         }
-        classLineNoToCoverageBefore.put(clazzName + lineNumber, coverageBuilder);
+        classLineNoToCoverageBefore.put(clazzName + lineNumber, new CoverageSnapshot(coverageBuilder));
     }
 
     /**
@@ -360,11 +396,15 @@ public class InstrumentHelper {
      * @param clazzDirectory
      */
     public static void addCoverageRateAfter(int lineNumber, String clazzName, String clazzDirectory) {
+        if (Constant.reduction.equals(Constant.REDUCTION_DELTA)) {
+            classLineNoToSnapshotAfter.put(clazzName + lineNumber, getCoverageDeltaEngine(clazzDirectory).snapshot());
+            return;
+        }
         CoverageBuilder coverageBuilder = getCoverageRateFromAllClasses(lineNumber, clazzDirectory);
         if (coverageBuilder == null) {
             return;
         }
-        classLineNoToCoverageAfter.put(clazzName + lineNumber, coverageBuilder);
+        classLineNoToCoverageAfter.put(clazzName + lineNumber, new CoverageSnapshot(coverageBuilder));
     }
 
     /**
@@ -597,6 +637,15 @@ public class InstrumentHelper {
                                 case "inlinetestname":
                                     Constant.inlineTestName = tokens[1].trim();
                                     break;
+                                case "logbuffersize":
+                                    Constant.logBufferSize = Integer.parseInt(tokens[1].trim());
+                                    break;
+                                case "logflushinterval":
+                                    Constant.logFlushInterval = Long.parseLong(tokens[1].trim());
+                                    break;
+                                case "reduction":
+                                    Constant.reduction = tokens[1].trim();
+                                    break;
                             }
                         }
                     }
@@ -682,11 +731,9 @@ public class InstrumentHelper {
         }
         // save inline test
         try {
-            FileWriter writer = new FileWriter(destPath, true);
-            writer.write(inlineTest.srcPath + ";" + inlineTest.targetStmtLineNo + ";" + inlineTest.toString()
-                    + "\n");
-            writer.close();
-        } catch (IOException e) {
+            LogWriters.append(destPath,
+                    inlineTest.srcPath + ";" + inlineTest.targetStmtLineNo + ";" + inlineTest.toString());
+        } catch (RuntimeException e) {
             e.printStackTrace();
         }
     }
@@ -696,6 +743,8 @@ public class InstrumentHelper {
      */
     static class TearDown extends Thread {
         public void run() {
+            // flush the buffered logs and inline tests
+            LogWriters.closeAll();
             // write log information
             // Log.debug("Total inline tests: " + totalInlineTests);
             // write coverage information
@@ -0,0 +1,112 @@
+package org.raninline;
+
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.nio.charset.Charset;
+import java.util.ArrayList;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Buffered appenders for the log and inline test files written by the
+ * instrumented code. Lines are kept in memory per path and appended to the
+ * file when the buffer is full, when the flush interval has passed, when the
+ * writer is evicted, or at shutdown ({@link InstrumentHelper.TearDown}).
+ * A buffer is always written with a single append, so lines from concurrent
+ * JVMs do not interleave.
+ */
+public class LogWriters {
+    // least recently used writer is closed first
+    private static final Map<String, LogWriter> writers = new LinkedHashMap<String, LogWriter>(16, 0.75f, true);
+
+    /**
+     * Append a line (without line separator) to the file
+     *
+     * @param path
+     * @param line
+     */
+    public static synchronized void append(String path, String line) {
+        LogWriter writer = writers.get(path);
+        if (writer == null) {
+            if (writers.size() >= Constant.MAX_OPEN_LOG_WRITERS) {
+                String eldest = writers.keySet().iterator().next();
+                writers.remove(eldest).close();
+            }
+            writer = new LogWriter(path);
+            writers.put(path, writer);
+        }
+        writer.append(line);
+    }
+
+    /**
+     * Write all buffered lines to the files
+     */
+    public static synchronized void flushAll() {
+        for (LogWriter writer : writers.values()) {
+            writer.flush();
+        }
+    }
+
+    /**
+     * Write all buffered lines to the files and close them
+     */
+    public static synchronized void closeAll() {
+        List<String> paths = new ArrayList<String>(writers.keySet());
+        for (String path : paths) {
+            writers.remove(path).close();
+        }
+    }
+
+    static synchronized int numOpenWriters() {
+        return writers.size();
+    }
+
+    static class LogWriter {
+        private final String path;
+        private final StringBuilder buffer = new StringBuilder();
+        private FileOutputStream out;
+        private long lastFlushTime = System.currentTimeMillis();
+
+        LogWriter(String path) {
+            this.path = path;
+        }
+
+        void append(String line) {
+            buffer.append(line).append("\n");
+            if (buffer.length() >= Constant.logBufferSize
+                    || System.currentTimeMillis() - lastFlushTime >= Constant.logFlushInterval) {
+                flush();
+            }
+        }
+
+        void flush() {
+            lastFlushTime = System.currentTimeMillis();
+            if (buffer.length() == 0) {
+                return;
+            }
+            try {
+                if (out == null) {
+                    out = new FileOutputStream(path, true);
+                }
+                out.write(buffer.toString().getBytes(Charset.defaultCharset()));
+                out.flush();
+            } catch (IOException e) {
+                throw new RuntimeException(e);
+            }
+            buffer.setLength(0);
+        }
+
+        void close() {
+            flush();
+            if (out != null) {
+                try {
+                    out.close();
+                } catch (IOException e) {
+                    throw new RuntimeException(e);
+                }
+                out = null;
+            }
+        }
+    }
+}
@@ -0,0 +1,71 @@
+package org.raninline;
+
+import java.nio.charset.StandardCharsets;
+
+import com.thoughtworks.xstream.XStream;
+import com.thoughtworks.xstream.security.AnyTypePermission;
+
+/**
+ * XStream XML serialization of the captured values that are not primitives.
+ * The serialized data is saved in .inlinegen/serialized-data and referenced
+ * by file name in the generated inline tests. One XStream instance is reused
+ * instead of building a new one per value.
+ */
+public class XmlSerializer {
+    final static String EXTENSION = ".xml";
+
+    private static XmlSerializer instance;
+
+    private final XStream xstream;
+
+    public XmlSerializer() {
+        xstream = new XStream();
+        // the values are captured from the project under test, so all types are
+        // trusted when replaying
+        xstream.addPermission(AnyTypePermission.ANY);
+    }
+
+    /**
+     * Get the shared instance, created once
+     *
+     * @return
+     */
+    public static synchronized XmlSerializer get() {
+        if (instance == null) {
+            instance = new XmlSerializer();
+        }
+        return instance;
+    }
+
+    /**
+     * Serialize a value to the bytes saved in the file
+     *
+     * @param value
+     * @return
+     */
+    public byte[] serialize(Object value) {
+        return xstream.toXML(value).getBytes(StandardCharsets.UTF_8);
+    }
+
+    /**
+     * Deserialize the bytes saved in the file
+     *
+     * @param data
+     * @return
+     */
+    public Object deserialize(byte[] data) {
+        return xstream.fromXML(new String(data, StandardCharsets.UTF_8));
+    }
+
+    /**
+     * Key used to check if the serialized data has been seen before, the hash
+     * code of the XML string, so that existing serialized-data-to-path.txt
+     * files are still valid
+     *
+     * @param data
+     * @return
+     */
+    public String fingerprint(byte[] data) {
+        return Integer.toString(new String(data, StandardCharsets.UTF_8).hashCode());
+    }
+}
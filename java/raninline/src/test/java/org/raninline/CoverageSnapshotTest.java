@@ -0,0 +1,57 @@
+package org.raninline;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertFalse;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+import java.util.BitSet;
+import java.util.HashSet;
+import java.util.Set;
+
+import org.junit.jupiter.api.Test;
+
+public class CoverageSnapshotTest {
+    private static CoverageSnapshot snapshot(String className, int[] fully, int[] partly) {
+        CoverageSnapshot snapshot = new CoverageSnapshot();
+        CoverageSnapshot.ClassLines lines = new CoverageSnapshot.ClassLines(fully.length + partly.length);
+        for (int line : fully) {
+            lines.fully.set(line);
+        }
+        for (int line : partly) {
+            lines.partly.set(line);
+        }
+        snapshot.classes.put(className, lines);
+        return snapshot;
+    }
+
+    @Test
+    public void testChangedLines() {
+        CoverageSnapshot oldSnapshot = snapshot("A", new int[] { 1 }, new int[] { 2, 3 });
+        CoverageSnapshot newSnapshot = snapshot("A", new int[] { 1, 2, 4 }, new int[] { 3, 5 });
+        BitSet expected = new BitSet();
+        // 2: partly -> fully, 4: not covered -> fully, 5: not covered -> partly
+        expected.set(2);
+        expected.set(4);
+        expected.set(5);
+        assertEquals(expected, newSnapshot.changedLines(oldSnapshot, "A"));
+        assertEquals(new BitSet(), oldSnapshot.changedLines(newSnapshot, "A"));
+    }
+
+    @Test
+    public void testChangedLinesOfNewClass() {
+        CoverageSnapshot oldSnapshot = snapshot("A", new int[] { 1 }, new int[] {});
+        CoverageSnapshot newSnapshot = snapshot("B", new int[] { 1 }, new int[] { 2 });
+        assertEquals(2, newSnapshot.changedLines(oldSnapshot, "B").cardinality());
+    }
+
+    @Test
+    public void testCoverageChangedRecordsLines() {
+        CoverageSnapshot oldSnapshot = snapshot("A", new int[] {}, new int[] {});
+        CoverageSnapshot newSnapshot = snapshot("A", new int[] { 1 }, new int[] {});
+        Set<String> covered = new HashSet<String>();
+        assertTrue(newSnapshot.coverageChanged(oldSnapshot, covered));
+        assertTrue(covered.contains("A1"));
+        // the same lines do not count twice for the same target statement
+        assertFalse(newSnapshot.coverageChanged(oldSnapshot, covered));
+    }
+}
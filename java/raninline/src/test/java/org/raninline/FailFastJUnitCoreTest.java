@@ -0,0 +1,41 @@
+package org.raninline;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertFalse;
+
+import org.junit.FixMethodOrder;
+import org.junit.runner.Result;
+import org.junit.runners.MethodSorters;
+import org.junit.jupiter.api.Test;
+
+public class FailFastJUnitCoreTest {
+    // not run by surefire, which excludes nested classes
+    @FixMethodOrder(MethodSorters.NAME_ASCENDING)
+    public static class Sample {
+        @org.junit.Test
+        public void a() {
+        }
+
+        @org.junit.Test
+        public void b() {
+            org.junit.Assert.fail();
+        }
+
+        @org.junit.Test
+        public void c() {
+        }
+    }
+
+    @Test
+    public void testStopAtFirstFailure() {
+        Result result = FailFastJUnitCore.run(new Class<?>[] {Sample.class});
+        assertFalse(result.wasSuccessful());
+        assertEquals(2, result.getRunCount());
+        assertEquals(1, result.getFailureCount());
+    }
+
+    @Test
+    public void testEscape() {
+        assertEquals("a &lt;b&gt; &amp; &quot;c&quot;&#10;?", FailFastLauncher.escape("a <b> & \"c\"\n\u0001"));
+    }
+}
@@ -0,0 +1,55 @@
+package org.raninline;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertFalse;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.Arrays;
+
+import org.junit.jupiter.api.AfterEach;
+import org.junit.jupiter.api.Test;
+
+public class LogWritersTest {
+    @AfterEach
+    public void tearDown() {
+        LogWriters.closeAll();
+        Constant.logBufferSize = 64 * 1024;
+        Constant.logFlushInterval = 1000;
+    }
+
+    @Test
+    public void testBufferedUntilFlush() throws IOException {
+        Constant.logFlushInterval = Long.MAX_VALUE;
+        Path log = Files.createTempFile("raninline", ".txt");
+        LogWriters.append(log.toString(), "a");
+        LogWriters.append(log.toString(), "b");
+        assertEquals(0, Files.size(log));
+        LogWriters.flushAll();
+        assertEquals(Arrays.asList("a", "b"), Files.readAllLines(log));
+    }
+
+    @Test
+    public void testFlushWhenBufferIsFull() throws IOException {
+        Constant.logFlushInterval = Long.MAX_VALUE;
+        Constant.logBufferSize = 4;
+        Path log = Files.createTempFile("raninline", ".txt");
+        LogWriters.append(log.toString(), "a");
+        assertEquals(0, Files.size(log));
+        LogWriters.append(log.toString(), "bcd");
+        assertEquals(Arrays.asList("a", "bcd"), Files.readAllLines(log));
+    }
+
+    @Test
+    public void testEvictedWriterIsFlushed() throws IOException {
+        Constant.logFlushInterval = Long.MAX_VALUE;
+        Path first = Files.createTempFile("raninline", ".txt");
+        LogWriters.append(first.toString(), "first");
+        for (int i = 0; i < Constant.MAX_OPEN_LOG_WRITERS; i++) {
+            LogWriters.append(Files.createTempFile("raninline", ".txt").toString(), "x");
+        }
+        assertEquals(Constant.MAX_OPEN_LOG_WRITERS, LogWriters.numOpenWriters());
+        assertFalse(Files.readAllLines(first).isEmpty());
+    }
+}
@@ -0,0 +1,31 @@
+package org.raninline;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertSame;
+
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+import org.junit.jupiter.api.Test;
+
+public class XmlSerializerTest {
+    @Test
+    public void testRoundTrip() {
+        Map<String, List<Integer>> value = new HashMap<String, List<Integer>>();
+        List<Integer> list = new ArrayList<Integer>();
+        list.add(1);
+        list.add(2);
+        value.put("a", list);
+        XmlSerializer serializer = XmlSerializer.get();
+        byte[] data = serializer.serialize(value);
+        assertEquals(value, serializer.deserialize(data));
+        assertEquals(serializer.fingerprint(data), serializer.fingerprint(serializer.serialize(value)));
+    }
+
+    @Test
+    public void testGet() {
+        assertSame(XmlSerializer.get(), XmlSerializer.get());
+    }
+}
@@ -413,7 +413,7 @@ class Analysis:
             mutants = [
                 mutant
                 for mutant in mutants
-                if "compilation_failure" in mutant and not mutant["compilation_failure"]
+                if "compilation_failure" in mutant and Util.is_evaluated_mutant(mutant)
             ]
 
             results_list = Util.get_killed_mutants(project_name, test_type_list)
@@ -634,10 +634,7 @@ class Analysis:
                 continue
             mutants = se.io.load(mutant_file)
             valid_mutants = [
-                mutant
-                for mutant in mutants
-                if "compilation_failure" not in mutant
-                or not mutant["compilation_failure"]
+                mutant for mutant in mutants if Util.is_evaluated_mutant(mutant)
             ]
             mutation_result = se.io.load(mutation_result_file)
 
@@ -0,0 +1,111 @@
+import collections
+import os
+from typing import Dict, List
+
+import seutil as se
+from exli.util import Util
+
+
+class BudgetAllocator:
+    """
+    Index of the target statements of a project by class, used to select the classes to generate tests for and to split a generation budget between them in proportion to their (uncovered) target statements.
+    """
+
+    def __init__(self, target_stmts_path: str, cov_map_path: str = None):
+        """
+        Args:
+            target_stmts_path (str): The path to the target statements file (results/target-stmt/<project>-<sha>.txt).
+            cov_map_path (str, optional): The path to a coverage map (e.g., of the developer-written tests). Target statements it covers do not count. Defaults to None.
+        """
+        # top-level class name -> line numbers of target statements
+        self.class_to_lines: Dict[str, set] = collections.defaultdict(set)
+        for line in se.io.load(target_stmts_path, se.io.Fmt.txtList):
+            if not line.startswith("target stmt"):
+                continue
+            parts = line.split(";")
+            class_name = Util.file_path_to_class_name(parts[1])
+            self.class_to_lines[class_name].add(parts[2])
+        if cov_map_path is not None and os.path.exists(cov_map_path):
+            self.remove_covered_lines(se.io.load(cov_map_path, se.io.Fmt.json))
+
+    @classmethod
+    def get_top_level_class_name(cls, class_name: str) -> str:
+        # inner classes are recorded as class_name$innerclass
+        return class_name.split("$", 1)[0]
+
+    def remove_covered_lines(self, cov_map: dict):
+        for class_to_line_cov in cov_map.values():
+            for class_name, line_to_cov in class_to_line_cov.items():
+                lines = self.class_to_lines.get(
+                    self.get_top_level_class_name(class_name)
+                )
+                if not lines:
+                    continue
+                for line_number, cov in line_to_cov.items():
+                    # status > 1: fully or partly covered
+                    if cov[0] > 1:
+                        lines.discard(line_number)
+
+    def num_target_stmts(self, class_name: str) -> int:
+        top_level_class_name = self.get_top_level_class_name(class_name)
+        return len(self.class_to_lines.get(top_level_class_name, ()))
+
+    def select_classes(self, classpath_list: List[str]) -> List[str]:
+        """
+        Classes of classpath_list that contain target statements, including the inner classes of the classes with target statements.
+        """
+        return [
+            c
+            for c in classpath_list
+            if self.get_top_level_class_name(c) in self.class_to_lines
+        ]
+
+    def allocate(
+        self, classes: List[str], total_budget: int, min_budget: int = 1
+    ) -> Dict[str, int]:
+        """
+        Split total_budget (seconds) between the classes in proportion to their uncovered target statements; a top-level class shares its statements with its inner classes. Every class gets at least min_budget.
+
+        Args:
+            classes (List[str]): The classes to allocate budget to.
+            total_budget (int): The budget to split.
+            min_budget (int, optional): The minimum budget of a class. Defaults to 1.
+
+        Returns:
+            Dict[str, int]: The budget of each class.
+        """
+        if not classes:
+            return {}
+        num_classes_per_top_level = collections.Counter(
+            self.get_top_level_class_name(c) for c in classes
+        )
+        weights = {
+            c: self.num_target_stmts(c)
+            / num_classes_per_top_level[self.get_top_level_class_name(c)]
+            for c in classes
+        }
+        total_weight = sum(weights.values())
+        if total_weight == 0:
+            budget = max(min_budget, total_budget // len(classes))
+            return {c: budget for c in classes}
+        # the floor is given first, the rest is split by weight
+        remaining_budget = max(0, total_budget - min_budget * len(classes))
+        return {
+            c: min_budget + int(remaining_budget * weights[c] / total_weight)
+            for c in classes
+        }
+
+    @classmethod
+    def partition(
+        cls, class_to_budget: Dict[str, int], num_shards: int
+    ) -> List[List[str]]:
+        """
+        Split the classes into num_shards shards with balanced total budget, largest budget first to the least loaded shard.
+        """
+        shards = [[] for _ in range(num_shards)]
+        loads = [0] * num_shards
+        for c in sorted(class_to_budget, key=lambda c: -class_to_budget[c]):
+            i = loads.index(min(loads))
+            shards[i].append(c)
+            loads[i] += class_to_budget[c]
+        return [shard for shard in shards if shard]
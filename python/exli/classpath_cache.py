@@ -0,0 +1,104 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import List
+
+import seutil as se
+from exli.macros import Macros
+
+
+class ClasspathCache:
+    """
+    Persistent cache of the dependency classpath and the class list of each project version.
+
+    An entry is keyed by the commit hash and a hash of all pom.xml files at that commit (read from git, so the pom hacks done before running Maven do not change the key), and is stored as <cache_dir>/<project>/<sha>-<pom hash>.json.
+    """
+
+    def __init__(self, cache_dir: str = None):
+        """
+        Args:
+            cache_dir (str, optional): The root directory of the cache. Defaults to Macros.classpath_cache_dir.
+        """
+        if cache_dir is None:
+            cache_dir = Macros.classpath_cache_dir
+        self.cache_dir = Path(cache_dir)
+
+    @classmethod
+    def get_pom_hash(cls, project_name: str, sha: str) -> str:
+        """
+        Hash of the pom.xml files of the project at the commit, None if the project is not cloned.
+        """
+        project_dir = Macros.downloads_dir / project_name
+        if not project_dir.exists():
+            return None
+        rr = se.bash.run(f"git -C {project_dir} ls-tree -r {sha}")
+        if rr.returncode != 0:
+            return None
+        # <mode> blob <object hash>\t<path>
+        pom_lines = sorted(
+            line
+            for line in rr.stdout.splitlines()
+            if os.path.basename(line.split("\t")[-1]) == "pom.xml"
+        )
+        return hashlib.sha256("\n".join(pom_lines).encode()).hexdigest()[:16]
+
+    def get_entry_path(self, project_name: str, sha: str) -> Path:
+        pom_hash = self.get_pom_hash(project_name, sha)
+        if pom_hash is None:
+            return None
+        return self.cache_dir / project_name / f"{sha}-{pom_hash}.json"
+
+    def get(self, project_name: str, sha: str) -> dict:
+        entry_path = self.get_entry_path(project_name, sha)
+        if entry_path is None or not entry_path.exists():
+            return None
+        return se.io.load(entry_path, se.io.Fmt.json)
+
+    def put(self, project_name: str, sha: str, **values):
+        """
+        Add values (e.g., deps, classpath_list) to the entry of the project version.
+        """
+        entry_path = self.get_entry_path(project_name, sha)
+        if entry_path is None:
+            return
+        entry = {}
+        if entry_path.exists():
+            entry = se.io.load(entry_path, se.io.Fmt.json)
+        entry.update(values)
+        se.io.mkdir(entry_path.parent)
+        # write to a temporary file first, concurrent readers never see a partial entry
+        tmp_path = entry_path.with_suffix(f".tmp{os.getpid()}")
+        se.io.dump(tmp_path, entry, se.io.Fmt.jsonPretty)
+        os.replace(tmp_path, entry_path)
+
+    def get_deps(self, project_name: str, sha: str) -> str:
+        entry = self.get(project_name, sha)
+        if entry is None:
+            return None
+        return entry.get("deps")
+
+    def get_classpath_list(self, project_name: str, sha: str) -> List[str]:
+        entry = self.get(project_name, sha)
+        if entry is None:
+            return None
+        return entry.get("classpath_list")
+
+    def get_dependency_classpath(self, project_name: str, sha: str, key: str) -> str:
+        """
+        Get the dependency classpath of a module, see MavenModule.dependency_classpath.
+
+        Args:
+            key (str): The module and the hacks of its pom.xml.
+        """
+        entry = self.get(project_name, sha)
+        if entry is None:
+            return None
+        return entry.get("dependency_classpath", {}).get(key)
+
+    def put_dependency_classpath(
+        self, project_name: str, sha: str, key: str, classpath: str
+    ):
+        entry = self.get(project_name, sha) or {}
+        dependency_classpath = entry.get("dependency_classpath", {})
+        dependency_classpath[key] = classpath
+        self.put(project_name, sha, dependency_classpath=dependency_classpath)
@@ -1,12 +1,19 @@
 import collections
+import contextlib
 import glob
+import json
 import os
 import time
 from typing import Dict, List, Set
 
 import seutil as se
 from exli.macros import Macros
+from exli.maven import mvn_cmd
 from exli.reduce import reduce_suite
+from exli.result_store import MutantResultStore
+from exli.schemata import MutantSchemata
+from exli.source_index import SourceIndex
+from exli.test_selection import TestSelector
 from exli.util import Util
 from jsonargparse import CLI
 from tqdm import tqdm
@@ -35,16 +42,28 @@ class Eval:
         mutator: str = Macros.universalmutator,
         log_path: str = None,
         seed: int = Macros.DEFAULT_SEED,
+        resume: bool = False,
+        test_selection: bool = False,
+        schemata: bool = False,
+        kill_only: bool = False,
     ):
         """
         Apply each mutant to the project and run the inline tests to check if tests can kill the mutant.
 
+        The result of each mutant is appended to a journal (mutants-eval-results/<project>-<sha>-<mutator>-<test type>.jsonl) as soon as the mutant is evaluated, and the final results are built from the journal. The junit records of the inline tests of each mutant are put in the MutantResultStore of the project.
+
         Args:
             project_name (str): The name of the project.
             sha (str): The commit sha of the project.
             test_types (List[str], optional): The types of tests to run. Available options are ["r0", "r1", "dev", "randoop", "evosuite"]. Defaults to None. If None, all types of tests will be run.
             mutator (str, optional): The type of mutator. Available options are ["universalmutator", "major"]. Defaults to "universalmutator".
             log_path (str, optional): The path to save the log file. Defaults to None.
+            resume (bool, optional): Whether to skip the mutants already in the journal, e.g., after a crash. Defaults to False, which starts a new journal.
+            test_selection (bool, optional): Whether to run only the unit test classes (dev, randoop, evosuite) that cover the mutated line, and the test classes without coverage, using the per-test coverage collected once by TestSelector. A mutant on a line covered by no test class is not killed. Defaults to False, which runs all unit tests for every mutant.
+            schemata (bool, optional): Whether to build the project once for all mutants. For unit tests, the mutants are compiled into the project as mutant schemata (see MutantSchemata) and each mutant is selected when the tests start, the mutants that cannot be embedded are applied one at a time after the others. For inline tests, which are mutated instead of the project, the project is compiled once. Defaults to False, which builds the project for every mutant.
+            kill_only (bool, optional): Whether to stop running the tests of a mutant at the first failing test, which is recorded as <test type>-killer. For unit tests, only when no test fails without the mutant. The inline test logs then only have the tests run until the first failure, so test_to_killed_mutants needs the full matrix. Defaults to False, which runs all tests for every mutant.
+
+        The tests of a mutant are killed (with the processes they forked) after a timeout derived from the time of the tests without mutant (see get_mutant_timeout), with test selection the time of the selected test classes, and the mutant is recorded with <test type>-kill-category "timeout" instead of "test".
         """
         if mutator in [Macros.universalmutator, Macros.major]:
             mutants_file = Macros.mutants_dir / f"{project_name}-{sha}-{mutator}.json"
@@ -73,251 +92,424 @@ class Eval:
                 Macros.evosuite,
             ]
         for test_type in test_types:
-            initial_num_failed_tests = 0
-            if test_type in [Macros.dev, Macros.randoop, Macros.evosuite]:
-                tests_log_file = f"{Macros.log_dir}/run-unit-tests/{project_name}-{sha}-{test_type}.log"
-                if os.path.exists(tests_log_file):
-                    os.remove(tests_log_file)
-                Util.prepare_project(project_name, sha)
-                self.run_tests(project_name, sha, test_type, seed, tests_log_file)
-                initial_num_failed_tests = self.get_num_failed_tests(tests_log_file)
             mutants = se.io.load(mutants_file, se.io.Fmt.json)
             if not mutants:
                 print(f"no mutants for {project_name}")
                 return
-            res = []
-            updated_mutants = []
-            for mutant in tqdm(mutants):
-                if "compilation_failure" in mutant and mutant["compilation_failure"]:
-                    continue
-                original_code = mutant["orginal_code"].strip()
-                mutated_code = mutant["mutated_code"].strip()
-                file_path = mutant["filepath"]
-                if not file_path.startswith(f"{Macros.home_dir}"):
-                    file_path = re.sub(
-                        r"/home/[^/]+/", f"{Macros.home_dir}/", file_path
+            initial_num_failed_tests = 0
+            test_selector = None
+            mutant_schemata = None
+            baseline_time = None
+            if test_type in [Macros.dev, Macros.randoop, Macros.evosuite]:
+                if test_selection:
+                    test_selector = TestSelector(project_name, sha, test_type, seed)
+                    test_selector.collect()
+                    # the per-test runs are also the baseline of the selected tests
+                    baseline_time = test_selector.get_baseline_time()
+                if schemata or test_selector is None:
+                    tests_log_file = f"{Macros.log_dir}/run-unit-tests/{project_name}-{sha}-{test_type}.log"
+                    if os.path.exists(tests_log_file):
+                        os.remove(tests_log_file)
+                    Util.prepare_project(project_name, sha)
+                    if schemata:
+                        mutant_schemata = MutantSchemata(project_name, mutants)
+                        mutant_schemata.apply()
+                        if not mutant_schemata.compile():
+                            mutant_schemata = None
+                    # no mutant is selected, the schemata build runs the original code
+                    start_time = time.time()
+                    self.run_tests(
+                        project_name,
+                        sha,
+                        test_type,
+                        seed,
+                        tests_log_file,
+                        timeout=Macros.MUTANT_TIMEOUT_CAP,
                     )
-                line_num = mutant["linenumber"]
-                inline_test_name = (
-                    file_path.split("/")[-1].split(".")[0] + f"_{line_num}Test.java"
-                )
-                mutant_res = {}
-                mutant_res["id"] = mutant["id"]
-                # add inline tests to the file
-                Util.prepare_project(project_name, sha)
-                with se.io.cd(Macros.downloads_dir / project_name):
-                    if test_type in [Macros.dev, Macros.randoop, Macros.evosuite]:
-                        # replace the original code with the mutated code
-                        file_content = se.io.load(file_path, se.io.Fmt.txt)
-                        lines = file_content.splitlines()
-                        lines[line_num - 1] = mutated_code
-                        se.io.dump(file_path, "\n".join(lines), se.io.Fmt.txt)
-                    elif test_type in [Macros.r0, Macros.r1]:
-                        inline_test_fqn = Util.get_full_class_name(file_path)
-                        inline_test_path_with_package = (
-                            inline_test_fqn.replace(".", "/") + ".java"
+                    baseline_time = time.time() - start_time
+                    if test_selector is None:
+                        initial_num_failed_tests = self.get_num_failed_tests(
+                            tests_log_file
                         )
-                        if test_type == Macros.r0:
-                            file_path_with_inline_test = Macros.r0_tests_dir
-                        elif test_type == Macros.r1:
-                            file_path_with_inline_test = Macros.r1_tests_dir
-                        else:
-                            raise Exception(f"unknown test type: {test_type}")
-                        file_path_with_inline_test = (
-                            file_path_with_inline_test
-                            / f"{project_name}-{sha}"
-                            / inline_test_path_with_package
+                if mutant_schemata is not None:
+                    # the mutants applied one at a time reset the schemata build, run them last
+                    mutants = sorted(
+                        mutants, key=lambda m: not mutant_schemata.is_schematized(m)
+                    )
+            else:
+                if schemata:
+                    # the inline tests are mutated, not the project
+                    Util.prepare_project(project_name, sha)
+                    with se.io.cd(Macros.downloads_dir / project_name):
+                        se.bash.run(mvn_cmd(f"clean compile {Macros.SKIPS}"), 0)
+                baseline_time = self.get_baseline_time(
+                    project_name, sha, test_type, resume, schemata
+                )
+            mutant_timeout = self.get_mutant_timeout(baseline_time)
+            baseline_time_path = self.get_baseline_time_path(
+                project_name, sha, test_type
+            )
+            se.io.mkdir(baseline_time_path.parent)
+            se.io.dump(
+                baseline_time_path,
+                {"time": baseline_time, "mutant-timeout": mutant_timeout},
+                se.io.Fmt.jsonPretty,
+            )
+            print(f"baseline time: {baseline_time}, mutant timeout: {mutant_timeout}")
+            journal_path = self.get_mutants_journal_path(
+                project_name, sha, mutator, test_type
+            )
+            se.io.mkdir(journal_path.parent)
+            if resume:
+                evaluated_ids = {
+                    entry["id"] for entry in self.load_mutants_journal(journal_path)
+                }
+                print(f"resume from {len(evaluated_ids)} evaluated mutants")
+            else:
+                evaluated_ids = set()
+                se.io.dump(journal_path, "", se.io.Fmt.txt)
+            # the inline test results of each mutant, closed even if the evaluation fails
+            if test_type in [Macros.r0, Macros.r1]:
+                result_store_context = MutantResultStore(project_name, sha, mutator)
+            else:
+                result_store_context = contextlib.nullcontext()
+            with result_store_context as result_store:
+                for mutant in tqdm(mutants):
+                    if not Util.is_evaluated_mutant(mutant):
+                        continue
+                    if mutant["id"] in evaluated_ids:
+                        continue
+                    original_code = mutant["orginal_code"].strip()
+                    mutated_code = mutant["mutated_code"].strip()
+                    file_path = mutant["filepath"]
+                    if not file_path.startswith(f"{Macros.home_dir}"):
+                        file_path = re.sub(
+                            r"/home/[^/]+/", f"{Macros.home_dir}/", file_path
                         )
-                        if not file_path_with_inline_test.exists():
-                            print("file not exist", file_path_with_inline_test)
+                    line_num = mutant["linenumber"]
+                    inline_test_name = (
+                        file_path.split("/")[-1].split(".")[0] + f"_{line_num}Test.java"
+                    )
+                    mutant_res = {}
+                    mutant_res["id"] = mutant["id"]
+                    selected_tests = None
+                    timeout = mutant_timeout
+                    if test_selector is not None:
+                        selected_tests = test_selector.select(file_path, line_num)
+                        if not selected_tests:
+                            # no test executes the mutated line
+                            mutant_res[f"{test_type}-killed"] = False
+                            mutant_res[f"{test_type}-time"] = 0
+                            mutant_res["reason"] = "not covered"
+                            self.append_mutants_journal(
+                                journal_path, mutant["id"], mutant_res
+                            )
                             continue
-                        file_path_with_inline_test_temp = (
-                            temp_dir / inline_test_path_with_package
-                        )
-                        se.bash.run(
-                            f"mkdir -p {os.path.dirname(file_path_with_inline_test_temp)}"
-                        )
-                        se.bash.run(
-                            f"cp {file_path_with_inline_test} {file_path_with_inline_test_temp}"
+                        initial_num_failed_tests = sum(
+                            self.get_num_failed_tests(
+                                test_selector.get_test_log_path(t)
+                            )
+                            for t in selected_tests
                         )
-                        file_content = se.io.load(
-                            file_path_with_inline_test_temp, se.io.Fmt.txt
+                        mutant_res[f"{test_type}-selected-tests"] = len(selected_tests)
+                        timeout = self.get_mutant_timeout(
+                            test_selector.get_baseline_time(selected_tests)
                         )
-
-                        if original_code in file_content:
-                            file_content = file_content.replace(
-                                original_code, mutated_code
-                            )
-                            se.io.dump(
-                                file_path_with_inline_test_temp,
-                                file_content,
-                                se.io.Fmt.txt,
-                            )
-                        else:
+                    in_schemata = (
+                        mutant_schemata is not None
+                        and mutant_schemata.is_schematized(mutant)
+                    )
+                    # add inline tests to the file
+                    if not in_schemata and not (
+                        schemata and test_type in [Macros.r0, Macros.r1]
+                    ):
+                        Util.prepare_project(project_name, sha)
+                    with se.io.cd(Macros.downloads_dir / project_name):
+                        if (
+                            test_type in [Macros.dev, Macros.randoop, Macros.evosuite]
+                            and not in_schemata
+                        ):
                             # replace the original code with the mutated code
-                            # String buildNumber = matcher.group( 4 ) in the file content may be String buildNumber = matcher.group(4)
-                            remove_space_original_code = original_code.replace(" ", "")
+                            file_content = se.io.load(file_path, se.io.Fmt.txt)
                             lines = file_content.splitlines()
-                            replace = False
-                            new_lines = []
-                            for line in lines:
-                                if line != "" and line.strip().replace(
-                                    " ", ""
-                                ).startswith(remove_space_original_code):
-                                    new_line = (
-                                        mutated_code
-                                        + line.strip().replace(" ", "")[
-                                            len(remove_space_original_code) :
-                                        ]
-                                    )
-                                    new_lines.append(new_line)
-                                    replace = True
-                                else:
-                                    new_lines.append(line)
-                            if not replace:
-                                error_message = f"cannot find {original_code} in {file_path_with_inline_test}"
-                                print(error_message)
-                                if log_path:
-                                    se.io.dump(
-                                        log_path,
-                                        [error_message],
-                                        se.io.Fmt.txtList,
-                                        append=True,
-                                    )
+                            lines[line_num - 1] = mutated_code
+                            se.io.dump(file_path, "\n".join(lines), se.io.Fmt.txt)
+                        elif test_type in [Macros.r0, Macros.r1]:
+                            inline_test_fqn = Util.get_full_class_name(file_path)
+                            inline_test_path_with_package = (
+                                inline_test_fqn.replace(".", "/") + ".java"
+                            )
+                            if test_type == Macros.r0:
+                                file_path_with_inline_test = Macros.r0_tests_dir
+                            elif test_type == Macros.r1:
+                                file_path_with_inline_test = Macros.r1_tests_dir
+                            else:
+                                raise Exception(f"unknown test type: {test_type}")
+                            file_path_with_inline_test = (
+                                file_path_with_inline_test
+                                / f"{project_name}-{sha}"
+                                / inline_test_path_with_package
+                            )
+                            if not file_path_with_inline_test.exists():
+                                print("file not exist", file_path_with_inline_test)
+                                self.append_mutants_journal(journal_path, mutant["id"])
                                 continue
-
-                            se.io.dump(
-                                file_path_with_inline_test_temp,
-                                "\n".join(new_lines),
-                                se.io.Fmt.txt,
+                            file_path_with_inline_test_temp = (
+                                temp_dir / inline_test_path_with_package
                             )
-                        if test_type == Macros.r0:
-                            Util.parse_inline_tests(
-                                project_name,
-                                sha,
-                                f"{Macros.r0_tests_dir}/{project_name}-{sha}",
-                                f"{Macros.r0_its_dir}/{project_name}-{sha}",
-                                file_path_with_inline_test_temp,
+                            se.bash.run(
+                                f"mkdir -p {os.path.dirname(file_path_with_inline_test_temp)}"
                             )
-                        elif test_type == Macros.r1:
-                            Util.parse_inline_tests(
-                                project_name,
-                                sha,
-                                f"{Macros.r1_tests_dir}/{project_name}-{sha}",
-                                f"{Macros.r1_its_dir}/{project_name}-{sha}",
-                                file_path_with_inline_test_temp,
+                            se.bash.run(
+                                f"cp {file_path_with_inline_test} {file_path_with_inline_test_temp}"
                             )
-                        # clean the temp file
-                        se.bash.run(f"rm {file_path_with_inline_test_temp}")
-                    # add timeout when running tests
-                    if test_type in [Macros.r0, Macros.r1]:
-                        tests_log_file = (
-                            eval_log
-                            / f"{project_name}-{sha}-{test_type}-{inline_test_name}-{mutant['id']}-{mutator}.log"
-                        )
-                    else:
-                        # no enough space to save all the log files, so Macros.dev, Macros.randoop, Macros.evosuite will share the same log file across different mutants
-                        tests_log_file = (
-                            eval_log / f"{project_name}-{sha}-{test_type}-{mutator}.log"
-                        )
-                    if tests_log_file.exists():
-                        # remove the log file if it exists
-                        se.bash.run(f"rm {tests_log_file}")
-                    try:
-                        with se.TimeUtils.time_limit(600):
-                            end_time = -1
-                            start_time = time.time()
-                            deps_file = (
-                                Macros.unit_tests_dir
-                                / f"{project_name}-{sha}"
-                                / "deps.txt"
+                            file_content = se.io.load(
+                                file_path_with_inline_test_temp, se.io.Fmt.txt
                             )
+
+                            if original_code in file_content:
+                                file_content = file_content.replace(
+                                    original_code, mutated_code
+                                )
+                                se.io.dump(
+                                    file_path_with_inline_test_temp,
+                                    file_content,
+                                    se.io.Fmt.txt,
+                                )
+                            else:
+                                # replace the original code with the mutated code
+                                # String buildNumber = matcher.group( 4 ) in the file content may be String buildNumber = matcher.group(4)
+                                remove_space_original_code = original_code.replace(
+                                    " ", ""
+                                )
+                                lines = file_content.splitlines()
+                                replace = False
+                                new_lines = []
+                                for line in lines:
+                                    if line != "" and line.strip().replace(
+                                        " ", ""
+                                    ).startswith(remove_space_original_code):
+                                        new_line = (
+                                            mutated_code
+                                            + line.strip().replace(" ", "")[
+                                                len(remove_space_original_code) :
+                                            ]
+                                        )
+                                        new_lines.append(new_line)
+                                        replace = True
+                                    else:
+                                        new_lines.append(line)
+                                if not replace:
+                                    error_message = f"cannot find {original_code} in {file_path_with_inline_test}"
+                                    print(error_message)
+                                    if log_path:
+                                        se.io.dump(
+                                            log_path,
+                                            [error_message],
+                                            se.io.Fmt.txtList,
+                                            append=True,
+                                        )
+                                    self.append_mutants_journal(
+                                        journal_path, mutant["id"]
+                                    )
+                                    continue
+
+                                se.io.dump(
+                                    file_path_with_inline_test_temp,
+                                    "\n".join(new_lines),
+                                    se.io.Fmt.txt,
+                                )
                             if test_type == Macros.r0:
-                                # run all inline tests
-                                run_res, returncode = Util.run_inline_tests(
+                                Util.parse_inline_tests(
                                     project_name,
                                     sha,
+                                    f"{Macros.r0_tests_dir}/{project_name}-{sha}",
                                     f"{Macros.r0_its_dir}/{project_name}-{sha}",
-                                    f"{Macros.r0_tests_dir}/{project_name}-{sha}/{Macros.INLINE_GEN_DIR_NAME}",
-                                    deps_file,
-                                    inline_test_name,
+                                    file_path_with_inline_test_temp,
                                 )
                             elif test_type == Macros.r1:
-                                # run inline tests
-                                run_res, returncode = Util.run_inline_tests(
+                                Util.parse_inline_tests(
                                     project_name,
                                     sha,
+                                    f"{Macros.r1_tests_dir}/{project_name}-{sha}",
                                     f"{Macros.r1_its_dir}/{project_name}-{sha}",
-                                    f"{Macros.r0_tests_dir}/{project_name}-{sha}/{Macros.INLINE_GEN_DIR_NAME}",
-                                    deps_file,
-                                    inline_test_name,
-                                )
-                            elif test_type in [
-                                Macros.dev,
-                                Macros.randoop,
-                                Macros.evosuite,
-                            ]:
-                                returncode = self.run_tests(
-                                    project_name, sha, test_type, seed, tests_log_file
+                                    file_path_with_inline_test_temp,
                                 )
-                            end_time = time.time()
-                            if test_type == Macros.r0 or test_type == Macros.r1:
-                                if run_res == "compilation failure":
-                                    mutant["compilation_failure"] = True
-                                else:
-                                    mutant["compilation_failure"] = False
-                                updated_mutants.append(mutant)
-                                if mutant["compilation_failure"]:
-                                    # The mutated code itself can be compiled successfully, but the inline test may not be compiled successfully. For example, the code is
-                                    """
-                                    int m (int a, int b){
-                                        a = a >> 1; // original code
-                                        a = b >> 1; // mutated code
-                                        itest().given(a, 1).checkEq(a, 2); // inline test
-                                        a += b;
-                                        return a
-                                    }
-                                    """
-                                    continue
-                                se.io.dump(
-                                    tests_log_file, run_res, se.io.Fmt.jsonPretty
+                            # clean the temp file
+                            se.bash.run(f"rm {file_path_with_inline_test_temp}")
+                        # add timeout when running tests
+                        if test_type in [Macros.r0, Macros.r1]:
+                            # remove the result of a previous run
+                            result_store.delete(test_type, mutant["id"])
+                        else:
+                            # no enough space to save all the log files, so Macros.dev, Macros.randoop, Macros.evosuite will share the same log file across different mutants
+                            tests_log_file = (
+                                eval_log
+                                / f"{project_name}-{sha}-{test_type}-{mutator}.log"
+                            )
+                            if tests_log_file.exists():
+                                # remove the log file if it exists
+                                se.bash.run(f"rm {tests_log_file}")
+                        try:
+                            # the tests are killed at timeout, this also bounds the builds
+                            with se.TimeUtils.time_limit(
+                                timeout + Macros.MUTANT_TIMEOUT_CAP
+                            ):
+                                end_time = -1
+                                start_time = time.time()
+                                deps_file = (
+                                    Macros.unit_tests_dir
+                                    / f"{project_name}-{sha}"
+                                    / "deps.txt"
                                 )
-                    except se.TimeoutException:
-                        mutant_res[f"{test_type}-killed"] = False
-                        mutant_res[f"{test_type}-time"] = 600
-                        mutant_res["reason"] = "timeout"
-                        res.append(mutant_res)
-                        continue
-                    except Exception as e:
-                        print("error", e)
-                        if end_time == -1:
-                            end_time = time.time()
-                        mutant_res[f"{test_type}-killed"] = False
+                                if test_type == Macros.r0:
+                                    # run all inline tests
+                                    run_res, returncode = Util.run_inline_tests(
+                                        project_name,
+                                        sha,
+                                        f"{Macros.r0_its_dir}/{project_name}-{sha}",
+                                        f"{Macros.r0_tests_dir}/{project_name}-{sha}/{Macros.INLINE_GEN_DIR_NAME}",
+                                        deps_file,
+                                        inline_test_name,
+                                        compile_project=not schemata,
+                                        fail_fast=kill_only,
+                                        timeout=timeout,
+                                    )
+                                elif test_type == Macros.r1:
+                                    # run inline tests
+                                    run_res, returncode = Util.run_inline_tests(
+                                        project_name,
+                                        sha,
+                                        f"{Macros.r1_its_dir}/{project_name}-{sha}",
+                                        f"{Macros.r0_tests_dir}/{project_name}-{sha}/{Macros.INLINE_GEN_DIR_NAME}",
+                                        deps_file,
+                                        inline_test_name,
+                                        compile_project=not schemata,
+                                        fail_fast=kill_only,
+                                        timeout=timeout,
+                                    )
+                                elif test_type in [
+                                    Macros.dev,
+                                    Macros.randoop,
+                                    Macros.evosuite,
+                                ]:
+                                    returncode = self.run_tests(
+                                        project_name,
+                                        sha,
+                                        test_type,
+                                        seed,
+                                        tests_log_file,
+                                        selected_tests,
+                                        mutant["id"] if in_schemata else None,
+                                        # a failing test is a kill only if no test fails without the mutant
+                                        kill_only and initial_num_failed_tests == 0,
+                                        timeout,
+                                    )
+                                end_time = time.time()
+                                if test_type == Macros.r0 or test_type == Macros.r1:
+                                    if run_res == "compilation failure":
+                                        mutant["compilation_failure"] = True
+                                    else:
+                                        mutant["compilation_failure"] = False
+                                    if mutant["compilation_failure"]:
+                                        # The mutated code itself can be compiled successfully, but the inline test may not be compiled successfully. For example, the code is
+                                        """
+                                        int m (int a, int b){
+                                            a = a >> 1; // original code
+                                            a = b >> 1; // mutated code
+                                            itest().given(a, 1).checkEq(a, 2); // inline test
+                                            a += b;
+                                            return a
+                                        }
+                                        """
+                                        self.append_mutants_journal(
+                                            journal_path,
+                                            mutant["id"],
+                                            updated_mutant=mutant,
+                                        )
+                                        continue
+                                    result_store.put(
+                                        test_type,
+                                        mutant["id"],
+                                        inline_test_name,
+                                        run_res,
+                                    )
+                        except se.TimeoutException:
+                            mutant_res[f"{test_type}-killed"] = False
+                            mutant_res[f"{test_type}-time"] = time.time() - start_time
+                            mutant_res[f"{test_type}-kill-category"] = (
+                                Macros.KILL_CATEGORY_TIMEOUT
+                            )
+                            mutant_res[f"{test_type}-timeout"] = timeout
+                            mutant_res["reason"] = "timeout"
+                            self.append_mutants_journal(
+                                journal_path, mutant["id"], mutant_res
+                            )
+                            continue
+                        except Exception as e:
+                            print("error", e)
+                            if end_time == -1:
+                                end_time = time.time()
+                            mutant_res[f"{test_type}-killed"] = False
+                            mutant_res[f"{test_type}-time"] = end_time - start_time
+                            mutant_res["reason"] = str(e)
+                            self.append_mutants_journal(
+                                journal_path, mutant["id"], mutant_res
+                            )
+                            continue
                         mutant_res[f"{test_type}-time"] = end_time - start_time
-                        mutant_res["reason"] = str(e)
-                        res.append(mutant_res)
-                        continue
-                    if test_type in [Macros.r0, Macros.r1]:
-                        if returncode == 0:
+                        if Util.is_timeout_returncode(
+                            returncode, end_time - start_time, timeout
+                        ):
+                            # not killed by a test, the timeout may be a kill (e.g., an infinite loop)
                             mutant_res[f"{test_type}-killed"] = False
+                            mutant_res[f"{test_type}-kill-category"] = (
+                                Macros.KILL_CATEGORY_TIMEOUT
+                            )
+                            mutant_res[f"{test_type}-timeout"] = timeout
+                            mutant_res["reason"] = "timeout"
+                        elif test_type in [Macros.r0, Macros.r1]:
+                            if returncode == 0:
+                                mutant_res[f"{test_type}-killed"] = False
+                            else:
+                                mutant_res[f"{test_type}-killed"] = True
+                            if kill_only and run_res:
+                                failed_records = Util.get_failed_junit_records(run_res)
+                                if failed_records:
+                                    mutant_res[f"{test_type}-killer"] = (
+                                        failed_records[0]["classname"]
+                                        + "#"
+                                        + failed_records[0]["name"]
+                                    )
                         else:
-                            mutant_res[f"{test_type}-killed"] = True
-                    else:
-                        num_failed_tests = self.get_num_failed_tests(tests_log_file)
-                        print(
-                            "initial_num_failed_tests: ",
-                            initial_num_failed_tests,
-                            "num_failed_tests: ",
-                            num_failed_tests,
-                        )
-                        if num_failed_tests > initial_num_failed_tests:
-                            mutant_res[f"{test_type}-killed"] = True
-                        else:
-                            mutant_res[f"{test_type}-killed"] = False
-                    mutant_res[f"{test_type}-time"] = end_time - start_time
-                print("mutant_res", mutant_res)
-                res.append(mutant_res)
+                            num_failed_tests = self.get_num_failed_tests(tests_log_file)
+                            print(
+                                "initial_num_failed_tests: ",
+                                initial_num_failed_tests,
+                                "num_failed_tests: ",
+                                num_failed_tests,
+                            )
+                            if num_failed_tests > initial_num_failed_tests:
+                                mutant_res[f"{test_type}-killed"] = True
+                                if kill_only:
+                                    mutant_res[f"{test_type}-killer"] = (
+                                        self.get_killing_test(tests_log_file)
+                                    )
+                            else:
+                                mutant_res[f"{test_type}-killed"] = False
+                        if mutant_res[f"{test_type}-killed"]:
+                            mutant_res[f"{test_type}-kill-category"] = (
+                                Macros.KILL_CATEGORY_TEST
+                            )
+                    print("mutant_res", mutant_res)
+                    self.append_mutants_journal(
+                        journal_path,
+                        mutant["id"],
+                        mutant_res,
+                        mutant if test_type in [Macros.r0, Macros.r1] else None,
+                    )
             # save the results
+            res, updated_mutants = self.materialize_mutants_journal(journal_path)
             mutants_result_dir = Macros.results_dir / "mutants-eval-results"
             if not os.path.exists(mutants_result_dir):
                 se.bash.run(f"mkdir -p {mutants_result_dir}")
@@ -336,13 +528,168 @@ class Eval:
                     se.io.Fmt.jsonPretty,
                 )
 
+    def get_baseline_time_path(self, project_name: str, sha: str, test_type: str):
+        return (
+            Macros.results_dir
+            / "mutants-eval-results"
+            / "baseline-time"
+            / f"{project_name}-{sha}-{test_type}.json"
+        )
+
+    def get_baseline_time(
+        self,
+        project_name: str,
+        sha: str,
+        test_type: str,
+        resume: bool = False,
+        schemata: bool = False,
+    ) -> float:
+        """
+        Get the time of the inline tests of the test type (r0 or r1) without mutant, which runs them all if it is not recorded by a previous run. Only the JUnit run is timed, as only it is bounded by the timeout of a mutant, the project and the inline tests are compiled before.
+
+        Args:
+            resume (bool, optional): Whether to reuse the time recorded by a previous run. Defaults to False.
+            schemata (bool, optional): Whether the project is already compiled, as the mutants are run. Defaults to False.
+        """
+        baseline_time_path = self.get_baseline_time_path(project_name, sha, test_type)
+        if resume and baseline_time_path.exists():
+            return se.io.load(baseline_time_path, se.io.Fmt.json)["time"]
+        if test_type == Macros.r0:
+            its_dir = f"{Macros.r0_its_dir}/{project_name}-{sha}"
+        else:
+            its_dir = f"{Macros.r1_its_dir}/{project_name}-{sha}"
+        deps_file = Macros.unit_tests_dir / f"{project_name}-{sha}" / "deps.txt"
+        if not schemata:
+            Util.prepare_project(project_name, sha)
+        Util.run_inline_tests(
+            project_name,
+            sha,
+            its_dir,
+            f"{Macros.r0_tests_dir}/{project_name}-{sha}/{Macros.INLINE_GEN_DIR_NAME}",
+            deps_file,
+            compile_project=not schemata,
+            run_tests=False,
+        )
+        start_time = time.time()
+        Util.run_compiled_inline_tests(
+            project_name, sha, deps_file, timeout=Macros.MUTANT_TIMEOUT_CAP
+        )
+        return time.time() - start_time
+
+    def get_mutant_timeout(self, baseline_time: float = None) -> int:
+        """
+        Get the timeout (s) of the tests of a mutant, min(cap, factor * baseline time + constant), see Macros.MUTANT_TIMEOUT_*.
+
+        Args:
+            baseline_time (float, optional): The time (s) of the tests without mutant. Defaults to None, which gives the cap.
+        """
+        if baseline_time is None:
+            return Macros.MUTANT_TIMEOUT_CAP
+        return int(
+            min(
+                Macros.MUTANT_TIMEOUT_CAP,
+                Macros.MUTANT_TIMEOUT_FACTOR * baseline_time
+                + Macros.MUTANT_TIMEOUT_CONSTANT,
+            )
+        )
+
+    def get_mutants_journal_path(
+        self, project_name: str, sha: str, mutator: str, test_type: str
+    ):
+        return (
+            Macros.results_dir
+            / "mutants-eval-results"
+            / f"{project_name}-{sha}-{mutator}-{test_type}.jsonl"
+        )
+
+    def append_mutants_journal(
+        self,
+        journal_path: str,
+        mutant_id: int,
+        mutant_res: dict = None,
+        updated_mutant: dict = None,
+    ):
+        """
+        Append the evaluation of a mutant to the journal and flush it to disk.
+
+        Args:
+            journal_path (str): The path to the journal.
+            mutant_id (int): The id of the mutant.
+            mutant_res (dict, optional): The result of the mutant, None if the mutant was not run. Defaults to None.
+            updated_mutant (dict, optional): The mutant with its compilation_failure flag, for r0 and r1. Defaults to None.
+        """
+        entry = {"id": mutant_id, "result": mutant_res}
+        if updated_mutant is not None:
+            entry["mutant"] = updated_mutant
+        with open(journal_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load_mutants_journal(self, journal_path: str) -> List[dict]:
+        if not os.path.exists(journal_path):
+            return []
+        entries = []
+        with open(journal_path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # the last line may be partial after a crash
+                    continue
+        return entries
+
+    def materialize_mutants_journal(self, journal_path: str):
+        """
+        Build the results and the updated mutants from the journal, the last entry of a mutant wins.
+
+        Returns:
+            Tuple[List[dict], List[dict]]: The results of the mutants, and the mutants updated by r0 or r1.
+        """
+        id_to_entry = {}
+        for entry in self.load_mutants_journal(journal_path):
+            id_to_entry[entry["id"]] = entry
+        res = [e["result"] for e in id_to_entry.values() if e["result"] is not None]
+        updated_mutants = [e["mutant"] for e in id_to_entry.values() if "mutant" in e]
+        return res, updated_mutants
+
     def run_tests(
-        self, project_name: str, sha: str, test_type: str, seed: int, log_file: str
+        self,
+        project_name: str,
+        sha: str,
+        test_type: str,
+        seed: int,
+        log_file: str,
+        tests: List[str] = None,
+        mutant_id: int = None,
+        fail_fast: bool = False,
+        timeout: int = 600,
     ):
+        """
+        Run the unit tests of the test type.
+
+        Args:
+            tests (List[str], optional): Only run these test classes. Defaults to None, which runs all test classes.
+            mutant_id (int, optional): The mutant to select in the mutant schemata build left by a previous run, which is not rebuilt. Defaults to None, which builds the project.
+            fail_fast (bool, optional): Whether to stop at the first failing test. Defaults to False.
+            timeout (int, optional): Timeout (s) of the tests, which are killed with the processes they forked. Defaults to 600.
+        """
+        compile_project = mutant_id is None
         deps_file = Macros.unit_tests_dir / f"{project_name}-{sha}" / "deps.txt"
         if test_type == Macros.dev:
             # run unit tests
-            returncode = Util.run_dev_written_unit_tests(project_name, log_file)
+            returncode = Util.run_dev_written_unit_tests(
+                project_name,
+                log_file,
+                timeout=timeout,
+                tests=tests,
+                compile_project=compile_project,
+                mutant_id=mutant_id,
+                fail_fast=fail_fast,
+            )
         elif test_type == Macros.randoop:
             # run randoop tests
             generated_tests_dir = (
@@ -351,7 +698,16 @@ class Eval:
                 / f"{Macros.randoop}-tests-{seed}"
                 / f"{Macros.randoop}-tests"
             )
-            returncode = Util.run_randoop(project_name, generated_tests_dir, log_file)
+            returncode = Util.run_randoop(
+                project_name,
+                generated_tests_dir,
+                log_file,
+                timeout=timeout,
+                tests=tests,
+                compile_project=compile_project,
+                mutant_id=mutant_id,
+                fail_fast=fail_fast,
+            )
         elif test_type == Macros.evosuite:
             # run evosuite tests
             generated_tests_dir = (
@@ -365,11 +721,35 @@ class Eval:
                 generated_tests_dir,
                 deps_file,
                 log_file,
-                600,
+                timeout,
                 False,
+                tests,
+                compile_project=compile_project,
+                mutant_id=mutant_id,
+                fail_fast=fail_fast,
             )
         return returncode
 
+    def get_killing_test(self, log_path: str):
+        """
+        Get the first failing test from the log file of the unit tests, printed by the fail-fast runners or by surefire.
+
+        Args:
+            log_path (str): The path to the log file.
+        """
+        if not os.path.exists(log_path):
+            return None
+        surefire_failure = re.compile(
+            r"^\[ERROR\] (?!Tests run:)(\S+)\s+Time elapsed: .*<<< (?:FAILURE|ERROR)!"
+        )
+        for line in se.io.load(log_path, se.io.Fmt.txtList):
+            if line.startswith(Macros.KILLED_BY):
+                return line[len(Macros.KILLED_BY) :].strip()
+            match = surefire_failure.match(line)
+            if match:
+                return match.group(1)
+        return None
+
     def get_num_failed_tests(self, log_path: str):
         """
         Get the number of failed tests from the log file.
@@ -406,6 +786,10 @@ class Eval:
         test_types: List[str] = None,
         mutator: str = Macros.universalmutator,
         test_project_name: str = None,
+        resume: bool = False,
+        test_selection: bool = False,
+        schemata: bool = False,
+        kill_only: bool = False,
     ):
         """
         Batch process all projects to run tests after applying each mutant to source, and check if tests can kill the mutant.
@@ -414,6 +798,10 @@ class Eval:
             test_types (List[str], optional): The types of tests to run. Available options are ["r0", "r1", "dev", "randoop", "evosuite"]. Defaults to None. If None, all types of tests will be run.
             mutator (str, optional): The type of mutator. Available options are ["universalmutator", "major"]. Defaults to "universalmutator".
             test_project_name (str, optional): The name of the project to be tested. If None, run tests for all projects. Defaults to None.
+            resume (bool, optional): Whether to skip the mutants already evaluated in a previous, interrupted run. Defaults to False.
+            test_selection (bool, optional): Whether to run only the unit test classes covering the mutated line. Defaults to False.
+            schemata (bool, optional): Whether to build the project once for all mutants instead of once per mutant. Defaults to False.
+            kill_only (bool, optional): Whether to stop running the tests of a mutant at the first failing test. Defaults to False, which runs the full matrix needed by test_to_killed_mutants.
         """
         if test_types is None:
             test_types = [
@@ -448,6 +836,10 @@ class Eval:
                 test_types,
                 mutator,
                 log_path,
+                resume=resume,
+                test_selection=test_selection,
+                schemata=schemata,
+                kill_only=kill_only,
             )
             end_time = time.time()
             res_dict[f"{project_name}-time"] = end_time - start_time
@@ -614,51 +1006,53 @@ class Eval:
         if not mutants_file.exists():
             return
         mutants = se.io.load(mutants_file, se.io.Fmt.json)
+        with MutantResultStore(project_name, sha, mutator) as result_store:
+            id_to_records = result_store.get_all(test_type)
         for mutant in mutants:
             if "compilation_failure" in mutant and mutant["compilation_failure"]:
                 continue
-            # log/eval/AquaticInformatics_aquarius-sdk-java-8f4edb9-all-AquariusServerVersion_19Test.java-0-{mutator}.log
             index = mutant["id"]
             filepath = mutant["filepath"]
             linenumber = mutant["linenumber"]
-            test_name = (
-                filepath.split("/")[-1].replace(".java", "") + f"_{linenumber}Test.java"
-            )
-            mutation_res_file = (
-                Macros.log_dir
-                / "eval"
-                / f"{project_name}-{sha}-{test_type}-{test_name}-{index}-{mutator}.log"
-            )
-            if not mutation_res_file.exists():
-                print(f"file not exist: {mutation_res_file}")
-                continue
-            report = se.io.load(mutation_res_file, se.io.Fmt.json)
-            if report is None or "testcase" not in report["testsuite"]:
-                print(f"{mutation_res_file} is null")
+            if index in id_to_records:
+                records = Util.load_junit_records(id_to_records[index])
+            else:
+                # evaluated before the result store, one file per run
+                # log/eval/AquaticInformatics_aquarius-sdk-java-8f4edb9-all-AquariusServerVersion_19Test.java-0-{mutator}.log
+                test_name = (
+                    filepath.split("/")[-1].replace(".java", "")
+                    + f"_{linenumber}Test.java"
+                )
+                mutation_res_file = (
+                    Macros.log_dir
+                    / "eval"
+                    / f"{project_name}-{sha}-{test_type}-{test_name}-{index}-{mutator}.log"
+                )
+                if not mutation_res_file.exists():
+                    print(f"no result of mutant {index}")
+                    continue
+                records = Util.load_junit_records(
+                    se.io.load(mutation_res_file, se.io.Fmt.json)
+                )
+            if not records:
+                print(f"result of mutant {index} is null")
                 continue
-            test_cases = report["testsuite"]["testcase"]
-            if not isinstance(test_cases, list):
-                test_cases = [test_cases]
-            for test_case in test_cases:
-                if "failure" in test_case or "error" in test_case:
-                    target_stmt_linenumber = (
-                        test_case["@classname"]
-                        .split(".")[-1]
-                        .split("_")[-1]
-                        .replace("Test", "")
-                    )
-                    inline_test_linenumber = (
-                        test_case["@name"].replace("testLine", "").replace("()", "")
-                    )
-                    killed_mutants_item = {
-                        "test_class_name": test_case["@classname"],
-                        "test_method_name": test_case["@name"],
-                        "target_stmt_linenumber": target_stmt_linenumber,
-                        "inline_test_linenumber": inline_test_linenumber,
-                        "id": index,
-                        "killed_mutant_file_path": filepath,
-                    }
-                    killed_mutants_res.append(killed_mutants_item)
+            for record in Util.get_failed_junit_records(records):
+                target_stmt_linenumber = (
+                    record["classname"].split(".")[-1].split("_")[-1].replace("Test", "")
+                )
+                inline_test_linenumber = (
+                    record["name"].replace("testLine", "").replace("()", "")
+                )
+                killed_mutants_item = {
+                    "test_class_name": record["classname"],
+                    "test_method_name": record["name"],
+                    "target_stmt_linenumber": target_stmt_linenumber,
+                    "inline_test_linenumber": inline_test_linenumber,
+                    "id": index,
+                    "killed_mutant_file_path": filepath,
+                }
+                killed_mutants_res.append(killed_mutants_item)
 
         se.io.dump(
             killed_mutants_file,
@@ -956,6 +1350,7 @@ class Eval:
             se.bash.run("git clean -xfd")
             se.bash.run("git checkout .")
             se.bash.run(f"git checkout {sha}")
+        source_index = SourceIndex.of_project(project_name, sha)
         line_no_to_test = dict()
         if test_type == Macros.r1:
             source_code_dir_path = Macros.r1_tests_dir / f"{project_name}-{sha}"
@@ -988,11 +1383,7 @@ class Eval:
                         inline_test_code.split(")")[0].split(",")[-1].strip()
                     )
                     # find the java file path with class name
-                    filepaths = glob.glob(
-                        f"{Macros.downloads_dir}/{project_name}"
-                        + f"/**/{classname.replace(r'.', r'/')}.java",
-                        recursive=True,
-                    )
+                    filepaths = source_index.get_class_paths(classname)
                     if len(filepaths) != 1:
                         print(filepaths)
                         raise Exception(
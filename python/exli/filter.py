@@ -6,6 +6,7 @@ import traceback
 
 import seutil as se
 from exli.macros import Macros
+from exli.maven import mvn_cmd
 from exli.util import Util
 from jsonargparse import CLI
 
@@ -246,7 +247,7 @@ class Filter:
                 print("compiling project...")
                 Util.remove_jacoco_extension()
                 se.bash.run(
-                    f"mvn clean test-compile {Macros.SKIPS} > {Macros.log_dir}/teco/{project_name}-compile.txt",
+                    mvn_cmd(f"clean test-compile {Macros.SKIPS} > {Macros.log_dir}/teco/{project_name}-compile.txt"),
                     0,
                     timeout=600,
                 )
@@ -261,7 +262,7 @@ class Filter:
                 print("running tests...")
                 start = time.time()
                 se.bash.run(
-                    f"mvn test {Macros.SKIPS} > {Macros.log_dir}/teco/{project_name}-test.txt",
+                    mvn_cmd(f"test {Macros.SKIPS} > {Macros.log_dir}/teco/{project_name}-test.txt"),
                     0,
                     timeout=1200,
                 )
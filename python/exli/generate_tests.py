@@ -1,6 +1,8 @@
 import os
+from pathlib import Path
 
 import seutil as se
+from exli.budget import BudgetAllocator
 from exli.filter import Filter
 from exli.macros import Macros
 from exli.util import Util
@@ -19,6 +21,9 @@ class Generate:
         time_limit: int = 100,
         dep_file_path: str = None,
         classpath_list_path: str = None,
+        num_workers: int = 1,
+        budget_allocation: bool = False,
+        min_time_limit: int = 10,
     ):
         """
         Generate tests for a project with one seed
@@ -33,6 +38,9 @@ class Generate:
             time_limit (int, optional): The time limit (seconds per class) for the test generation. Defaults to 100.
             dep_file_path (str, optional): The path to the dependency file. Defaults to None.
             classpath_list_path (str, optional): The path to the classpath list file. Defaults to None.
+            num_workers (int, optional): The number of test generation processes running at the same time. Defaults to 1.
+            budget_allocation (bool, optional): Only generate tests for the classes with target statements, and split the total time limit (time_limit per class) in proportion to the target statements of each class not covered by the developer-written tests. Defaults to False.
+            min_time_limit (int, optional): The minimum time limit (seconds) of a class when budget_allocation is True. Defaults to 10.
         """
         Util.prepare_project_for_test_generation(
             project_name,
@@ -46,7 +54,34 @@ class Generate:
             ),
         )
         Util.avoid_permission_error(project_name)
+        # index target statements by class
+        target_stmts_path = (
+            Macros.results_dir / "target-stmt" / f"{project_name}-{sha}.txt"
+        )
+        allocator = None
+        if target_stmts_path.exists():
+            allocator = BudgetAllocator(
+                target_stmts_path,
+                Macros.results_dir
+                / "coverage"
+                / f"{project_name}-{sha}-{Macros.dev}-{Macros.DEFAULT_SEED}-covMap.json",
+            )
         if test_type == Macros.randoop:
+            class_to_time_limit = None
+            shards = None
+            if budget_allocation and allocator is not None:
+                classpath_list = allocator.select_classes(
+                    se.io.load(classpath_list_path, se.io.Fmt.txtList)
+                )
+                classpath_list_path = (
+                    Path(classpath_list_path).parent / "target-classpath-list.txt"
+                )
+                se.io.dump(classpath_list_path, classpath_list, se.io.Fmt.txtList)
+                class_to_time_limit = allocator.allocate(
+                    classpath_list, len(classpath_list) * time_limit, min_time_limit
+                )
+                if num_workers > 1:
+                    shards = BudgetAllocator.partition(class_to_time_limit, num_workers)
             res = Util.generate_randoop_tests(
                 project_name,
                 seed,
@@ -55,32 +90,23 @@ class Generate:
                 time_limit,
                 dep_file_path,
                 classpath_list_path,
+                num_workers,
+                class_to_time_limit,
+                shards,
             )
             Util.fix_randoop_generated_tests_helper(project_name, output_dir)
         elif test_type == Macros.evosuite:
-            # get target statements, and parse into classpath-list.txt
-            target_stmts_path = (
-                Macros.results_dir / "target-stmt" / f"{project_name}-{sha}.txt"
-            )
-            if target_stmts_path.exists():
-                lines = se.io.load(target_stmts_path, se.io.Fmt.txtList)
-                parsed_classpath_list = [
-                    Util.file_path_to_class_name(line.split(";")[1]) for line in lines
-                ]
+            class_to_time_limit = None
+            if allocator is not None:
                 # filter in all classpath list because there are some inner classes that start with parsed_classpath + $
-                all_classpath_list = se.io.load(classpath_list_path, se.io.Fmt.txtList)
-                filtered_classpath_set = set()
-                for c in all_classpath_list:
-                    for parsed_classpath in parsed_classpath_list:
-                        if c == parsed_classpath or c.startswith(
-                            parsed_classpath + "$"
-                        ):
-                            filtered_classpath_set.add(c)
-                se.io.dump(
-                    classpath_list_path,
-                    list(filtered_classpath_set),
-                    se.io.Fmt.txtList,
+                classpath_list = allocator.select_classes(
+                    se.io.load(classpath_list_path, se.io.Fmt.txtList)
                 )
+                se.io.dump(classpath_list_path, classpath_list, se.io.Fmt.txtList)
+                if budget_allocation:
+                    class_to_time_limit = allocator.allocate(
+                        classpath_list, len(classpath_list) * time_limit, min_time_limit
+                    )
             res = Util.generate_evosuite_tests(
                 project_name,
                 seed,
@@ -89,6 +115,8 @@ class Generate:
                 time_limit,
                 dep_file_path,
                 classpath_list_path,
+                num_workers,
+                class_to_time_limit,
             )
         else:
             res = f"Unknown test type: {test_type}"
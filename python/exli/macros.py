@@ -18,6 +18,9 @@ class Macros:
     results_dir: Path = project_dir / "results"
     figure_dir: Path = results_dir / "figures"
     table_dir: Path = results_dir / "tables"
+    projects_file: Path = (
+        data_dir / "teco-projects-2022-01-01-unit-tests-jacoco-randoop.json"
+    )
 
     unit_tests_dir: Path = project_dir / "generated-tests"
     r0_tests_dir: Path = project_dir / "r0-tests"
@@ -31,8 +34,13 @@ class Macros:
     itest_java_dir: Path = project_dir.parent / "inlinetest" / "java"
     all_mutants_dir: Path = results_dir / "all-mutants"
     mutants_dir: Path = results_dir / "mutants"
+    mutant_results_store_dir: Path = results_dir / "mutant-runs"
     jacoco_extension_dir: Path = project_dir / "jacoco-extension"
     time_dir: Path = results_dir / "time"
+    object_store_dir: Path = project_dir / "object-store"
+    classpath_cache_dir: Path = project_dir / "classpath-cache"
+    source_index_dir: Path = project_dir / "source-index"
+    workspace_pool_dir: Path = project_dir / "workspaces"
 
     jar_dir: Path = project_dir / "jars"
     evosuite_jar = jar_dir / "evosuite-master-1.2.1-SNAPSHOT.jar"
@@ -41,13 +49,19 @@ class Macros:
     evosuite_runtime_jar = jar_dir / "evosuite-master-1.2.1-SNAPSHOT.jar"
     randoop_jar = jar_dir / "randoop-all-4.3.1.jar"
     junit_jar = jar_dir / "junit-platform-console-standalone-1.9.0-RC1.jar"
+    # local Maven repository prefetched for the corpus (python -m exli.main batch_prefetch_maven_repo), Maven runs offline with it for the projects recorded in the marker without failed goals
+    maven_repo_dir: Path = project_dir / "m2-repository"
+    maven_prefetched_marker: Path = maven_repo_dir / ".exli-prefetched.json"
+    # also installed in maven_repo_dir by the prefetch
     itest_jar: str = (
         home_dir / ".m2/repository/org/inlinetest/inlinetest/1.0/inlinetest-1.0.jar"
     )
     jacoco_agent_jar = jar_dir / "org.jacoco.agent-0.8.8-runtime.jar"
+    jacococli_jar = jar_dir / "jacococli-0.8.10.jar"
     raninline_jar = java_raninline_dir / "target" / "raninline-1.0-SNAPSHOT.jar"
     jacoco_extension_jar = jar_dir / "jacoco-extension-1.0-SNAPSHOT.jar"
     major_script = jar_dir / "major" / "bin" / "major"
+    mvnd_script = jar_dir / "mvnd" / "bin" / "mvnd"
 
     target_stmt_types = ["regex", "string", "bit", "stream"]
     # inline test types
@@ -82,6 +96,34 @@ class Macros:
     SKIPS = "-Djacoco.skip " + SKIPS_NO_JACOCO
     INLINE_GEN_DIR_NAME = ".inlinegen"
     INLINE_TEST_PACKAGE = "inlinetests"
+    LOG_BUFFER_SIZE = 64 * 1024  # chars buffered per log file by the raninline runtime
+    LOG_FLUSH_INTERVAL = 1000  # ms between writes of the buffered logs
+    REDUCTION_FULL = "full"  # r1 reduction analyzes all classes for every coverage snapshot
+    REDUCTION_DELTA = "delta"  # r1 reduction analyzes only classes whose coverage probes changed
+    MAVEN_BACKEND_MVN = "mvn"  # a new Maven JVM per build
+    MAVEN_BACKEND_MVND = "mvnd"  # builds sent to a long-lived Maven daemon
+    MAVEN_BACKEND = os.environ.get("EXLI_MAVEN_BACKEND", MAVEN_BACKEND_MVN)
+    # reset the working copy of a project from a pristine, pre-built worktree instead of git checkout/clean
+    USE_WORKSPACE_POOL = os.environ.get("EXLI_WORKSPACE_POOL", "0") == "1"
+    MUTANT_PROPERTY = "exli.mutant"  # system property selecting the mutant of a mutant schemata build
+    KILLED_BY = "[fail-fast] killed by "  # printed by the fail-fast runners of raninline before the first failing test
+    # trivial compiler equivalence of a mutant (tce_status), see MutantDeduplicator
+    TCE_UNIQUE = "unique"
+    TCE_EQUIVALENT = "equivalent"  # same class files as the original code
+    TCE_DUPLICATE = "duplicate"  # same class files as the mutant in duplicate_of
+    TCE_UNKNOWN = "unknown"  # cannot be compiled alone, kept
+    # timeout (s) of the tests of a mutant: min(cap, factor * time of the tests without mutant + constant)
+    MUTANT_TIMEOUT_FACTOR = 3
+    MUTANT_TIMEOUT_CONSTANT = 60
+    MUTANT_TIMEOUT_CAP = 600
+    # hard timeout (s) of an EvoSuite run of a class: factor * search budget + constant, the constant covers the JVM startup, instrumentation, assertion generation and writing the tests
+    EVOSUITE_TIMEOUT_FACTOR = 5
+    EVOSUITE_TIMEOUT_CONSTANT = 120
+    TIMEOUT_KILL_AFTER = 10  # s between SIGTERM and SIGKILL of the processes of a timed out command
+    TIMEOUT_RETURNCODE = 124  # exit code of GNU timeout when the command timed out
+    # why a mutant is killed (<test type>-kill-category)
+    KILL_CATEGORY_TEST = "test"  # a test failed
+    KILL_CATEGORY_TIMEOUT = "timeout"  # the tests did not finish within the timeout of the mutant
     DEVELOPER_TESTS = "DT"
     DEFAULT_SEED = 42
 
@@ -118,3 +160,12 @@ class Macros:
     projects_with_no_inline_tests = [
         "onelogin_onelogin-java-sdk",
     ]
+
+    excluded_projects = set(
+        projects_without_target_stmts
+        + projects_without_covered_stmts
+        + projects_needs_to_be_excluded
+        + projects_with_jacoco_exception
+        + project_with_timeout
+        + projects_with_no_inline_tests
+    )
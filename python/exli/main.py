@@ -1,15 +1,20 @@
 import glob
-from typing import Set
+from typing import List, Set
 from jsonargparse import CLI
 import seutil as se
-from exli.maven import MavenProject
+from exli.maven import MavenProject, get_maven_backend, get_mvnd, mvn_cmd
 from exli.macros import Macros
 import time
 import traceback
 from exli.util import Util
 import os
 import collections
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from exli.generate_tests import Generate
+from exli.object_store import ObjectStore
+from exli.schemata import MutantSchemata
+from exli.tce import MutantDeduplicator
+from exli.workspace_pool import WorkspacePool
 import re
 
 
@@ -31,7 +36,7 @@ class Main:
         # prepare jacoco extension plugin
         Util.remove_jacoco_extension()
         with se.io.cd(Macros.jacoco_extension_dir):
-            se.bash.run("mvn package", 0)
+            se.bash.run(mvn_cmd("package"), 0)
 
         # run all projects
         time_res_file = Macros.time_dir / "extract-inline-tests.json"
@@ -86,6 +91,11 @@ class Main:
         seed: int = Macros.DEFAULT_SEED,
         log_path: str = None,
         time_dict: dict = dict(),
+        log_buffer_size: int = Macros.LOG_BUFFER_SIZE,
+        log_flush_interval: int = Macros.LOG_FLUSH_INTERVAL,
+        r1_reduction: str = Macros.REDUCTION_FULL,
+        num_workers: int = 1,
+        budget_allocation: bool = False,
     ):
         """
         Generate inline tests for a project.
@@ -101,11 +111,16 @@ class Main:
             seed (int, optional): The seed for test generation. Defaults to Macros.DEFAULT_SEED.
             log_path (str, optional): The path for the log file. Defaults to None.
             time_dict (dict, optional): The dictionary to store the time for each step. Defaults to dict().
+            log_buffer_size (int, optional): The number of chars the instrumented code buffers per log file before writing it. Defaults to Macros.LOG_BUFFER_SIZE.
+            log_flush_interval (int, optional): The interval (milliseconds) after which buffered logs are written. Defaults to Macros.LOG_FLUSH_INTERVAL.
+            r1_reduction (str, optional): The strategy to decide if a new inline test increases coverage. "full" analyzes all classes for each snapshot, "delta" only analyzes the classes whose coverage probes changed. Defaults to "full".
+            num_workers (int, optional): The number of test generation processes running at the same time. Defaults to 1.
+            budget_allocation (bool, optional): Whether to split the test generation time limit between the classes in proportion to their uncovered target statements. Defaults to False.
         """
         ################################## process input, prepare project ##################################
         if log_path is None:
             log_path = Macros.log_dir / "raninline.log"
-        inputs = f"--project_name={project_name} --sha={sha} --randoop={randoop} --randoop_tl={randoop_tl} --dev={dev} --evosuite={evosuite} --evosuite_tl={evosuite_tl} --seed={seed} --log_path={log_path}"
+        inputs = f"--project_name={project_name} --sha={sha} --randoop={randoop} --randoop_tl={randoop_tl} --dev={dev} --evosuite={evosuite} --evosuite_tl={evosuite_tl} --seed={seed} --log_path={log_path} --log_buffer_size={log_buffer_size} --log_flush_interval={log_flush_interval} --r1_reduction={r1_reduction} --num_workers={num_workers} --budget_allocation={budget_allocation}"
         se.bash.run(f'echo "{inputs}" >> {log_path}')
 
         Util.compile_raninline()
@@ -138,7 +153,7 @@ class Main:
 
         ################################## Generate Unit Tests ##################################
         with se.io.cd(Macros.downloads_dir / project_name):
-            se.bash.run("mvn test-compile " + Macros.SKIPS, 0)
+            se.bash.run(mvn_cmd("test-compile " + Macros.SKIPS), 0)
 
         # generate tests with Randoop / EvoSuite
         unit_tests_dir_dict = dict()
@@ -172,6 +187,8 @@ class Main:
                     time_limit,
                     deps_file_path,
                     classpath_list_path,
+                    num_workers,
+                    budget_allocation,
                 )
                 generate_end_time = time.time()
                 time_dict[f"{project_name}-{sha}-{tool}"] = (
@@ -188,7 +205,7 @@ class Main:
                 is_auto_generated = Util.is_auto_generated_file(java_file_path)
                 if not is_auto_generated:
                     se.bash.run(
-                        f'mvn exec:java -Dexec.mainClass="org.raninline.App" -Dexec.args="i {java_file_path} -1 {log_path} {r0_log_path} {r1_log_path} {classes_dir}"',
+                        mvn_cmd(f'exec:java -Dexec.mainClass="org.raninline.App" -Dexec.args="i {java_file_path} -1 {log_path} {r0_log_path} {r1_log_path} {classes_dir}"'),
                         0,
                     )
         instrument_end_time = time.time()
@@ -202,7 +219,7 @@ class Main:
             maven_project.hack_pom_add_dependency(
                 "org.raninline", "raninline", "1.0-SNAPSHOT"
             )
-            se.bash.run("mvn test-compile " + Macros.SKIPS, 0)
+            se.bash.run(mvn_cmd("test-compile " + Macros.SKIPS), 0)
 
         ################################## Run tests ##################################
         run_tests_log_dir = Macros.log_dir / "run-unit-tests"
@@ -213,7 +230,13 @@ class Main:
             if run_tests_log_path.exists():
                 run_tests_log_path.unlink()
             Util.run_unit_tests(
-                Macros.dev, project_name, f"{run_tests_log_path}", maven_project
+                Macros.dev,
+                project_name,
+                f"{run_tests_log_path}",
+                maven_project,
+                log_buffer_size=log_buffer_size,
+                log_flush_interval=log_flush_interval,
+                reduction=r1_reduction,
             )
         if evosuite:
             run_tests_log_path = (
@@ -228,6 +251,9 @@ class Main:
                 maven_project,
                 unit_tests_dir_dict[Macros.evosuite],
                 deps_file_path,
+                log_buffer_size=log_buffer_size,
+                log_flush_interval=log_flush_interval,
+                reduction=r1_reduction,
             )
         if randoop:
             run_tests_log_path = run_tests_log_dir / f"{project_name}-{sha}-randoop.log"
@@ -239,6 +265,9 @@ class Main:
                 f"{run_tests_log_path}",
                 maven_project,
                 unit_tests_dir_dict[Macros.randoop],
+                log_buffer_size=log_buffer_size,
+                log_flush_interval=log_flush_interval,
+                reduction=r1_reduction,
             )
         run_tests_end_time = time.time()
         time_dict[f"{project_name}-{sha}-run-tests"] = (
@@ -246,8 +275,11 @@ class Main:
         )
 
         ################################## Save serialized data ##################################
-        se.bash.run(
-            f"cp -r {Macros.downloads_dir}/{project_name}/{Macros.INLINE_GEN_DIR_NAME} {proj_r0_tests_dir}"
+        # the serialized objects go to the shared object store, r0-tests/<project>-<sha>/.inlinegen links to them
+        ObjectStore().save(
+            project_name,
+            sha,
+            f"{Macros.downloads_dir}/{project_name}/{Macros.INLINE_GEN_DIR_NAME}",
         )
 
         ################################## Parse log ##################################
@@ -269,12 +301,15 @@ class Main:
         )
 
     # python -m exli.main batch_run_inline_tests
-    def batch_run_inline_tests(self, test_project_name: str = None):
+    def batch_run_inline_tests(
+        self, test_project_name: str = None, combined: bool = False
+    ):
         """
         Run inline tests for each project.
 
         Args:
             test_project_name (str, optional): The name of the project to be tested. If None, all projects are tested. Defaults to None.
+            combined (bool, optional): Whether to run r0 and r1 inline tests in a single pass. Defaults to False.
         """
         time_file_path = Macros.time_dir / "run-inline-tests.json"
         if time_file_path.exists():
@@ -283,7 +318,7 @@ class Main:
             time_dict = {}
         # install I-Test
         with se.io.cd(Macros.itest_java_dir):
-            se.bash.run("mvn clean install -DskipTests", 0)
+            se.bash.run(mvn_cmd("clean install -DskipTests"), 0)
         log_path = Macros.log_dir / "run-its.log"
         if os.path.exists(log_path):
             os.remove(log_path)
@@ -299,6 +334,21 @@ class Main:
                         / f"{project_name}-{sha}"
                         / Macros.INLINE_GEN_DIR_NAME
                     )
+                    if combined:
+                        start_time = time.time()
+                        self.run_inline_tests_combined(
+                            project_name,
+                            sha,
+                            cached_objects_dir,
+                            deps_file,
+                            True,
+                            log_path,
+                        )
+                        end_time = time.time()
+                        time_dict[f"{project_name}-{Macros.r0}-{Macros.r1}"] = (
+                            end_time - start_time
+                        )
+                        continue
                     start_time = time.time()
                     self.run_inline_tests(
                         project_name,
@@ -410,12 +460,93 @@ class Main:
             print(
                 f"Some inline tests failed for {project_name} {sha} during execution."
             )
-        if run_res:
+        if run_res is not None:
             se.io.dump(
                 inlinetest_report_path,
                 run_res,
-                se.io.Fmt.jsonPretty,
+                se.io.Fmt.json,
+            )
+
+    # python -m exli.main run_inline_tests_combined --project_name "Asana_java-asana" --sha "52fef9b"
+    def run_inline_tests_combined(
+        self,
+        project_name: str,
+        sha: str,
+        cached_objects_dir: str = None,
+        deps_file: str = None,
+        parse_inline_tests: bool = False,
+        log_path: str = None,
+    ):
+        """
+        Run r0 and r1 inline tests for a project in a single pass, compiling the project and launching JUnit only once.
+
+        Args:
+            project_name (str): The name of the project.
+            sha (str): The commit hash.
+            cached_objects_dir (str, optional): The path to the cached objects.
+            deps_file (str, optional): The path to the dependencies file.
+            parse_inline_tests (bool, optional): Whether to force parsing inline tests when inline tests dir is not empty. Defaults to False.
+            log_path (str, optional): The path for the log file. Defaults to None.
+        """
+        if cached_objects_dir is None:
+            cached_objects_dir = (
+                Macros.r0_tests_dir
+                / f"{project_name}-{sha}"
+                / Macros.INLINE_GEN_DIR_NAME
             )
+        if deps_file is None:
+            deps_file = Util.get_deps_file_path(project_name, sha)
+
+        tag_to_dirs = {
+            Macros.r1: (
+                f"{Macros.r1_tests_dir}/{project_name}-{sha}",
+                f"{Macros.r1_its_dir}/{project_name}-{sha}",
+                f"{Macros.r1_its_report_dir}/{project_name}-{sha}.json",
+            ),
+            Macros.r0: (
+                f"{Macros.r0_tests_dir}/{project_name}-{sha}",
+                f"{Macros.r0_its_dir}/{project_name}-{sha}",
+                f"{Macros.r0_its_report_dir}/{project_name}-{sha}.json",
+            ),
+        }
+        inputs = f"--project_name={project_name} --sha={sha} --cached_objects_dir={cached_objects_dir} --deps_file={deps_file} --parse_inline_tests={parse_inline_tests} --log_path={log_path}"
+        se.bash.run(f'echo "{inputs}" >> {log_path}')
+
+        Util.prepare_project(project_name, sha)
+
+        tag_to_inline_tests_dir = {}
+        for tag, (generated_tests_dir, inline_tests_dir, _) in tag_to_dirs.items():
+            # source files with inline tests do not exist
+            if not os.path.exists(generated_tests_dir):
+                print(f"{generated_tests_dir} does not exist")
+                continue
+            if not os.path.exists(inline_tests_dir) or parse_inline_tests:
+                Util.parse_inline_tests(
+                    project_name, sha, generated_tests_dir, inline_tests_dir
+                )
+            tag_to_inline_tests_dir[tag] = inline_tests_dir
+        if not tag_to_inline_tests_dir:
+            return
+
+        tag_to_result = Util.run_inline_tests_combined(
+            project_name,
+            sha,
+            tag_to_inline_tests_dir,
+            cached_objects_dir,
+            deps_file,
+            log_path,
+        )
+        for tag, (run_res, returncode) in tag_to_result.items():
+            if returncode != 0:
+                print(
+                    f"Some {tag} inline tests failed for {project_name} {sha} during execution."
+                )
+            if run_res is not None:
+                se.io.dump(
+                    tag_to_dirs[tag][2],
+                    run_res,
+                    se.io.Fmt.json,
+                )
 
     # python -m exli.main analyze_inline_tests_reports --inline_test_type="r1"
     def analyze_inline_tests_reports(self, inline_test_type: str):
@@ -446,6 +577,7 @@ class Main:
         else:
             failed_tests = set()
         passed_tests = set()
+        project_names = set(Util.get_project_names_list())
         for report_file in os.listdir(test_report_dir):
             if not report_file.endswith(".json"):
                 continue
@@ -454,34 +586,27 @@ class Main:
                 project_name = match.group(1)
             else:
                 continue
-            if project_name not in Util.get_project_names_list():
+            if project_name not in project_names:
                 continue
             report = se.io.load(f"{test_report_dir}/{report_file}", se.io.Fmt.json)
-            if not report or "compilation failure" in report:
-                continue
-            # number_of_tests = report["testsuite"]["@tests"]
-            # number_of_errors = report["testsuite"]["@errors"]
-            # number_of_failures = report["testsuite"]["@failures"]
             # failed tests detail
-            if "testcase" not in report["testsuite"]:
+            records = Util.load_junit_records(report)
+            if not records:
                 continue
-            test_cases = report["testsuite"]["testcase"]
-            if not isinstance(test_cases, list):
-                test_cases = [test_cases]
-            for test_case in test_cases:
+            for record in records:
                 target_stmt_linenumber = (
-                    test_case["@classname"]
+                    record["classname"]
                     .split(".")[-1]
                     .split("_")[-1]
                     .replace("Test", "")
                 )
-                class_name = test_case["@classname"].replace(
+                class_name = record["classname"].replace(
                     f"_{target_stmt_linenumber}Test", ""
                 )
                 inline_test_linenumber = (
-                    test_case["@name"].replace("testLine", "").replace("()", "")
+                    record["name"].replace("testLine", "").replace("()", "")
                 )
-                if "failure" in test_case or "error" in test_case:
+                if record["status"] in ["failure", "error"]:
                     # collect the failed test
                     failed_tests.add(
                         f"{project_name};{class_name};{target_stmt_linenumber};{inline_test_linenumber}"
@@ -585,6 +710,184 @@ class Main:
             se.io.Fmt.jsonPretty,
         )
 
+    # python -m exli.main benchmark_maven_backends
+    def benchmark_maven_backends(
+        self,
+        test_project_name: str = None,
+        goals: str = f"test-compile {Macros.SKIPS}",
+        repeats: int = 3,
+    ):
+        """
+        Compare the build time of mvn and mvnd on the projects with a pom.xml in poms/. Each backend builds each project repeats times, the first build of mvnd includes starting the daemon. The times are saved in results/time/maven-backends.json.
+
+        Args:
+            test_project_name (str): The name of the project to be benchmarked. If None, all projects in poms/ are benchmarked.
+            goals (str): The goals and options of the builds. Defaults to test-compile with the skips.
+            repeats (int): The number of builds per backend and project. Defaults to 3.
+        """
+        if get_mvnd() is None:
+            print("mvnd is not available, only mvn is measured")
+        time_file_path = Macros.time_dir / "maven-backends.json"
+        if time_file_path.exists():
+            time_dict = se.io.load(time_file_path, se.io.Fmt.json)
+        else:
+            time_dict = {}
+        log_path = Macros.log_dir / "benchmark-maven-backends.log"
+        se.io.mkdir(log_path.parent)
+        for pom_path in sorted(glob.glob(f"{Macros.project_dir}/poms/*-pom.xml")):
+            project_name = os.path.basename(pom_path)[: -len("-pom.xml")]
+            if test_project_name is not None and project_name != test_project_name:
+                continue
+            sha = Util.get_sha(project_name)
+            if sha is None:
+                continue
+            Util.prepare_project(project_name, sha)
+            se.bash.run(
+                f"cp {pom_path} {Macros.downloads_dir}/{project_name}/pom.xml"
+            )
+            project_times = {}
+            for backend in [Macros.MAVEN_BACKEND_MVN, Macros.MAVEN_BACKEND_MVND]:
+                if (
+                    backend == Macros.MAVEN_BACKEND_MVND
+                    and get_maven_backend(goals, backend) == "mvn"
+                ):
+                    # mvnd would fall back to mvn
+                    continue
+                cmd = mvn_cmd(goals, backend=backend)
+                times = []
+                with se.io.cd(Macros.downloads_dir / project_name):
+                    for _ in range(repeats):
+                        se.bash.run(mvn_cmd("clean", backend=backend))
+                        start_time = time.time()
+                        rr = se.bash.run(f"{cmd} &>> {log_path}")
+                        times.append(
+                            time.time() - start_time if rr.returncode == 0 else None
+                        )
+                project_times[backend] = times
+                print(f"{project_name} {backend}: {times}")
+            time_dict[project_name] = project_times
+            se.io.dump(time_file_path, time_dict, se.io.Fmt.jsonPretty)
+
+    # python -m exli.main batch_prefetch_maven_repo
+    def batch_prefetch_maven_repo(self, test_project_name: str = None):
+        """
+        Resolve the plugins and dependencies of the tools and of each project into Macros.maven_repo_dir. Once done, the mvn commands built with mvn_cmd for the tools and for the projects whose goals all succeeded run offline with that repository, the other projects still run online.
+
+        Args:
+            test_project_name (str): The name of the project to be prefetched. If None, all projects are prefetched.
+        """
+        local_repo = Macros.maven_repo_dir
+        se.io.mkdir(local_repo)
+        log_path = Macros.log_dir / "prefetch-maven-repo.log"
+        se.io.mkdir(log_path.parent)
+        # tools used by every project
+        with se.io.cd(Macros.java_raninline_dir):
+            se.bash.run(
+                f"{mvn_cmd('install -DskipTests dependency:resolve-plugins', False, local_repo)} &>> {log_path}",
+                0,
+            )
+        with se.io.cd(Macros.jacoco_extension_dir):
+            se.bash.run(
+                f"{mvn_cmd('package dependency:resolve-plugins', False, local_repo)} &>> {log_path}",
+                0,
+            )
+        default_itest_jar = (
+            Macros.home_dir
+            / ".m2/repository/org/inlinetest/inlinetest/1.0/inlinetest-1.0.jar"
+        )
+        if default_itest_jar.exists():
+            se.bash.run(
+                mvn_cmd(
+                    f"install:install-file -Dfile={default_itest_jar} -DgroupId=org.inlinetest -DartifactId=inlinetest -Dversion=1.0 -Dpackaging=jar",
+                    False,
+                    local_repo,
+                ),
+                0,
+            )
+
+        # goals run by the later steps, their plugins and dependencies are resolved too
+        goals = [
+            "dependency:go-offline dependency:resolve-plugins",
+            f"install -DskipTests {Macros.SKIPS}",
+            "dependency:build-classpath -Dmdep.outputFile=/dev/null",
+            "-q exec:exec -Dexec.executable=echo -Dexec.args=%classpath",
+            # no test is run, but the surefire providers and the jacoco agent are resolved
+            f"-Dmaven.ext.class.path={Macros.jacoco_extension_jar} test -Dtest=ExliNoSuchTest -DfailIfNoTests=false -Dsurefire.failIfNoSpecifiedTests=false {Macros.SKIPS_NO_JACOCO}",
+        ]
+        prefetched = {}
+        for project_name, sha in Util.get_project_names_list_with_sha():
+            if test_project_name is not None and project_name != test_project_name:
+                continue
+            print(f"prefetching {project_name}...")
+            try:
+                Util.prepare_project(project_name, sha)
+                # the dependencies of raninline (added to the pom.xml of the projects later) are resolved when installing it above
+                with se.io.cd(Macros.downloads_dir / project_name):
+                    failed_goals = []
+                    for goal in goals:
+                        rr = se.bash.run(
+                            f"{mvn_cmd(goal, False, local_repo)} &>> {log_path}"
+                        )
+                        if rr.returncode != 0:
+                            failed_goals.append(goal)
+                prefetched[project_name] = {"sha": sha, "failed_goals": failed_goals}
+            except Exception:
+                print(traceback.format_exc())
+                prefetched[project_name] = {"sha": sha, "failed_goals": goals}
+        if Macros.maven_prefetched_marker.exists():
+            prefetched = {
+                **se.io.load(Macros.maven_prefetched_marker, se.io.Fmt.json),
+                **prefetched,
+            }
+        se.io.dump(Macros.maven_prefetched_marker, prefetched, se.io.Fmt.jsonPretty)
+
+    # python -m exli.main batch_build_workspaces
+    def batch_build_workspaces(self, test_project_name: str = None):
+        """
+        Build the pristine worktree of each project, used by prepare_project when the workspace pool is enabled (EXLI_WORKSPACE_POOL=1).
+
+        Args:
+            test_project_name (str): The name of the project to be processed. If None, all projects are processed.
+        """
+        workspace_pool = WorkspacePool()
+        for project_name, sha in Util.get_project_names_list_with_sha():
+            if test_project_name is not None and project_name != test_project_name:
+                continue
+            print(f"building the pristine worktree of {project_name}-{sha}...")
+            Util.prepare_project(project_name, sha, checkout=False)
+            workspace_pool.build_pristine(project_name, sha)
+
+    # python -m exli.main batch_cache_classpath --num_workers=4
+    def batch_cache_classpath(
+        self, test_project_name: str = None, num_workers: int = 4
+    ):
+        """
+        Fill the classpath cache for each project, so that the later steps read the dependency classpath and the class list without running Maven.
+
+        Args:
+            test_project_name (str): The name of the project to be processed. If None, all projects are processed.
+            num_workers (int): The number of projects processed at the same time. Defaults to 4.
+        """
+        projects = [
+            (project_name, sha)
+            for project_name, sha in Util.get_project_names_list_with_sha()
+            if test_project_name is None or project_name == test_project_name
+        ]
+        # each worker changes its own working directory
+        with ProcessPoolExecutor(max_workers=max(1, num_workers)) as executor:
+            future_to_project = {
+                executor.submit(Util.cache_classpath, project_name, sha): project_name
+                for project_name, sha in projects
+            }
+            for future in as_completed(future_to_project):
+                project_name = future_to_project[future]
+                try:
+                    cached = future.result()
+                except Exception:
+                    print(traceback.format_exc())
+                    cached = False
+                print(f"{project_name}: {'cached' if cached else 'failed'}")
+
     # python -m exli.main batch_find_target_stmts
     def batch_find_target_stmts(self, test_project_name: str = None):
         """
@@ -640,10 +943,38 @@ class Main:
                     is_auto_generated = Util.is_auto_generated_file(full_file_path)
                     if not is_auto_generated:
                         se.bash.run(
-                            f'mvn exec:java -Dexec.mainClass="org.raninline.App" -Dexec.args="target-stmt {full_file_path} {target_stmts_path}"',
+                            mvn_cmd(f'exec:java -Dexec.mainClass="org.raninline.App" -Dexec.args="target-stmt {full_file_path} {target_stmts_path}"'),
                             0,
                         )
 
+    # python -m exli.main batch_dedup_mutants --mutator universalmutator
+    def batch_dedup_mutants(
+        self, mutator: str = Macros.universalmutator, test_project_name: str = None
+    ):
+        """
+        Record the trivial compiler equivalence of the existing mutants of each project in the mutants file.
+
+        Args:
+            mutator(str): universalmutator or major
+            test_project_name(str): only dedup the mutants of the specified project
+        """
+        for project_name, sha in Util.get_project_names_list_with_sha():
+            if test_project_name is not None and project_name != test_project_name:
+                continue
+            mutants_file = Macros.mutants_dir / f"{project_name}-{sha}-{mutator}.json"
+            if not mutants_file.exists():
+                continue
+            mutants = se.io.load(mutants_file, se.io.Fmt.json)
+            self.dedup_mutants_of_project(project_name, sha, mutants)
+            se.io.dump(mutants_file, mutants, se.io.Fmt.jsonPretty)
+
+    def dedup_mutants_of_project(self, project_name: str, sha: str, mutants: list):
+        # the mutants are compiled against the original version
+        Util.prepare_project(project_name, sha)
+        with se.io.cd(Macros.downloads_dir / project_name):
+            se.bash.run(mvn_cmd(f"compile {Macros.SKIPS}"), 0)
+        MutantDeduplicator(project_name, sha).dedup(mutants)
+
     # python -m exli.main batch_generate_mutants
     def batch_generate_mutants(
         self,
@@ -651,6 +982,8 @@ class Main:
         filter_with_inline_tests: bool = True,
         mutator: str = Macros.universalmutator,
         test_project_name: str = None,
+        schemata: bool = False,
+        tce: bool = True,
     ):
         """
         Generate mutants for each project.
@@ -660,6 +993,8 @@ class Main:
             filter_with_inline_tests(bool): only generate mutants for target statements that have inline tests
             tool(str): universalmutator or major
             test_project_name(str): only generate mutants for the specified project
+            schemata(bool): check that the mutants compile with one build of mutant schemata per project
+            tce(bool): mark the mutants equivalent to the original code or to another mutant by trivial compiler equivalence
         """
         time_file_path = (
             Macros.results_dir / "time" / f"generate-mutants-{mutator}.json"
@@ -699,6 +1034,8 @@ class Main:
                 output_path,
                 mutator,
                 filter_with_inline_tests,
+                schemata,
+                tce,
             )
             end_time = time.time()
             time_dict[project_name] = end_time - start_time
@@ -713,6 +1050,8 @@ class Main:
         output_path: str,
         mutator: str = Macros.universalmutator,
         filter_with_inline_tests: bool = True,
+        schemata: bool = False,
+        tce: bool = True,
     ):
         """
         Generate mutants for a project.
@@ -724,6 +1063,8 @@ class Main:
             output_path (str): The path to store the mutants.
             tool (str, optional): The tool to generate mutants. Defaults to "universalmutator".
             filter_with_inline_tests(bool): only generate mutants for target statements that have inline tests
+            schemata(bool): instead of compiling every mutant, compile all mutants at once as mutant schemata, only the mutants that cannot be embedded are compiled one at a time
+            tce(bool): record the trivial compiler equivalence of each mutant (tce_status, duplicate_of), the equivalent and duplicate mutants are not evaluated
         """
         result = []
 
@@ -733,51 +1074,63 @@ class Main:
 
         Util.prepare_project(project_name, sha)
 
-        # loop through lines in file:https://stackoverflow.com/questions/48124206/iterate-through-a-file-lines-in-python
+        # one mutator run per file for all target statements in the file
+        file_to_line_nums = collections.defaultdict(set)
+        for target_stmt in target_stmts:
+            orig_path = target_stmt.split(";")[0]
+            line_num = target_stmt.split(";")[1]
+            file_to_line_nums[orig_path].add(line_num)
         if mutator == Macros.universalmutator:
-            for target_stmt in target_stmts:
-                orig_path = target_stmt.split(";")[0]
-                line_num = target_stmt.split(";")[1]
-                line_results = self.generate_mutants_for_each_line(
-                    project_name, orig_path, line_num
+            for orig_path, line_nums in file_to_line_nums.items():
+                line_results = self.generate_universalmutator_mutants_for_each_file(
+                    project_name, orig_path, line_nums, not schemata
                 )
                 result.extend(line_results)
         elif mutator == Macros.major:
-            file_to_line_nums = collections.defaultdict(set)
-            for target_stmt in target_stmts:
-                orig_path = target_stmt.split(";")[0]
-                line_num = target_stmt.split(";")[1]
-                file_to_line_nums[orig_path].add(line_num)
             for orig_path, line_nums in file_to_line_nums.items():
                 line_results = self.generate_mutants_for_each_file(
-                    project_name, sha, orig_path, line_nums
+                    project_name, sha, orig_path, line_nums, not schemata
                 )
                 result.extend(line_results)
+        if schemata:
+            result = self.compile_mutants_with_schemata(project_name, result)
 
         # save results
         if result:
             # for each item in result, add index
             for i, item in enumerate(result):
                 item["id"] = i
+            if tce:
+                self.dedup_mutants_of_project(project_name, sha, result)
             se.io.dump(
                 output_path,
                 result,
                 se.io.Fmt.jsonPretty,
             )
 
-    def generate_mutants_for_each_line(
-        self, project_name: str, orig_path: str, line_num: str
+    def generate_universalmutator_mutants_for_each_file(
+        self,
+        project_name: str,
+        orig_path: str,
+        line_nums: Set[str],
+        compile: bool = True,
     ):
+        """
+        Generate the mutants of the target lines of a file with one UniversalMutator run, each mutant is mapped back to its line by diffing it with the original file.
+        """
         results = []
 
         mutants_path = Macros.log_dir / f"{project_name}-mutants-temp"
-        if not mutants_path.exists():
-            se.bash.run(f"mkdir -p {mutants_path}")
+        if mutants_path.exists():
+            se.bash.run(f"rm -rf {mutants_path}")
+        se.bash.run(f"mkdir -p {mutants_path}")
 
         line_num_file_path = Macros.log_dir / f"{project_name}-templinenum.txt"
-        se.io.dump(line_num_file_path, line_num, se.io.Fmt.txt)
-        # Step 3: call UniversalMutator and append json to results (loop through created mutants)
-        # https://www.geeksforgeeks.org/how-to-iterate-over-files-in-directory-using-python/
+        se.io.dump(
+            line_num_file_path,
+            sorted(line_nums, key=int),
+            se.io.Fmt.txtList,
+        )
 
         with se.io.cd(Macros.downloads_dir / project_name):
             # clean the project
@@ -788,43 +1141,108 @@ class Main:
             f"mutate {orig_path} --noCheck --mutantDir {mutants_path} --lines {line_num_file_path}",
             0,
         )
-        # count number of lines in original file
-        orig_line_num = self.file_len(orig_path)
-        for filename in os.scandir(mutants_path):
-            if filename.is_file():
-                mutant_line_num = self.file_len(filename.path)
-                # make json here (ignore mutants that insert or delete a line)
-                if orig_line_num == mutant_line_num:
-                    # check if the project can be compiled
-                    compile_result = self.compile_mutated_code(
-                        project_name, orig_path, filename.path, line_num
-                    )
-                    if compile_result:
-                        results.append(compile_result)
+        orig_lines = se.io.load(orig_path, se.io.Fmt.txt).splitlines()
+        line_num_to_mutants = collections.defaultdict(list)
+        for filename in sorted(os.scandir(mutants_path), key=lambda f: f.name):
+            if not filename.is_file():
+                continue
+            mutant_lines = se.io.load(filename.path, se.io.Fmt.txt).splitlines()
+            # ignore mutants that insert or delete a line
+            if len(mutant_lines) != len(orig_lines):
+                continue
+            changed_line_nums = [
+                str(i + 1)
+                for i, (orig_line, mutant_line) in enumerate(
+                    zip(orig_lines, mutant_lines)
+                )
+                if orig_line != mutant_line
+            ]
+            if len(changed_line_nums) != 1 or changed_line_nums[0] not in line_nums:
+                continue
+            line_num = changed_line_nums[0]
+            if compile:
+                # check if the project can be compiled
+                mutant = self.compile_mutated_code(
+                    project_name, orig_path, filename.path, line_num
+                )
+            else:
+                mutated_code = mutant_lines[int(line_num) - 1]
+                if self.is_comment_mutant(mutated_code):
+                    continue
+                mutant = {
+                    "filepath": orig_path,
+                    "linenumber": int(line_num),
+                    "orginal_code": orig_lines[int(line_num) - 1],
+                    "mutated_code": mutated_code,
+                }
+            if mutant:
+                line_num_to_mutants[line_num].append(mutant)
+        for line_num in sorted(line_num_to_mutants, key=int):
+            results.extend(line_num_to_mutants[line_num])
         # clean
         se.bash.run(f"rm -rf {mutants_path}")
         se.bash.run(f"rm -rf {line_num_file_path}")
         return results
 
-    # https://stackoverflow.com/questions/845058/how-to-get-line-count-of-a-large-file-cheaply-in-python
-    def file_len(self, filename: str) -> int:
-        with open(filename) as f:
-            for i, _ in enumerate(f):
-                pass
-        return i + 1
-
     def get_line(self, filename: str, line_num: int) -> str:
         lines = se.io.load(filename, se.io.Fmt.txtList)
         return lines[line_num - 1]
 
+    def is_comment_mutant(self, mutated_code: str) -> bool:
+        # ignore mutants that are comments
+        return mutated_code.strip().startswith(r"/*") and mutated_code.strip().endswith(
+            r"*/"
+        )
+
+    def get_mutant(self, orig_path: str, mutated_file_path: str, line_num: str):
+        """
+        Get the mutant on the line of the mutated file, without checking if it compiles.
+        """
+        mutated_code = self.get_line(mutated_file_path, int(line_num))
+        if self.is_comment_mutant(mutated_code):
+            return {}
+        return {
+            "filepath": orig_path,
+            "linenumber": int(line_num),
+            "orginal_code": self.get_line(orig_path, int(line_num)),
+            "mutated_code": mutated_code,
+        }
+
+    def compile_mutants_with_schemata(self, project_name: str, mutants: List[dict]):
+        """
+        Keep the mutants that compile, with one compilation of the mutants embedded as mutant schemata, the other mutants are compiled one at a time.
+        """
+        with se.io.cd(Macros.downloads_dir / project_name):
+            se.bash.run(f"git clean -xfd", 0)
+            se.bash.run(f"git checkout .", 0)
+        # temporary ids selecting the mutants in the schemata
+        for i, mutant in enumerate(mutants):
+            mutant["id"] = i
+        mutant_schemata = MutantSchemata(project_name, mutants)
+        mutant_schemata.apply()
+        mutant_schemata.compile()
+        compiled_ids = {m["id"] for m in mutants if mutant_schemata.is_schematized(m)}
+        print(f"{len(compiled_ids)}/{len(mutants)} mutants compiled in schemata")
+        for mutant in mutants:
+            if mutant["id"] in compiled_ids:
+                continue
+            with se.io.cd(Macros.downloads_dir / project_name):
+                se.bash.run(f"git clean -xfd", 0)
+                se.bash.run(f"git checkout .", 0)
+                lines = se.io.load(mutant["filepath"], se.io.Fmt.txt).splitlines()
+                lines[mutant["linenumber"] - 1] = mutant["mutated_code"]
+                se.io.dump(mutant["filepath"], "\n".join(lines), se.io.Fmt.txt)
+                if se.bash.run(mvn_cmd("compile")).returncode == 0:
+                    compiled_ids.add(mutant["id"])
+        with se.io.cd(Macros.downloads_dir / project_name):
+            se.bash.run(f"git checkout .", 0)
+        return [m for m in mutants if m["id"] in compiled_ids]
+
     def compile_mutated_code(
         self, project_name: str, orig_path: str, mutated_file_path: str, line_num: str
     ):
         mutated_code = self.get_line(mutated_file_path, int(line_num))
-        if mutated_code.strip().startswith(r"/*") and mutated_code.strip().endswith(
-            r"*/"
-        ):
-            # ignore mutants that are comments
+        if self.is_comment_mutant(mutated_code):
             return {}
         with se.io.cd(Macros.downloads_dir / project_name):
             # clean the project
@@ -835,7 +1253,7 @@ class Main:
             # copy the mutated file to the original file
             se.bash.run(f"cp {mutated_file_path} {orig_path}")
             try:
-                se.bash.run(f"mvn compile", 0)
+                se.bash.run(mvn_cmd("compile"), 0)
                 # if the project can be compiled, save the mutant
                 return {
                     "filepath": orig_path,
@@ -848,7 +1266,12 @@ class Main:
                 return {}
 
     def generate_mutants_for_each_file(
-        self, project_name: str, sha: str, orig_path: str, line_nums: Set[str]
+        self,
+        project_name: str,
+        sha: str,
+        orig_path: str,
+        line_nums: Set[str],
+        compile: bool = True,
     ):
         results = []
 
@@ -861,7 +1284,7 @@ class Main:
             se.bash.run(f"git clean -xfd", 0)
             se.bash.run(f"git checkout .", 0)
             # compile the project with javac (required by Major)
-            se.bash.run("mvn test-compile $SKIPS", 0)
+            se.bash.run(mvn_cmd("test-compile $SKIPS"), 0)
             deps_path = f"{Macros.unit_tests_dir}/{project_name}-{sha}/deps.txt"
             se.bash.run(f"cp {deps_path} .", 0)
 
@@ -890,9 +1313,12 @@ class Main:
                         print(f"Error: {mutant_id} has {len(java_files)} java files")
                         continue
                     mutant_path = java_files[0]
-                    compile_res = self.compile_mutated_code(
-                        project_name, orig_path, mutant_path, line_num
-                    )
+                    if compile:
+                        compile_res = self.compile_mutated_code(
+                            project_name, orig_path, mutant_path, line_num
+                        )
+                    else:
+                        compile_res = self.get_mutant(orig_path, mutant_path, line_num)
                     if compile_res:
                         results.append(compile_res)
         # clean
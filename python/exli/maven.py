@@ -6,10 +6,149 @@ from typing import List, Set
 import seutil as su
 import xmltodict
 import os
+import shutil
+import zipfile
+from exli.classpath_cache import ClasspathCache
+from exli.macros import Macros
 
 logger = su.log.get_logger(__name__, su.log.INFO)
 SKIPS_NO_JACOCO = "-Dcheckstyle.skip -Drat.skip -Denforcer.skip -Danimal.sniffer.skip -Dmaven.javadoc.skip -Dfindbugs.skip -Dwarbucks.skip -Dmodernizer.skip -Dimpsort.skip -Dpmd.skip -Dxjc.skip -Dair.check.skip-all"
 SKIPS = "-Djacoco.skip " + SKIPS_NO_JACOCO
+# see jacoco-extension/src/main/java/edu/illinois/extension/ReactorInfoExtension.java
+REACTOR_JSON_PROPERTY = "exli.reactor.json"
+REACTOR_INFO_EXTENSION = "edu.illinois.extension.ReactorInfoExtension"
+
+
+def has_reactor_info_extension(jar: Path = None) -> bool:
+    """Whether the jacoco extension jar is built with the reactor info participant (older builds only have the jacoco participant)"""
+    if jar is None:
+        jar = Macros.jacoco_extension_jar
+    if not jar.exists():
+        return False
+    try:
+        with zipfile.ZipFile(jar) as zf:
+            # the participant is only loaded if it is registered as a plexus component
+            components = zf.read("META-INF/plexus/components.xml").decode()
+    except (KeyError, zipfile.BadZipFile):
+        return False
+    return REACTOR_INFO_EXTENSION in components
+
+
+@functools.lru_cache(maxsize=None)
+def ensure_reactor_info_extension() -> bool:
+    """Build the jacoco extension jar from jacoco-extension into jars/ if it does not have the reactor info participant, at most once per process
+
+    Returns:
+        whether the jar has the participant afterwards
+    """
+    if has_reactor_info_extension():
+        return True
+    try:
+        with su.io.cd(Macros.jacoco_extension_dir):
+            su.bash.run(mvn_cmd("-q clean package -DskipTests"), 0)
+        shutil.copyfile(
+            Macros.jacoco_extension_dir / "target" / Macros.jacoco_extension_jar.name,
+            Macros.jacoco_extension_jar,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to build {Macros.jacoco_extension_jar}: {e}")
+    return has_reactor_info_extension()
+
+
+def get_maven_project_name(cwd: Path = None) -> str:
+    """The corpus project whose working copy or pristine worktree contains the directory, None if there is none"""
+    if cwd is None:
+        cwd = Path(os.getcwd())
+    cwd = Path(cwd).resolve()
+    for root_dir in [Macros.downloads_dir, Macros.workspace_pool_dir]:
+        try:
+            rel_path = cwd.relative_to(Path(root_dir).resolve())
+        except ValueError:
+            continue
+        if not rel_path.parts:
+            return None
+        if root_dir == Macros.workspace_pool_dir:
+            # <project>-<sha>
+            return rel_path.parts[0].rsplit("-", 1)[0]
+        return rel_path.parts[0]
+    return None
+
+
+def is_maven_offline(project_name: str = None) -> bool:
+    """Maven runs offline with the prefetched local repository for the tools and the projects whose goals were all prefetched (see Main.batch_prefetch_maven_repo)
+
+    Args:
+        project_name: the project built, defaults to the project of the current directory
+    """
+    if not Macros.maven_prefetched_marker.exists():
+        return False
+    if project_name is None:
+        project_name = get_maven_project_name()
+    if project_name is None:
+        # the tools are prefetched before any project
+        cwd = Path(os.getcwd()).resolve()
+        return any(
+            cwd == Path(tool_dir).resolve() or Path(tool_dir).resolve() in cwd.parents
+            for tool_dir in [Macros.java_raninline_dir, Macros.jacoco_extension_dir]
+        )
+    prefetched = su.io.load(Macros.maven_prefetched_marker, su.io.Fmt.json)
+    return project_name in prefetched and not prefetched[project_name]["failed_goals"]
+
+
+def get_mvnd() -> str:
+    """The mvnd executable, bundled in jars/mvnd or on the PATH, None if not available"""
+    if Macros.mvnd_script.exists():
+        return str(Macros.mvnd_script)
+    return shutil.which("mvnd")
+
+
+def get_maven_backend(args: str = "", backend: str = None) -> str:
+    """The executable running a build, mvnd if that backend is enabled and can run the build, mvn otherwise"""
+    if backend is None:
+        backend = Macros.MAVEN_BACKEND
+    if backend != Macros.MAVEN_BACKEND_MVND:
+        return "mvn"
+    mvnd = get_mvnd()
+    if mvnd is None:
+        return "mvn"
+    # the daemon does not load the core extensions of the mvn installation (e.g., the jacoco extension in $MAVEN_HOME/lib/ext)
+    if "-Dmaven.ext.class.path" in args:
+        return "mvn"
+    maven_home = os.environ.get("MAVEN_HOME")
+    if maven_home is not None:
+        ext_jar = Path(maven_home) / "lib" / "ext" / Macros.jacoco_extension_jar.name
+        if ext_jar.exists():
+            return "mvn"
+    return mvnd
+
+
+def mvn_cmd(
+    args: str = "", offline: bool = None, local_repo: Path = None, backend: str = None
+) -> str:
+    """Build a mvn command line, offline with the prefetched local repository if it exists
+
+    Args:
+        args: goals and options
+        offline: whether to run offline, defaults to is_maven_offline() for the project of the current directory
+        local_repo: local repository, defaults to Macros.maven_repo_dir when offline and to the Maven default otherwise
+        backend: mvn or mvnd, defaults to Macros.MAVEN_BACKEND; mvnd falls back to mvn if it is not available
+    """
+    if offline is None:
+        offline = is_maven_offline()
+    executable = get_maven_backend(args, backend)
+    options = []
+    if executable != "mvn":
+        # build modules one by one as mvn does
+        options.append("-T1")
+    if offline:
+        options.append("-o")
+        if local_repo is None:
+            local_repo = Macros.maven_repo_dir
+    if local_repo is not None:
+        options.append(f"-Dmaven.repo.local={local_repo}")
+    if args:
+        options.append(args)
+    return " ".join([executable] + options)
 
 
 @dataclasses.dataclass
@@ -21,6 +160,8 @@ class MavenModule:
     rel_path: str = "."
     project: "MavenProject" = None
     pom_modified: Set[str] = dataclasses.field(default_factory=set)
+    # dependency classpath resolved together with the whole reactor, None if not resolved
+    resolved_classpath: str = None
 
     def serialize(self):
         return {
@@ -49,21 +190,42 @@ class MavenModule:
 
     @functools.cached_property
     def dependency_classpath(self) -> str:
+        if self.resolved_classpath is not None:
+            return self.resolved_classpath
+        # cached by project version, module and pom hacks
+        project_name = get_maven_project_name(self.project.dir)
+        sha = None
+        if project_name is not None:
+            rr = su.bash.run(f"git -C {self.project.dir} rev-parse HEAD")
+            if rr.returncode == 0:
+                sha = rr.stdout.strip()[:7]
+        cache_key = f"{self.rel_path}:{','.join(sorted(self.pom_modified))}"
+        classpath_cache = ClasspathCache()
+        if sha is not None:
+            classpath = classpath_cache.get_dependency_classpath(
+                project_name, sha, cache_key
+            )
+            if classpath is not None:
+                return classpath
         with su.io.cd(self.project.dir / self.rel_path):
             tmp_file = su.io.mktmp(prefix="cp")
             su.bash.run(
-                f"mvn dependency:build-classpath -Dmdep.outputFile={tmp_file}", 0
+                mvn_cmd(f"dependency:build-classpath -Dmdep.outputFile={tmp_file}"), 0
             )
             classpath = su.io.load(tmp_file, fmt=su.io.Fmt.txt).strip()
             su.io.rm(tmp_file)
-            return classpath
+        if sha is not None:
+            classpath_cache.put_dependency_classpath(
+                project_name, sha, cache_key, classpath
+            )
+        return classpath
 
     @functools.cached_property
     def exec_classpath(self) -> str:
         with su.io.cd(self.project.dir / self.rel_path):
             tmp_file = su.io.mktmp(prefix="ecp")
             su.bash.run(
-                f"mvn -q exec:exec -Dexec.executable=echo -Dexec.args='%classpath' > {tmp_file}",
+                mvn_cmd(f"-q exec:exec -Dexec.executable=echo -Dexec.args='%classpath' > {tmp_file}"),
                 0,
             )
             classpath = su.io.load(tmp_file, fmt=su.io.Fmt.txt).strip()
@@ -161,11 +323,11 @@ class MavenModule:
     def compile(self, timeout=600, retry_with_package=True, clean=False):
         with su.io.cd(self.dir / self.rel_path):
             if clean:
-                su.bash.run("mvn clean", 0)
-            rr = su.bash.run(f"mvn test-compile {SKIPS}", timeout=timeout)
+                su.bash.run(mvn_cmd("clean"), 0)
+            rr = su.bash.run(mvn_cmd(f"test-compile {SKIPS}"), timeout=timeout)
             if rr.returncode != 0:
                 if retry_with_package:
-                    su.bash.run(f"mvn package -DskipTests {SKIPS}", 0, timeout=timeout)
+                    su.bash.run(mvn_cmd(f"package -DskipTests {SKIPS}"), 0, timeout=timeout)
                 else:
                     raise RuntimeError(f"Failed to compile")
 
@@ -187,11 +349,18 @@ class MavenProject:
         if not (project.dir / "pom.xml").exists():
             return None
         project.require_cloned()
+        if ensure_reactor_info_extension():
+            try:
+                return cls.from_reactor_info(project.dir)
+            except Exception as e:
+                logger.warning(f"Failed to load reactor info of {project.dir}: {e}")
         maven_proj = cls(dir=project.dir)
         # detect modules from the project
         with su.io.cd(maven_proj.dir):
             rr = su.bash.run(
-                """mvn -Dexec.executable='bash' -Dexec.args='-c '"'"'echo ${project.groupId}:${project.artifactId}:${project.version} ${project.packaging} ${PWD}'"'"'' exec:exec -q""",
+                mvn_cmd(
+                    """-Dexec.executable='bash' -Dexec.args='-c '"'"'echo ${project.groupId}:${project.artifactId}:${project.version} ${project.packaging} ${PWD}'"'"'' exec:exec -q"""
+                ),
                 0,
             )
         for line in rr.stdout.splitlines():
@@ -212,6 +381,50 @@ class MavenProject:
         maven_proj.multi_module = len(maven_proj.modules) > 1
         return maven_proj
 
+    @classmethod
+    def from_reactor_info(cls, project_dir: Path) -> "MavenProject":
+        """Detect the modules and resolve their dependency classpaths with a single Maven invocation, through the reactor info participant of the jacoco extension
+
+        The validate phase does not build the modules, so the dependencies of a module on other modules of the reactor are not resolved unless they are installed; the classpath of such a module is null and MavenModule.dependency_classpath falls back to dependency:build-classpath.
+        """
+        reactor_json = su.io.mktmp(prefix="reactor", suffix=".json")
+        try:
+            with su.io.cd(project_dir):
+                su.bash.run(
+                    mvn_cmd(f"-q -Dmaven.ext.class.path={Macros.jacoco_extension_jar} -D{REACTOR_JSON_PROPERTY}={reactor_json} validate"),
+                    0,
+                )
+            reactor = su.io.load(reactor_json, su.io.Fmt.json)
+            return cls.from_reactor_json(project_dir, reactor)
+        finally:
+            su.io.rm(reactor_json)
+
+    @classmethod
+    def from_reactor_json(cls, project_dir: Path, reactor: dict) -> "MavenProject":
+        maven_proj = cls(dir=project_dir)
+        for module in reactor["modules"]:
+            classpath = module.get("classpath")
+            maven_proj.modules.append(
+                MavenModule(
+                    group_id=module["group_id"],
+                    artifact_id=module["artifact_id"],
+                    version=module["version"],
+                    packaging=module["packaging"],
+                    rel_path=str(
+                        Path(module["basedir"]).resolve().relative_to(
+                            Path(project_dir).resolve()
+                        )
+                    ),
+                    project=maven_proj,
+                    resolved_classpath=(
+                        ":".join(classpath) if classpath is not None else None
+                    ),
+                )
+            )
+        maven_proj.modules.sort(key=lambda m: m.coordinate)
+        maven_proj.multi_module = len(maven_proj.modules) > 1
+        return maven_proj
+
     def backup_pom(self):
         for module in self.modules:
             module.backup_pom()
@@ -232,19 +445,19 @@ class MavenProject:
     def compile(self, timeout=600, retry_with_package=True, clean=False):
         with su.io.cd(self.dir):
             if clean:
-                su.bash.run("mvn clean", 0)
-            rr = su.bash.run(f"mvn test-compile {SKIPS}", timeout=timeout)
+                su.bash.run(mvn_cmd("clean"), 0)
+            rr = su.bash.run(mvn_cmd(f"test-compile {SKIPS}"), timeout=timeout)
             if rr.returncode != 0:
                 if retry_with_package:
-                    su.bash.run(f"mvn package -DskipTests {SKIPS}", 0, timeout=timeout)
+                    su.bash.run(mvn_cmd(f"package -DskipTests {SKIPS}"), 0, timeout=timeout)
                 else:
                     raise RuntimeError(f"Failed to compile")
 
     def install(self, timeout=600, clean=False):
         with su.io.cd(self.dir):
             if clean:
-                su.bash.run("mvn clean", 0)
-            rr = su.bash.run(f"mvn install -DskipTests {SKIPS}", 0, timeout=timeout)
+                su.bash.run(mvn_cmd("clean"), 0)
+            rr = su.bash.run(mvn_cmd(f"install -DskipTests {SKIPS}"), 0, timeout=timeout)
             if rr.returncode != 0:
                 raise RuntimeError(f"Failed to install")
 
@@ -0,0 +1,195 @@
+import hashlib
+import os
+import shutil
+import stat
+from pathlib import Path
+
+import seutil as se
+from exli.macros import Macros
+from exli.util import Util
+from jsonargparse import CLI
+
+
+class ObjectStore:
+    """
+    Content-addressed store for the serialized objects in .inlinegen directories.
+
+    Every file is stored once under objects/<first two hex digits>/<sha256>, no matter how many projects produced it. Each project gets a manifest mapping the relative paths in its .inlinegen directory to digests, and a view directory that rebuilds the .inlinegen layout from hard links to the objects; the inline test runtime reads the view in place through a symlink.
+
+    The objects are shared by the views of all projects, so the objects and the views are read-only: a view is rebuilt, never modified.
+    """
+
+    def __init__(self, store_dir: str = None):
+        """
+        Args:
+            store_dir (str, optional): The root directory of the store. Defaults to Macros.object_store_dir.
+        """
+        if store_dir is None:
+            store_dir = Macros.object_store_dir
+        self.store_dir = Path(store_dir)
+        self.objects_dir = self.store_dir / "objects"
+        self.manifests_dir = self.store_dir / "manifests"
+        self.views_dir = self.store_dir / "views"
+
+    def get_manifest_path(self, project_name: str, sha: str) -> Path:
+        return self.manifests_dir / f"{project_name}-{sha}.json"
+
+    def get_view_dir(self, project_name: str, sha: str) -> Path:
+        return self.views_dir / f"{project_name}-{sha}"
+
+    def get_object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def remove_view(self, view_dir: Path):
+        # the directories of a view are read-only, the objects are only unlinked
+        for root, dirs, _ in os.walk(view_dir):
+            os.chmod(root, stat.S_IRWXU)
+            for d in dirs:
+                os.chmod(os.path.join(root, d), stat.S_IRWXU)
+        shutil.rmtree(view_dir)
+
+    def put(self, file_path: str) -> str:
+        """
+        Add a file to the store if its content is not there yet.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            str: The sha256 digest of the file content.
+        """
+        with open(file_path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        object_path = self.get_object_path(digest)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = object_path.with_name(f"{digest}.tmp{os.getpid()}")
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp_path, object_path)
+        return digest
+
+    def ingest(self, project_name: str, sha: str, inlinegen_dir: str) -> dict:
+        """
+        Add all files in an .inlinegen directory to the store and write the manifest of the project.
+
+        Args:
+            project_name (str): The name of the project.
+            sha (str): The commit hash.
+            inlinegen_dir (str): The .inlinegen directory produced by the instrumented tests.
+
+        Returns:
+            dict: The manifest, mapping relative paths to digests.
+        """
+        manifest = {}
+        for root, _, files in os.walk(inlinegen_dir):
+            for file_name in files:
+                file_path = os.path.join(root, file_name)
+                rel_path = os.path.relpath(file_path, inlinegen_dir)
+                manifest[rel_path] = self.put(file_path)
+        se.io.mkdir(self.manifests_dir)
+        se.io.dump(self.get_manifest_path(project_name, sha), manifest, se.io.Fmt.json)
+        # the old view does not match the new manifest anymore
+        view_dir = self.get_view_dir(project_name, sha)
+        if view_dir.exists():
+            self.remove_view(view_dir)
+        return manifest
+
+    def materialize(self, project_name: str, sha: str) -> Path:
+        """
+        Build the .inlinegen view of a project from its manifest, if not built yet.
+
+        Args:
+            project_name (str): The name of the project.
+            sha (str): The commit hash.
+
+        Returns:
+            Path: The view directory.
+        """
+        view_dir = self.get_view_dir(project_name, sha)
+        if view_dir.exists():
+            return view_dir
+        manifest_path = self.get_manifest_path(project_name, sha)
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"{manifest_path} does not exist")
+        manifest = se.io.load(manifest_path, se.io.Fmt.json)
+        # build in a temp dir and rename, so a half-built view is never used
+        tmp_view_dir = view_dir.with_name(f"{view_dir.name}.tmp{os.getpid()}")
+        if tmp_view_dir.exists():
+            self.remove_view(tmp_view_dir)
+        for rel_path, digest in manifest.items():
+            object_path = self.get_object_path(digest)
+            dest_path = tmp_view_dir / rel_path
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(object_path, dest_path)
+            except OSError:
+                # e.g., the store spans file systems
+                shutil.copyfile(object_path, dest_path)
+                os.chmod(dest_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        tmp_view_dir.mkdir(parents=True, exist_ok=True)
+        # no file can be added to or removed from the view
+        for root, dirs, _ in os.walk(tmp_view_dir, topdown=False):
+            for d in dirs:
+                os.chmod(os.path.join(root, d), stat.S_IRUSR | stat.S_IXUSR)
+        os.chmod(tmp_view_dir, stat.S_IRUSR | stat.S_IXUSR)
+        os.replace(tmp_view_dir, view_dir)
+        return view_dir
+
+    def link(self, project_name: str, sha: str, dest: str):
+        """
+        Point dest to the .inlinegen view of a project with a symlink.
+
+        Args:
+            project_name (str): The name of the project.
+            sha (str): The commit hash.
+            dest (str): The path of the symlink, e.g., r0-tests/<project>-<sha>/.inlinegen.
+        """
+        view_dir = self.materialize(project_name, sha)
+        se.bash.run(f"rm -rf {dest}", 0)
+        se.bash.run(f"ln -sfn {view_dir} {dest}", 0)
+
+    # python -m exli.object_store save --project_name "Asana_java-asana" --sha "52fef9b" --inlinegen_dir "_downloads/Asana_java-asana/.inlinegen"
+    def save(self, project_name: str, sha: str, inlinegen_dir: str = None):
+        """
+        Ingest the .inlinegen directory of a project and replace r0-tests/<project>-<sha>/.inlinegen with a symlink to its view.
+
+        Args:
+            project_name (str): The name of the project.
+            sha (str): The commit hash.
+            inlinegen_dir (str, optional): The .inlinegen directory to ingest. Defaults to r0-tests/<project>-<sha>/.inlinegen.
+        """
+        cached_objects_dir = (
+            Macros.r0_tests_dir / f"{project_name}-{sha}" / Macros.INLINE_GEN_DIR_NAME
+        )
+        if inlinegen_dir is None:
+            inlinegen_dir = cached_objects_dir
+        self.ingest(project_name, sha, inlinegen_dir)
+        self.link(project_name, sha, cached_objects_dir)
+
+    # python -m exli.object_store batch_save
+    def batch_save(self, test_project_name: str = None):
+        """
+        Move the existing r0-tests/<project>-<sha>/.inlinegen directories into the store.
+
+        Args:
+            test_project_name (str, optional): The name of the project to be processed. If None, all projects are processed. Defaults to None.
+        """
+        for project_name, sha in Util.get_project_names_list_with_sha():
+            if test_project_name is not None and project_name != test_project_name:
+                continue
+            cached_objects_dir = (
+                Macros.r0_tests_dir
+                / f"{project_name}-{sha}"
+                / Macros.INLINE_GEN_DIR_NAME
+            )
+            if not cached_objects_dir.exists() or cached_objects_dir.is_symlink():
+                continue
+            print(f"saving {cached_objects_dir}...")
+            self.save(project_name, sha)
+
+
+if __name__ == "__main__":
+    CLI(ObjectStore, as_positional=False)
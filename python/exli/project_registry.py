@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+from typing import List, Set, Tuple
+
+import seutil as se
+from exli.macros import Macros
+
+
+class ProjectRegistry:
+    """
+    The projects of the study (Macros.projects_file), loaded once per process and indexed by name, instead of loading the file for every lookup.
+
+    The registry is reloaded when the modification time of the file changes.
+    """
+
+    _instance: "ProjectRegistry" = None
+
+    def __init__(self, projects_file: str = None):
+        """
+        Args:
+            projects_file (str, optional): The json list of projects (full_name, sha, jacoco, randoop). Defaults to Macros.projects_file.
+        """
+        if projects_file is None:
+            projects_file = Macros.projects_file
+        self.projects_file = Path(projects_file)
+        self.mtime = None
+        self.name_to_sha = {}
+        # in the order of the file
+        self.selected_projects: List[Tuple[str, str]] = []
+        self.excluded_projects: Set[str] = Macros.excluded_projects
+
+    @classmethod
+    def get(cls) -> "ProjectRegistry":
+        """
+        The registry of the process, reloaded if the file was modified.
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        cls._instance.refresh()
+        return cls._instance
+
+    def refresh(self):
+        mtime = os.stat(self.projects_file).st_mtime_ns
+        if mtime == self.mtime:
+            return
+        projects = se.io.load(self.projects_file, se.io.Fmt.json)
+        self.name_to_sha = {}
+        self.selected_projects = []
+        for project in projects:
+            sha = project["sha"][:7]
+            # the first entry of a project wins
+            self.name_to_sha.setdefault(project["full_name"], sha)
+            if (
+                project["jacoco"]
+                and project["randoop"]
+                and project["full_name"] not in self.excluded_projects
+            ):
+                self.selected_projects.append((project["full_name"], sha))
+        self.mtime = mtime
+
+    def get_sha(self, project_name: str) -> str:
+        return self.name_to_sha.get(project_name)
+
+    def get_project_names_list(self) -> List[str]:
+        """
+        The projects with jacoco and randoop results, without the excluded projects.
+        """
+        return [project_name for project_name, _ in self.selected_projects]
+
+    def get_project_names_list_with_sha(self) -> List[Tuple[str, str]]:
+        return list(self.selected_projects)
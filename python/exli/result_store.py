@@ -0,0 +1,104 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import seutil as se
+from exli.macros import Macros
+
+
+class MutantResultStore:
+    """
+    Store of the inline test results (junit records) of each mutant run, one SQLite database per project version and mutator instead of one json file per run in log/eval.
+
+    The database is in WAL mode and every result is committed as soon as it is put, so a crash loses at most the running mutant, and readers are not blocked by the writer.
+    """
+
+    def __init__(
+        self, project_name: str, sha: str, mutator: str, store_dir: str = None
+    ):
+        """
+        Args:
+            project_name (str): The name of the project.
+            sha (str): The commit sha of the project.
+            mutator (str): The type of mutator.
+            store_dir (str, optional): The directory of the databases. Defaults to Macros.mutant_results_store_dir.
+        """
+        if store_dir is None:
+            store_dir = Macros.mutant_results_store_dir
+        self.project_name = project_name
+        self.sha = sha
+        self.mutator = mutator
+        self.db_path = Path(store_dir) / f"{project_name}-{sha}-{mutator}.db"
+        se.io.mkdir(self.db_path.parent)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # durable at the end of each transaction with WAL, without a sync per write
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "test_type TEXT NOT NULL, "
+            "mutant_id INTEGER NOT NULL, "
+            "test_name TEXT, "
+            "records TEXT, "
+            "PRIMARY KEY (test_type, mutant_id))"
+        )
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def put(self, test_type: str, mutant_id: int, test_name: str, records):
+        """
+        Record the result of a run, replacing the previous one of the mutant.
+
+        Args:
+            test_type (str): r0 or r1.
+            mutant_id (int): The id of the mutant.
+            test_name (str): The inline test file run, e.g., Foo_12Test.java.
+            records: The junit records of the run, as returned by Util.run_inline_tests.
+        """
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)",
+                (test_type, mutant_id, test_name, json.dumps(records)),
+            )
+
+    def delete(self, test_type: str, mutant_id: int):
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM runs WHERE test_type = ? AND mutant_id = ?",
+                (test_type, mutant_id),
+            )
+
+    def get(self, test_type: str, mutant_id: int):
+        """
+        Get the junit records of the run of the mutant.
+
+        Returns:
+            The records, or None if the mutant has no run.
+        """
+        row = self.conn.execute(
+            "SELECT records FROM runs WHERE test_type = ? AND mutant_id = ?",
+            (test_type, mutant_id),
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def get_all(self, test_type: str) -> dict:
+        """
+        Get the junit records of all runs of the test type, by mutant id.
+        """
+        return {
+            mutant_id: json.loads(records)
+            for mutant_id, records in self.conn.execute(
+                "SELECT mutant_id, records FROM runs WHERE test_type = ?",
+                (test_type,),
+            )
+        }
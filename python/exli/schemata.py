@@ -0,0 +1,232 @@
+import collections
+import os
+import re
+from typing import Dict, List, Set, Tuple
+
+import seutil as se
+from exli.macros import Macros
+from exli.maven import mvn_cmd
+from exli.util import Util
+
+
+class MutantSchemata:
+    """
+    Mutant schemata: all mutants of a project embedded in one build, the mutant to run is chosen when the JVM starts.
+
+    Each mutated line is rewritten, on the same line to keep the line numbers, into
+        if (ExliMutants_Foo.ID == 3) { <mutant 3> } else if (ExliMutants_Foo.ID == 7) { <mutant 7> } else { <original> }
+    where ExliMutants_Foo is a class appended to the end of the file, reading the system property exli.mutant (Macros.MUTANT_PROPERTY) once. Without the property the original code runs.
+
+    Only simple statements can be wrapped this way (no declarations, blocks, comments or statements spanning several lines). The lines that cannot be wrapped, or that do not compile once wrapped, are left as is and their mutants are evaluated one at a time.
+    """
+
+    # statements starting with these words are not local variable declarations
+    STATEMENT_KEYWORDS = {
+        "return",
+        "throw",
+        "yield",
+        "assert",
+        "break",
+        "continue",
+        "new",
+    }
+    # lines starting with these words cannot be wrapped into an if statement
+    UNWRAPPABLE_PREFIXES = (
+        "case ",
+        "default:",
+        "default ",
+        "else",
+        "do ",
+        "super(",
+        "this(",
+        "@",
+    )
+    DECLARATION = re.compile(
+        r"^(?:final\s+)*[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*(?:\s*<.*>)?(?:\s*\[\s*\])*\s+[A-Za-z_$][\w$]*\s*(?:=|;|\[|,)"
+    )
+    COMPILE_ERROR = re.compile(r"\[ERROR\] (\S+\.java):\[(\d+),\d+\]")
+
+    def __init__(self, project_name: str, mutants: List[dict]):
+        """
+        Args:
+            project_name (str): The name of the project, the working copy in Macros.downloads_dir must be at the original version.
+            mutants (List[dict]): The mutants, with filepath, linenumber, orginal_code and mutated_code.
+        """
+        self.project_name = project_name
+        self.project_dir = Macros.downloads_dir / project_name
+        # file path -> line number -> mutants
+        self.file_to_line_to_mutants: Dict[str, Dict[int, List[dict]]] = (
+            collections.defaultdict(lambda: collections.defaultdict(list))
+        )
+        for mutant in mutants:
+            if not Util.is_evaluated_mutant(mutant):
+                continue
+            self.file_to_line_to_mutants[self.get_file_path(mutant)][
+                int(mutant["linenumber"])
+            ].append(mutant)
+        self.file_to_original_lines: Dict[str, List[str]] = {}
+        # file path -> the line numbers currently rewritten into schemata
+        self.file_to_schematized_lines: Dict[str, Set[int]] = {}
+
+    @classmethod
+    def get_file_path(cls, mutant: dict) -> str:
+        file_path = mutant["filepath"]
+        if not file_path.startswith(f"{Macros.home_dir}"):
+            file_path = re.sub(r"/home/[^/]+/", f"{Macros.home_dir}/", file_path)
+        return file_path
+
+    @classmethod
+    def get_holder_class_name(cls, file_path: str) -> str:
+        return "ExliMutants_" + os.path.basename(file_path)[: -len(".java")]
+
+    @classmethod
+    def is_schematizable(cls, code: str) -> bool:
+        """
+        Check if the code is a single simple statement that can be wrapped into an if statement.
+        """
+        code = code.strip()
+        if not code.endswith(";"):
+            return False
+        if "{" in code or "}" in code or "//" in code or "/*" in code:
+            return False
+        if code.startswith(cls.UNWRAPPABLE_PREFIXES):
+            return False
+        # the remaining part of a statement spanning several lines
+        if code[0] in ".+-*/%&|^?:,)=<>" and not code.startswith(("++", "--")):
+            return False
+        first_word = re.split(r"[^\w$]", code, 1)[0]
+        if first_word in cls.STATEMENT_KEYWORDS:
+            return True
+        # a declaration would go out of scope in the if statement
+        return cls.DECLARATION.match(code) is None
+
+    @classmethod
+    def get_schema(cls, holder: str, original_code: str, mutants: List[dict]) -> str:
+        branches = [
+            f"if ({holder}.ID == {mutant['id']}) {{ {mutant['mutated_code'].strip()} }}"
+            for mutant in mutants
+        ]
+        return " else ".join(branches) + f" else {{ {original_code.strip()} }}"
+
+    def apply(self) -> int:
+        """
+        Rewrite the mutated lines into schemata.
+
+        Returns:
+            int: The number of mutants in schemata.
+        """
+        for file_path, line_to_mutants in self.file_to_line_to_mutants.items():
+            if not os.path.exists(file_path):
+                continue
+            lines = se.io.load(file_path, se.io.Fmt.txt).split("\n")
+            self.file_to_original_lines[file_path] = lines
+            schematized_lines = set()
+            for line_num, mutants in line_to_mutants.items():
+                if line_num > len(lines):
+                    continue
+                original_code = lines[line_num - 1]
+                if original_code.strip() != mutants[0]["orginal_code"].strip():
+                    continue
+                if not self.is_schematizable(original_code):
+                    continue
+                if not all(self.is_schematizable(m["mutated_code"]) for m in mutants):
+                    continue
+                schematized_lines.add(line_num)
+            self.file_to_schematized_lines[file_path] = schematized_lines
+            self.write(file_path)
+        return self.get_num_schematized_mutants()
+
+    def write(self, file_path: str):
+        lines = list(self.file_to_original_lines[file_path])
+        schematized_lines = self.file_to_schematized_lines[file_path]
+        if schematized_lines:
+            holder = self.get_holder_class_name(file_path)
+            for line_num in schematized_lines:
+                original_code = lines[line_num - 1]
+                indent = original_code[
+                    : len(original_code) - len(original_code.lstrip())
+                ]
+                lines[line_num - 1] = indent + self.get_schema(
+                    holder,
+                    original_code,
+                    self.file_to_line_to_mutants[file_path][line_num],
+                )
+            # appended after the last line, the line numbers of the original code do not change
+            lines.append(
+                f'final class {holder} {{ static final int ID = java.lang.Integer.getInteger("{Macros.MUTANT_PROPERTY}", -1); }}'
+            )
+        se.io.dump(file_path, "\n".join(lines), se.io.Fmt.txt)
+
+    def revert(self, file_path: str, line_nums: Set[int] = None):
+        """
+        Restore the original code of the lines, or of the whole file if line_nums is None.
+        """
+        if file_path not in self.file_to_schematized_lines:
+            return
+        if line_nums is None:
+            self.file_to_schematized_lines[file_path] = set()
+        else:
+            self.file_to_schematized_lines[file_path] -= set(line_nums)
+        self.write(file_path)
+
+    def revert_all(self):
+        for file_path in self.file_to_schematized_lines:
+            self.revert(file_path)
+
+    def compile(self, max_rounds: int = 3) -> bool:
+        """
+        Compile the project with the schemata, restoring the lines (or files) reported by the compiler until it compiles.
+
+        Args:
+            max_rounds (int, optional): The number of compilations before giving up and restoring all files. Defaults to 3.
+
+        Returns:
+            bool: Whether the project compiles with any schemata left.
+        """
+        for _ in range(max_rounds):
+            with se.io.cd(self.project_dir):
+                rr = se.bash.run(mvn_cmd(f"compile {Macros.SKIPS}"))
+            if rr.returncode == 0:
+                return self.get_num_schematized_mutants() > 0
+            errors = self.parse_compile_errors(rr.stdout)
+            if not errors or any(
+                not self.file_to_schematized_lines.get(f) for f, _ in errors
+            ):
+                # not caused by the schemata
+                break
+            file_to_error_lines = collections.defaultdict(set)
+            for file_path, line_num in errors:
+                file_to_error_lines[file_path].add(line_num)
+            for file_path, error_lines in file_to_error_lines.items():
+                if error_lines <= self.file_to_schematized_lines[file_path]:
+                    self.revert(file_path, error_lines)
+                else:
+                    # e.g., unreachable code after a schema, restore the file
+                    self.revert(file_path)
+            print(
+                f"schemata: {self.get_num_schematized_mutants()} mutants left after compilation errors"
+            )
+        self.revert_all()
+        return False
+
+    def parse_compile_errors(self, output: str) -> Set[Tuple[str, int]]:
+        errors = set()
+        for match in self.COMPILE_ERROR.finditer(output):
+            errors.add((os.path.realpath(match.group(1)), int(match.group(2))))
+        # the paths of the mutants may not be canonical
+        real_to_file = {
+            os.path.realpath(f): f for f in self.file_to_schematized_lines
+        }
+        return {(real_to_file.get(f, f), line_num) for f, line_num in errors}
+
+    def is_schematized(self, mutant: dict) -> bool:
+        return int(mutant["linenumber"]) in self.file_to_schematized_lines.get(
+            self.get_file_path(mutant), set()
+        )
+
+    def get_num_schematized_mutants(self) -> int:
+        return sum(
+            len(self.file_to_line_to_mutants[file_path][line_num])
+            for file_path, line_nums in self.file_to_schematized_lines.items()
+            for line_num in line_nums
+        )
@@ -0,0 +1,119 @@
+import collections
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import seutil as se
+from exli.macros import Macros
+
+
+class SourceIndex:
+    """
+    Index of the .java files under a directory by file name, built with one os.scandir walk, to find the file of a class (same matches as glob <dir>/**/<package path>/<class>.java) without walking the directory for every lookup.
+
+    The index of a project checkout is cached on disk keyed by the commit sha (the files of a commit do not move), the other indexes are only kept in memory. An index is rebuilt when a lookup misses or finds a file that no longer exists, e.g., after the inline tests are generated again.
+    """
+
+    _indexes: Dict[str, "SourceIndex"] = {}
+
+    def __init__(
+        self, root_dir: str, cache_path: str = None, include_hidden: bool = False
+    ):
+        """
+        Args:
+            root_dir (str): The directory to index.
+            cache_path (str, optional): The file caching the index, only for directories that do not change. Defaults to None.
+            include_hidden (bool, optional): Whether to also index the files under hidden directories, as find does. Defaults to False, as glob does.
+        """
+        self.root_dir = Path(root_dir)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.include_hidden = include_hidden
+        self.name_to_paths = None
+
+    @classmethod
+    def of(
+        cls, root_dir: str, cache_path: str = None, include_hidden: bool = False
+    ) -> "SourceIndex":
+        # one index per directory in the process
+        key = f"{root_dir}:{cache_path}:{include_hidden}"
+        if key not in cls._indexes:
+            cls._indexes[key] = cls(root_dir, cache_path, include_hidden)
+        return cls._indexes[key]
+
+    @classmethod
+    def of_project(cls, project_name: str, sha: str) -> "SourceIndex":
+        """
+        The index of the checkout of the project in Macros.downloads_dir, which must be clean and at the commit sha when the index is built.
+        """
+        return cls.of(
+            Macros.downloads_dir / project_name,
+            Macros.source_index_dir / f"{project_name}-{sha}.json",
+        )
+
+    def walk(self) -> List[str]:
+        rel_paths = []
+        dirs = [str(self.root_dir)]
+        while dirs:
+            with os.scandir(dirs.pop()) as entries:
+                for entry in entries:
+                    # skipped by glob as well, e.g., .git and .inlinegen
+                    if not self.include_hidden and entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    elif entry.name.endswith(".java"):
+                        rel_paths.append(os.path.relpath(entry.path, self.root_dir))
+        return sorted(rel_paths)
+
+    def load(self, rebuild: bool = False) -> bool:
+        """
+        Load the index from the cache, or walk the directory.
+
+        Returns:
+            bool: Whether the directory was walked.
+        """
+        walked = False
+        if not rebuild and self.cache_path is not None and self.cache_path.exists():
+            rel_paths = se.io.load(self.cache_path, se.io.Fmt.json)
+        else:
+            rel_paths = self.walk() if self.root_dir.is_dir() else []
+            walked = True
+            if self.cache_path is not None:
+                se.io.mkdir(self.cache_path.parent)
+                se.io.dump(self.cache_path, rel_paths, se.io.Fmt.json)
+        self.name_to_paths = collections.defaultdict(list)
+        for rel_path in rel_paths:
+            self.name_to_paths[os.path.basename(rel_path)].append(rel_path)
+        return walked
+
+    def find(self, file_name: str, suffix: str = None) -> List[str]:
+        """
+        Find the files with the name, and the path ending with the suffix if given.
+
+        Returns:
+            List[str]: The paths of the files relative to the root directory.
+        """
+        walked = False
+        if self.name_to_paths is None:
+            walked = self.load()
+        while True:
+            rel_paths = [
+                p
+                for p in self.name_to_paths.get(file_name, [])
+                if suffix is None or p == suffix or p.endswith("/" + suffix)
+            ]
+            if walked or (
+                rel_paths and all((self.root_dir / p).exists() for p in rel_paths)
+            ):
+                return rel_paths
+            # the directory may have changed since the index was built
+            walked = self.load(rebuild=True)
+
+    def get_class_paths(self, class_name: str) -> List[str]:
+        """
+        Get the paths of the source files of the fully qualified class name.
+        """
+        suffix = class_name.replace(".", "/") + ".java"
+        return [
+            str(self.root_dir / p) for p in self.find(os.path.basename(suffix), suffix)
+        ]
@@ -380,12 +380,8 @@ class Table:
             else:
                 logger.warning(f"File {mutants_path} does not exist")
                 continue
-            # only keep compilable mutants (currently, already filtered in previous steps)
-            mutants = [
-                m
-                for m in mutants
-                if ("compilation_failure" not in m) or (not m["compilation_failure"])
-            ]
+            # only keep compilable mutants that are not equivalent by TCE
+            mutants = [m for m in mutants if Util.is_evaluated_mutant(m)]
 
             if len(mutants) == 0:
                 file.append(latex.Macro(f"{proj}-num-mutants", r"\UseMacro{TH-na}"))
@@ -446,6 +442,11 @@ class Table:
                                 r0[f"{Macros.r0}-time"], r1[f"{Macros.r1}-time"]
                             ),
                         }
+                        if Macros.KILL_CATEGORY_TIMEOUT in [
+                            r0.get(f"{Macros.r0}-kill-category"),
+                            r1.get(f"{Macros.r1}-kill-category"),
+                        ]:
+                            item[f"{tool}-kill-category"] = Macros.KILL_CATEGORY_TIMEOUT
                         res.append(item)
                     # save res
                     se.io.dump(mutants_result_path, res, se.io.Fmt.jsonPretty)
@@ -460,6 +461,8 @@ class Table:
                         for m in mutants_result
                         if f"{tool}-killed" in m
                         and m[f"{tool}-killed"]
+                        or m.get(f"{tool}-kill-category")
+                        == Macros.KILL_CATEGORY_TIMEOUT
                         or m[f"{tool}-time"] >= timeout
                     ]
                 )
@@ -0,0 +1,112 @@
+import collections
+import glob
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+import seutil as se
+from exli.macros import Macros
+from exli.util import Util
+
+
+class MutantDeduplicator:
+    """
+    Trivial compiler equivalence (TCE) of mutants: the mutated file is compiled alone with javac against the compiled project, and the class files it produces (including inner classes, Foo$Bar.class) are hashed.
+
+    A mutant whose class files are identical to the ones of the original file (e.g., whitespace or redundant parentheses) is equivalent, and a mutant whose class files are identical to the ones of a previous mutant is a duplicate of it. The decision is recorded in the mutant as tce_status (Macros.TCE_*) and duplicate_of, and both kinds of mutants are not evaluated.
+    """
+
+    def __init__(self, project_name: str, sha: str):
+        """
+        Args:
+            project_name (str): The name of the project, the working copy in Macros.downloads_dir must be at the original version and compiled.
+            sha (str): The commit sha of the project.
+        """
+        self.project_name = project_name
+        self.sha = sha
+        self.deps_file = Util.get_deps_file_path(project_name, sha)
+
+    def get_classes_dir(self, file_path: str) -> Path:
+        # the output directory of the module of the source file
+        for source_dir in ["src/main/java/", "src/main/lombok/"]:
+            if source_dir in file_path:
+                return Path(file_path.split(source_dir)[0]) / "target" / "classes"
+        return Macros.downloads_dir / self.project_name / "target" / "classes"
+
+    def compile_and_hash(self, file_path: str, content: str) -> Optional[str]:
+        """
+        Compile the content of the source file and hash the produced class files.
+
+        Returns:
+            Optional[str]: The hash, or None if the file does not compile alone.
+        """
+        with tempfile.TemporaryDirectory(prefix="exli-tce-") as temp_dir:
+            # javac requires the file name of the public class
+            source_path = Path(temp_dir) / "src" / os.path.basename(file_path)
+            output_dir = Path(temp_dir) / "classes"
+            se.io.mkdir(source_path.parent)
+            se.io.mkdir(output_dir)
+            se.io.dump(source_path, content, se.io.Fmt.txt)
+            rr = se.bash.run(
+                f"javac -nowarn -encoding UTF-8 -cp {self.get_classes_dir(file_path)}:$(< {self.deps_file}) -d {output_dir} {source_path}"
+            )
+            if rr.returncode != 0:
+                return None
+            class_files = sorted(
+                glob.glob(f"{output_dir}/**/*.class", recursive=True)
+            )
+            if not class_files:
+                return None
+            sha256 = hashlib.sha256()
+            for class_file in class_files:
+                sha256.update(os.path.relpath(class_file, output_dir).encode())
+                with open(class_file, "rb") as f:
+                    sha256.update(f.read())
+            return sha256.hexdigest()
+
+    def dedup(self, mutants: List[dict]) -> List[dict]:
+        """
+        Record the TCE decision in each mutant, the mutants with the lowest ids are kept among duplicates.
+
+        Returns:
+            List[dict]: The mutants.
+        """
+        file_to_mutants = collections.defaultdict(list)
+        for mutant in mutants:
+            if mutant.get("compilation_failure", False):
+                continue
+            file_path = mutant["filepath"]
+            if not file_path.startswith(f"{Macros.home_dir}"):
+                file_path = re.sub(r"/home/[^/]+/", f"{Macros.home_dir}/", file_path)
+            file_to_mutants[file_path].append(mutant)
+        for file_path, file_mutants in file_to_mutants.items():
+            lines = se.io.load(file_path, se.io.Fmt.txt).splitlines()
+            original_hash = self.compile_and_hash(file_path, "\n".join(lines))
+            hash_to_id = {}
+            for mutant in sorted(file_mutants, key=lambda m: m["id"]):
+                mutant.pop("duplicate_of", None)
+                if original_hash is None:
+                    # e.g., needs the other sources of the project, keep the mutant
+                    mutant["tce_status"] = Macros.TCE_UNKNOWN
+                    continue
+                mutated_lines = list(lines)
+                mutated_lines[mutant["linenumber"] - 1] = mutant["mutated_code"]
+                mutant_hash = self.compile_and_hash(
+                    file_path, "\n".join(mutated_lines)
+                )
+                if mutant_hash is None:
+                    mutant["tce_status"] = Macros.TCE_UNKNOWN
+                elif mutant_hash == original_hash:
+                    mutant["tce_status"] = Macros.TCE_EQUIVALENT
+                elif mutant_hash in hash_to_id:
+                    mutant["tce_status"] = Macros.TCE_DUPLICATE
+                    mutant["duplicate_of"] = hash_to_id[mutant_hash]
+                else:
+                    mutant["tce_status"] = Macros.TCE_UNIQUE
+                    hash_to_id[mutant_hash] = mutant["id"]
+        counter = collections.Counter(m.get("tce_status") for m in mutants)
+        print(f"TCE of {self.project_name}: {dict(counter)}")
+        return mutants
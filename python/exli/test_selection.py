@@ -0,0 +1,253 @@
+import glob
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import seutil as se
+from exli.filter import Filter
+from exli.macros import Macros
+from exli.maven import mvn_cmd
+from exli.util import Util
+from jsonargparse import CLI
+
+
+class TestSelector:
+    """
+    Coverage-based selection of the unit tests (dev, randoop, evosuite) to run against a mutant.
+
+    The per-test line coverage is collected once per project version: each test class is run on its own with the jacoco agent, so CoverageMapGenerator sees one exec file per test class and produces a covMap keyed by the test class name. A mutant on a line is then only evaluated with the test classes that cover the line; the other test classes execute the same code as on the original version and cannot kill it. The test classes without coverage (e.g., timed out) are selected for every mutant.
+    """
+
+    def __init__(
+        self,
+        project_name: str,
+        sha: str,
+        test_type: str,
+        seed: int = Macros.DEFAULT_SEED,
+    ):
+        if test_type not in [Macros.dev, Macros.randoop, Macros.evosuite]:
+            raise ValueError(f"Unknown test type: {test_type}")
+        self.project_name = project_name
+        self.sha = sha
+        self.test_type = test_type
+        self.seed = seed
+        per_test_root = Macros.results_dir / "coverage" / "per-test"
+        self.per_test_dir = per_test_root / f"{project_name}-{sha}-{test_type}"
+        self.cov_map_path = (
+            per_test_root / f"{project_name}-{sha}-{test_type}-covMap.json"
+        )
+        self._cov_map = None
+        self._no_coverage_tests = None
+        self._times = None
+
+    def get_generated_tests_dir(self) -> Path:
+        return (
+            Macros.unit_tests_dir
+            / f"{self.project_name}-{self.sha}"
+            / f"{self.test_type}-tests-{self.seed}"
+            / f"{self.test_type}-tests"
+        )
+
+    def get_test_log_path(self, test: str) -> Path:
+        return self.per_test_dir / f"{test}.log"
+
+    def list_test_classes(self) -> List[str]:
+        """
+        List the test classes of the project as run by surefire or JUnitCore, the working copy must have the tests in place, except for the EvoSuite tests which are listed from the generated tests.
+        """
+        project_dir = Macros.downloads_dir / self.project_name
+        tests = []
+        if self.test_type == Macros.evosuite:
+            tests_dir = f"{self.get_generated_tests_dir()}"
+            for f in glob.glob(f"{tests_dir}/**/*_ESTest.java", recursive=True):
+                tests.append(
+                    os.path.relpath(f, tests_dir)[: -len(".java")].replace("/", ".")
+                )
+        else:
+            for f in glob.glob(
+                f"{project_dir}/**/src/test/java/**/*.java", recursive=True
+            ):
+                name = os.path.basename(f)[: -len(".java")]
+                if self.test_type == Macros.randoop:
+                    # RegressionTest is the suite of RegressionTest0, RegressionTest1, ...
+                    if not re.fullmatch(r"RegressionTest\d+", name):
+                        continue
+                elif not (
+                    name.startswith("Test")
+                    or name.endswith("Test")
+                    or name.endswith("Tests")
+                    or name.endswith("TestCase")
+                ):
+                    # surefire default includes
+                    continue
+                tests.append(
+                    f.split("src/test/java/")[-1][: -len(".java")].replace("/", ".")
+                )
+        return sorted(set(tests))
+
+    def collect(self, timeout: int = 600) -> Dict[str, int]:
+        """
+        Run each test class on its own with the jacoco agent and build the per-test covMap.
+
+        Args:
+            timeout (int, optional): The time limit of running one test class. Defaults to 600.
+
+        Returns:
+            Dict[str, int]: The return code of each test class.
+        """
+        se.io.mkdir(self.per_test_dir, fresh=True)
+        project_dir = Macros.downloads_dir / self.project_name
+        Util.prepare_project(self.project_name, self.sha)
+        res = {}
+        times = {}
+        if self.test_type == Macros.evosuite:
+            deps_file = (
+                Macros.unit_tests_dir / f"{self.project_name}-{self.sha}" / "deps.txt"
+            )
+            for i, test in enumerate(self.list_test_classes()):
+                start_time = time.time()
+                # the tests are copied and compiled with the first test class
+                res[test] = Util.run_evosuite_command_line(
+                    self.project_name,
+                    self.get_generated_tests_dir(),
+                    deps_file,
+                    self.per_test_dir / "compile.log",
+                    timeout,
+                    tests=[test],
+                    per_test_exec_dir=self.per_test_dir,
+                    compile_project=i == 0,
+                )
+                times[test] = time.time() - start_time
+        else:
+            maven_project = Util.get_maven_project(self.project_name)
+            Util.configure_tests_for_jacoco_agent(
+                self.project_name, self.test_type, maven_project
+            )
+            if self.test_type == Macros.randoop:
+                Util.copy_randoop_tests_to_src_test_java(
+                    self.project_name, self.get_generated_tests_dir()
+                )
+            Util.copy_jacoco_extension()
+            with se.io.cd(project_dir):
+                try:
+                    se.bash.run(
+                        mvn_cmd(f"clean test-compile {Macros.SKIPS_NO_JACOCO}"),
+                        timeout=timeout,
+                    )
+                    for test in self.list_test_classes():
+                        for f in glob.glob("**/jacoco.exec", recursive=True):
+                            os.remove(f)
+                        log_path = self.get_test_log_path(test)
+                        start_time = time.time()
+                        rr = se.bash.run(
+                            Util.get_timeout_prefix(timeout)
+                            + mvn_cmd(
+                                f"surefire:test {Macros.SKIPS_NO_JACOCO} {Util.get_surefire_test_filter([test])} &> {log_path}",
+                                backend=Macros.MAVEN_BACKEND_MVN,
+                            )
+                        )
+                        times[test] = time.time() - start_time
+                        res[test] = rr.returncode
+                        if Util.is_timeout_returncode(
+                            rr.returncode, times[test], timeout
+                        ):
+                            continue
+                        self.move_exec_files(
+                            glob.glob("**/jacoco.exec", recursive=True),
+                            self.per_test_dir / f"{test}.exec",
+                        )
+                finally:
+                    Util.remove_jacoco_extension()
+        se.io.dump(self.per_test_dir / "returncodes.json", res, se.io.Fmt.jsonPretty)
+        se.io.dump(self.per_test_dir / "times.json", times, se.io.Fmt.jsonPretty)
+        # e.g., timed out, no line can be attributed to them
+        no_coverage_tests = [
+            test for test in res if not (self.per_test_dir / f"{test}.exec").exists()
+        ]
+        se.io.dump(
+            self.per_test_dir / "no-coverage.json",
+            sorted(no_coverage_tests),
+            se.io.Fmt.jsonPretty,
+        )
+        if glob.glob(f"{self.per_test_dir}/*.exec"):
+            Filter().generate_jacoco_report(
+                self.per_test_dir, project_dir / "target" / "classes", self.cov_map_path
+            )
+        else:
+            se.io.dump(self.cov_map_path, {}, se.io.Fmt.json)
+        self._cov_map = None
+        self._no_coverage_tests = None
+        self._times = None
+        return res
+
+    def move_exec_files(self, exec_files: List[str], dest: Path):
+        # a multi-module project has one jacoco.exec per module
+        if not exec_files:
+            return
+        if len(exec_files) == 1:
+            se.bash.run(f"mv {exec_files[0]} {dest}", 0)
+        else:
+            se.bash.run(
+                f"java -jar {Macros.jacococli_jar} merge {' '.join(exec_files)} --destfile {dest}",
+                0,
+            )
+
+    def get_cov_map(self) -> dict:
+        if self._cov_map is None:
+            self._cov_map = se.io.load(self.cov_map_path, se.io.Fmt.json)
+        return self._cov_map
+
+    def get_no_coverage_tests(self) -> List[str]:
+        if self._no_coverage_tests is None:
+            self._no_coverage_tests = se.io.load(
+                self.per_test_dir / "no-coverage.json", se.io.Fmt.json
+            )
+        return self._no_coverage_tests
+
+    def get_baseline_time(self, tests: List[str] = None) -> float:
+        """
+        Get the time (s) of running the test classes one by one on the original version.
+
+        Args:
+            tests (List[str], optional): The test classes, e.g., selected for a mutant. Defaults to None, which is all test classes.
+        """
+        if self._times is None:
+            self._times = se.io.load(self.per_test_dir / "times.json", se.io.Fmt.json)
+        if tests is None:
+            tests = self._times.keys()
+        return sum(self._times.get(test, 0) for test in tests)
+
+    def select(self, file_path: str, line_num: int) -> List[str]:
+        """
+        Select the test classes that cover the line of the source file, including the lines of its inner classes, and the test classes without coverage, which may cover any line.
+        """
+        fqn = Util.get_full_class_name(file_path)
+        line = str(line_num)
+        tests = list(self.get_no_coverage_tests())
+        for test, class_to_lines in self.get_cov_map().items():
+            for class_name, lines in class_to_lines.items():
+                if class_name != fqn and not class_name.startswith(fqn + "$"):
+                    continue
+                # status 2: fully covered, 3: partly covered
+                if line in lines and lines[line][0] > 1:
+                    tests.append(test)
+                    break
+        return sorted(set(tests))
+
+
+class Main:
+    # python -m exli.test_selection collect --project_name Asana_java-asana --sha 52fef9b --test_type dev
+    def collect(
+        self,
+        project_name: str,
+        sha: str,
+        test_type: str,
+        seed: int = Macros.DEFAULT_SEED,
+    ):
+        TestSelector(project_name, sha, test_type, seed).collect()
+
+
+if __name__ == "__main__":
+    CLI(Main, as_positional=False)
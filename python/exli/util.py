@@ -2,16 +2,23 @@ import collections
 import glob
 import os
 import re
+import signal
 import subprocess
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import xml.etree.ElementTree as ET
 from os.path import expanduser
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 import seutil as se
-import xmltodict
+from exli.classpath_cache import ClasspathCache
 from exli.macros import Macros
-from exli.maven import MavenProject
+from exli.maven import MavenProject, ensure_reactor_info_extension, mvn_cmd
+from exli.project_registry import ProjectRegistry
+from exli.source_index import SourceIndex
+from exli.workspace_pool import WorkspacePool
 from tqdm import tqdm
 from typing import Union
 
@@ -27,6 +34,9 @@ class Util:
         tests_dir: str = None,
         deps_file_path: str = None,
         timeout: int = 3600,
+        log_buffer_size: int = Macros.LOG_BUFFER_SIZE,
+        log_flush_interval: int = Macros.LOG_FLUSH_INTERVAL,
+        reduction: str = Macros.REDUCTION_FULL,
     ):
         """
         Run unit tests of a specific type.
@@ -39,12 +49,16 @@ class Util:
             tests_dir_dict(str): Directory for tests. Required for EvoSuite and Randoop.
             deps_file_path(str): Dependencies file path. Required for EvoSuite.
             timeout(int): Timeout for the test execution. Defaults to 3600.
+            log_buffer_size(int): Chars buffered per log file by the instrumented code. Defaults to Macros.LOG_BUFFER_SIZE.
+            log_flush_interval(int): Milliseconds between writes of the buffered logs. Defaults to Macros.LOG_FLUSH_INTERVAL.
+            reduction(str): Strategy of the r1 reduction (full or delta). Defaults to full.
         """
         Util.copy_jacoco_extension()
-        Util.configure_file(test_type)
+        Util.configure_file(test_type, log_buffer_size, log_flush_interval, reduction)
 
         try:
-            with se.TimeUtils.time_limit(timeout):
+            # the tests are killed by GNU timeout first, see get_timeout_prefix
+            with se.TimeUtils.time_limit(timeout + 2 * Macros.TIMEOUT_KILL_AFTER):
                 if test_type == Macros.dev:
                     Util.run_dev_written_unit_tests(
                         project_name, log_path, maven_project, timeout
@@ -67,18 +81,34 @@ class Util:
     # return: string of dependencies appending with ":"
     @classmethod
     def find_dependencies(cls, project_classpath_included: bool = True):
-        se.bash.run(
-            "mvn dependency:build-classpath -Dmdep.outputFile=raninline-classpath.txt",
-            0,
-        )
-        classpath_files = se.bash.run('find . -name "raninline-classpath.txt"').stdout
+        maven_project = None
+        if ensure_reactor_info_extension():
+            try:
+                maven_project = MavenProject.from_reactor_info(Path(os.getcwd()))
+            except Exception as e:
+                print(e)
         dependencies_set = set()
-        for classpath_file in classpath_files.split("\n"):
-            if classpath_file:
-                current_file_dependencies = (
-                    se.bash.run(f"cat {classpath_file}").stdout.strip().split(":")
-                )
-                dependencies_set.update(current_file_dependencies)
+        if maven_project is not None:
+            # resolved by the reactor info participant, the modules it could not resolve fall back to dependency:build-classpath
+            for module in maven_project.modules:
+                dependencies_set.update(module.dependency_classpath.split(":"))
+        else:
+            se.bash.run(
+                mvn_cmd(
+                    "dependency:build-classpath -Dmdep.outputFile=raninline-classpath.txt"
+                ),
+                0,
+            )
+            classpath_files = se.bash.run(
+                'find . -name "raninline-classpath.txt"'
+            ).stdout
+            for classpath_file in classpath_files.split("\n"):
+                if classpath_file:
+                    current_file_dependencies = (
+                        se.bash.run(f"cat {classpath_file}").stdout.strip().split(":")
+                    )
+                    dependencies_set.update(current_file_dependencies)
+        dependencies_set.discard("")
         dependencies = ":".join(dependencies_set)
 
         if not project_classpath_included:
@@ -105,39 +135,15 @@ class Util:
 
     @classmethod
     def get_sha(cls, project_name: str):
-        project_dict = se.io.load(
-            Macros.data_dir / "teco-projects-2022-01-01-unit-tests-jacoco-randoop.json"
-        )
-        for project in project_dict:
-            if project["full_name"] == project_name:
-                return project["sha"][:7]
-        return None
+        return ProjectRegistry.get().get_sha(project_name)
 
     @classmethod
     def get_project_names_list(cls):
-        project_dict = se.io.load(
-            Macros.data_dir / "teco-projects-2022-01-01-unit-tests-jacoco-randoop.json"
-        )
-        return [
-            project["full_name"]
-            for project in project_dict
-            if project["jacoco"]
-            and project["randoop"]
-            and (project["full_name"] not in Util.get_excluded_projects())
-        ]
+        return ProjectRegistry.get().get_project_names_list()
 
     @classmethod
     def get_project_names_list_with_sha(cls):
-        project_dict = se.io.load(
-            Macros.data_dir / "teco-projects-2022-01-01-unit-tests-jacoco-randoop.json"
-        )
-        return [
-            (project["full_name"], project["sha"][:7])
-            for project in project_dict
-            if project["jacoco"]
-            and project["randoop"]
-            and (project["full_name"] not in Util.get_excluded_projects())
-        ]
+        return ProjectRegistry.get().get_project_names_list_with_sha()
 
     @classmethod
     def copy_jacoco_extension(cls):
@@ -260,12 +266,25 @@ class Util:
         maven_project.hack_pom_delete_plugin("junit-jupiter-api", False)
 
     @classmethod
-    def prepare_project(cls, project_name: str, sha: str, checkout: bool = True):
+    def prepare_project(
+        cls,
+        project_name: str,
+        sha: str,
+        checkout: bool = True,
+        use_workspace_pool: bool = Macros.USE_WORKSPACE_POOL,
+    ):
         project = se.project.Project(
             url=f"https://github.com/{project_name.replace('_', '/')}",
             full_name=project_name,
         )
         project.clone(Macros.downloads_dir)
+        if checkout and use_workspace_pool:
+            # same files as checkout + clean, but keeps the build outputs of the pristine worktree
+            try:
+                WorkspacePool().reset(project_name, sha)
+                return project
+            except Exception:
+                print(traceback.format_exc())
         if checkout:
             with se.io.cd(Macros.downloads_dir / project_name):
                 se.bash.run(f"git checkout -f {sha}")
@@ -290,6 +309,33 @@ class Util:
         log_path: str,
     ):
         project = Util.prepare_project(project_name, sha)
+        classpath_cache = ClasspathCache()
+        dependencies = None
+        if dep_file_path is not None:
+            dependencies = classpath_cache.get_deps(project_name, sha)
+        classpath_list = None
+        if classpath_list_path is not None:
+            classpath_list = classpath_cache.get_classpath_list(project_name, sha)
+        if (dep_file_path is None or dependencies is not None) and (
+            classpath_list_path is None or classpath_list is not None
+        ):
+            # no module detection and classpath resolution, only build the classes if the working copy has none
+            project_dir = os.path.abspath(Macros.downloads_dir / project_name)
+            classes_dirs = [
+                path
+                for path in (dependencies or "").split(":")
+                if path.startswith(project_dir) and path.endswith("target/classes")
+            ]
+            if not all(os.path.exists(path) for path in classes_dirs):
+                try:
+                    MavenProject(dir=project.dir).install()
+                except Exception as e:
+                    print(e)
+            if dep_file_path is not None:
+                se.io.dump(dep_file_path, dependencies, se.io.Fmt.txt)
+            if classpath_list_path is not None:
+                se.io.dump(classpath_list_path, classpath_list, se.io.Fmt.txtList)
+            return
         maven_project = MavenProject.from_project(project)
         try:
             with se.io.cd(Macros.downloads_dir / project_name):
@@ -300,20 +346,27 @@ class Util:
                 maven_project.install()
                 # Get dependencies.
                 if dep_file_path is not None:
-                    dependencies = maven_project.exec_classpathes(
-                        Macros.downloads_dir / project_name,
-                        log_path,
-                    )
+                    if dependencies is None:
+                        dependencies = maven_project.exec_classpathes(
+                            Macros.downloads_dir / project_name,
+                            log_path,
+                        )
+                        if dependencies is not None:
+                            classpath_cache.put(project_name, sha, deps=dependencies)
                     se.io.dump(dep_file_path, dependencies, se.io.Fmt.txt)
                 # Get classpath.
                 if classpath_list_path is not None:
-                    classpath_list = Util.find_classes()
-                    # remove package-info class
-                    classpath_list = [
-                        classpath
-                        for classpath in classpath_list
-                        if not classpath.endswith("package-info")
-                    ]
+                    if classpath_list is None:
+                        classpath_list = Util.find_classes()
+                        # remove package-info class
+                        classpath_list = [
+                            classpath
+                            for classpath in classpath_list
+                            if not classpath.endswith("package-info")
+                        ]
+                        classpath_cache.put(
+                            project_name, sha, classpath_list=classpath_list
+                        )
                     se.io.dump(classpath_list_path, classpath_list, se.io.Fmt.txtList)
         except Exception as e:
             print(e)
@@ -397,15 +450,23 @@ class Util:
         deps_file: str,
         test_name: str = None,
         log_path: str = None,
+        compile_project: bool = True,
+        fail_fast: bool = False,
+        timeout: int = None,
+        run_tests: bool = True,
     ):
         if not os.path.exists(inlinetest_dir):
             print(f"{inlinetest_dir} does not exist")
             return None, None
         with se.io.cd(Macros.downloads_dir / project_name):
-            # compile the project
-            se.bash.run(f"mvn clean compile {Macros.SKIPS}", 0)
-            # copy the cached file
-            se.bash.run(f"cp -r {cached_objects_dir} .", 0)
+            if compile_project:
+                # compile the project
+                se.bash.run(mvn_cmd(f"clean compile {Macros.SKIPS}"), 0)
+            else:
+                # the project is already compiled, remove the inline tests of the previous run
+                se.bash.run(f"rm -rf {Macros.INLINE_TEST_PACKAGE} reports", 0)
+            # link the cached objects instead of copying them
+            cls.link_cached_objects(cached_objects_dir)
             # copy the inline tests
             if test_name:
                 exist, test_path = cls.find_inline_test(test_name, inlinetest_dir)
@@ -479,18 +540,40 @@ class Util:
                             se.bash.run(f"rm {file_path}")
                     if len(comp_failed_tests) == len(java_files):
                         return "compilation failure", -1
-            if f"{Macros.r1_its_dir}" in inlinetest_dir:
-                comp_failed_tests_file = (
-                    f"{Macros.r1_its_report_dir}/{project_name}-comp-failed-tests.txt"
-                )
-            elif f"{Macros.r0_its_dir}" in inlinetest_dir:
-                comp_failed_tests_file = (
-                    f"{Macros.r0_its_report_dir}/{project_name}-comp-failed-tests.txt"
-                )
-            if os.path.exists(comp_failed_tests_file):
-                os.remove(comp_failed_tests_file)
-            if comp_failed_tests:
-                se.io.dump(comp_failed_tests_file, comp_failed_tests, se.io.Fmt.txtList)
+            comp_failed_tests_file = cls.get_comp_failed_tests_file(
+                project_name, inlinetest_dir
+            )
+            if comp_failed_tests_file is not None:
+                if os.path.exists(comp_failed_tests_file):
+                    os.remove(comp_failed_tests_file)
+                if comp_failed_tests:
+                    se.io.dump(
+                        comp_failed_tests_file, comp_failed_tests, se.io.Fmt.txtList
+                    )
+        if not run_tests:
+            return None, None
+        return cls.run_compiled_inline_tests(
+            project_name, sha, deps_file, fail_fast, timeout
+        )
+
+    @classmethod
+    def run_compiled_inline_tests(
+        cls,
+        project_name: str,
+        sha: str,
+        deps_file: str,
+        fail_fast: bool = False,
+        timeout: int = None,
+    ):
+        """
+        Run the inline tests compiled in the project by run_inline_tests (with run_tests=False), without compiling anything.
+
+        Returns:
+            The junit records (None if there is no report) and the return code of the run.
+        """
+        if not os.path.exists(deps_file):
+            deps_file = Util.get_deps_file_path(project_name, sha)
+        with se.io.cd(Macros.downloads_dir / project_name):
             # get package list
             package_list = []
             for dir in os.listdir(
@@ -510,33 +593,366 @@ class Util:
                 )
                 deps_file = "deps.txt"
                 se.io.dump(deps_file, deps_str, se.io.Fmt.txt)
-            run_str = f"java -jar {Macros.jar_dir}/junit-platform-console-standalone-1.9.0-RC1.jar -cp {Macros.itest_jar}:{Macros.INLINE_TEST_PACKAGE}:{Macros.raninline_jar}:$(< {deps_file}) {' '.join(package_list)} --reports-dir reports"
+            java = cls.get_timeout_prefix(timeout) + "java"
+            if fail_fast:
+                # stops at the first failing test, the report only has the tests run until then
+                run_str = f"{java} -cp {Macros.jar_dir}/junit-platform-console-standalone-1.9.0-RC1.jar:{Macros.itest_jar}:{Macros.INLINE_TEST_PACKAGE}:{Macros.raninline_jar}:$(< {deps_file}) org.raninline.FailFastLauncher {' '.join(package_list)} --reports-dir reports"
+            else:
+                run_str = f"{java} -jar {Macros.jar_dir}/junit-platform-console-standalone-1.9.0-RC1.jar -cp {Macros.itest_jar}:{Macros.INLINE_TEST_PACKAGE}:{Macros.raninline_jar}:$(< {deps_file}) {' '.join(package_list)} --reports-dir reports"
             run_res = se.bash.run(run_str)
             junit_report_file = "reports/TEST-junit-jupiter.xml"
             if os.path.exists(junit_report_file):
-                report_xml = se.io.load(junit_report_file, se.io.Fmt.txt)
-                report_json = xmltodict.parse(report_xml)
-                return report_json, run_res.returncode
+                return cls.parse_junit_report(junit_report_file), run_res.returncode
             else:
                 return None, run_res.returncode
 
+    @classmethod
+    def link_cached_objects(cls, cached_objects_dir: str):
+        """
+        Make the cached objects available to the inline tests as .inlinegen in the current directory, without copying them.
+
+        Args:
+            cached_objects_dir(str): Directory of the serialized objects, usually a symlink into the object store.
+        """
+        se.bash.run(f"rm -rf {Macros.INLINE_GEN_DIR_NAME}", 0)
+        se.bash.run(
+            f"ln -sfn {os.path.realpath(cached_objects_dir)} {Macros.INLINE_GEN_DIR_NAME}",
+            0,
+        )
+
+    @classmethod
+    def get_comp_failed_tests_file(cls, project_name: str, inlinetest_dir: str):
+        if f"{Macros.r1_its_dir}" in str(inlinetest_dir):
+            return f"{Macros.r1_its_report_dir}/{project_name}-comp-failed-tests.txt"
+        elif f"{Macros.r0_its_dir}" in str(inlinetest_dir):
+            return f"{Macros.r0_its_report_dir}/{project_name}-comp-failed-tests.txt"
+        return None
+
+    @classmethod
+    def get_combined_test_class_prefix(cls, tag: str):
+        # the prefix keeps the class name ending with "Test" so that the junit console launcher still picks it up
+        return f"{tag.upper()}__"
+
+    @classmethod
+    def stage_inline_tests(cls, inlinetest_dir: str, dest_dir: str, tag: str):
+        """
+        Copy the inline tests in inlinetest_dir to dest_dir, renaming every test class with the prefix of the tag so that tests of different types can share one classpath.
+
+        Args:
+            inlinetest_dir(str): Directory of the inline tests, organized by package.
+            dest_dir(str): Directory to copy the renamed inline tests to.
+            tag(str): Type of the inline tests (r0 or r1).
+        """
+        prefix = cls.get_combined_test_class_prefix(tag)
+        for file_path in glob.glob(f"{inlinetest_dir}/**/*.java", recursive=True):
+            rel_path = os.path.relpath(file_path, inlinetest_dir)
+            rel_dir, file_name = os.path.split(rel_path)
+            class_name = file_name[: -len(".java")]
+            content = se.io.load(file_path, se.io.Fmt.txt)
+            content = re.sub(rf"\b{re.escape(class_name)}\b", prefix + class_name, content)
+            se.io.mkdir(Path(dest_dir) / rel_dir)
+            se.io.dump(
+                Path(dest_dir) / rel_dir / f"{prefix}{file_name}",
+                content,
+                se.io.Fmt.txt,
+            )
+
+    @classmethod
+    def split_combined_report(cls, records: List[dict], tags: List[str]):
+        """
+        Split the junit records of a combined run into one record list per tag, restoring the original class names.
+
+        Args:
+            records(List[dict]): Junit records returned by parse_junit_report.
+            tags(List[str]): Types of the inline tests in the combined run.
+        """
+        tag_to_records = {tag: [] for tag in tags}
+        for record in records:
+            package, _, class_name = record["classname"].rpartition(".")
+            for tag in tags:
+                prefix = cls.get_combined_test_class_prefix(tag)
+                if class_name.startswith(prefix):
+                    record["classname"] = (
+                        f"{package}.{class_name[len(prefix):]}"
+                        if package
+                        else class_name[len(prefix) :]
+                    )
+                    tag_to_records[tag].append(record)
+                    break
+        tag_to_report = {}
+        for tag, tag_records in tag_to_records.items():
+            returncode = 1 if cls.get_failed_junit_records(tag_records) else 0
+            tag_to_report[tag] = (tag_records, returncode)
+        return tag_to_report
+
+    @classmethod
+    def parse_junit_report(cls, report_file: str):
+        """
+        Stream a junit xml report and keep only the class name, method name and status of each test case.
+
+        Args:
+            report_file(str): Path to the junit xml report.
+
+        Returns:
+            List[dict]: One record per test case, with keys classname, name and status (passed, failure, error or skipped).
+        """
+        records = []
+        status = "passed"
+        for event, elem in ET.iterparse(report_file, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "testcase":
+                    status = "passed"
+                elif elem.tag in ["failure", "error"]:
+                    status = elem.tag
+                elif elem.tag == "skipped" and status == "passed":
+                    status = "skipped"
+                continue
+            if elem.tag == "testcase":
+                records.append(
+                    {
+                        "classname": elem.get("classname"),
+                        "name": elem.get("name"),
+                        "status": status,
+                    }
+                )
+                # drop the stack traces and system-out of the finished test case
+                elem.clear()
+        return records
+
+    @classmethod
+    def load_junit_records(cls, report: Union[list, dict]):
+        """
+        Normalize an inline test report loaded from disk to junit records; reports written before parse_junit_report (xmltodict format) are converted on the fly.
+
+        Args:
+            report(Union[list, dict]): Loaded report.
+
+        Returns:
+            List[dict]: Junit records, or None if the report has no test cases.
+        """
+        if report is None or isinstance(report, str):
+            return None
+        if isinstance(report, list):
+            return report
+        if "testsuite" not in report or "testcase" not in report["testsuite"]:
+            return None
+        test_cases = report["testsuite"]["testcase"]
+        if not isinstance(test_cases, list):
+            test_cases = [test_cases]
+        records = []
+        for test_case in test_cases:
+            if "failure" in test_case:
+                status = "failure"
+            elif "error" in test_case:
+                status = "error"
+            elif "skipped" in test_case:
+                status = "skipped"
+            else:
+                status = "passed"
+            records.append(
+                {
+                    "classname": test_case["@classname"],
+                    "name": test_case["@name"],
+                    "status": status,
+                }
+            )
+        return records
+
+    @classmethod
+    def get_failed_junit_records(cls, records: List[dict]):
+        return [
+            record for record in records if record["status"] in ["failure", "error"]
+        ]
+
+    @classmethod
+    def run_inline_tests_combined(
+        cls,
+        project_name: str,
+        sha: str,
+        tag_to_inlinetest_dir: dict,
+        cached_objects_dir: str,
+        deps_file: str,
+        log_path: str = None,
+    ):
+        """
+        Run several types of inline tests (e.g., r0 and r1) of a project in a single pass: the project is compiled once, the tests are compiled together and executed by one junit launch.
+
+        Args:
+            project_name(str): Name of the project.
+            sha(str): SHA of the project.
+            tag_to_inlinetest_dir(dict): Mapping from the type of the inline tests to their directory.
+            cached_objects_dir(str): Directory of the serialized objects.
+            deps_file(str): Dependencies file path.
+            log_path(str): Path for the log file of compilation failures.
+
+        Returns:
+            dict: Mapping from the type of the inline tests to (report, returncode), same as run_inline_tests.
+        """
+        tag_to_result = {}
+        tags = []
+        for tag, inlinetest_dir in tag_to_inlinetest_dir.items():
+            if not os.path.exists(inlinetest_dir):
+                print(f"{inlinetest_dir} does not exist")
+                tag_to_result[tag] = (None, None)
+            else:
+                tags.append(tag)
+        if not tags:
+            return tag_to_result
+        with se.io.cd(Macros.downloads_dir / project_name):
+            # compile the project once for all types
+            se.bash.run(mvn_cmd(f"clean compile {Macros.SKIPS}"), 0)
+            cls.link_cached_objects(cached_objects_dir)
+            inline_test_package_dir = (
+                Macros.downloads_dir / project_name / Macros.INLINE_TEST_PACKAGE
+            )
+            se.bash.run(f"rm -rf {inline_test_package_dir} reports")
+            for tag in tags:
+                cls.stage_inline_tests(
+                    tag_to_inlinetest_dir[tag], inline_test_package_dir, tag
+                )
+            if not os.path.exists(deps_file):
+                print(f"{deps_file} does not exist")
+                deps_file = Util.get_deps_file_path(project_name, sha)
+            comp_str = f"javac -cp {Macros.itest_jar}:{Macros.jar_dir}/junit-platform-console-standalone-1.9.0-RC1.jar:{Macros.raninline_jar}:$(< {deps_file}) $(find {Macros.INLINE_TEST_PACKAGE} -name '*.java')"
+            tag_to_comp_failed_tests = {tag: [] for tag in tags}
+            tag_to_num_files = collections.Counter()
+            try:
+                se.bash.run(comp_str, 0)
+            except Exception as e:
+                print(e)
+                # compile file one by one, and remove the failed file
+                for file_path in glob.glob(
+                    f"{Macros.INLINE_TEST_PACKAGE}/**/*.java", recursive=True
+                ):
+                    tag = next(
+                        tag
+                        for tag in tags
+                        if os.path.basename(file_path).startswith(
+                            cls.get_combined_test_class_prefix(tag)
+                        )
+                    )
+                    tag_to_num_files[tag] += 1
+                    print("recompiling", file_path, "...")
+                    comp_str = f"javac -cp {Macros.itest_jar}:{Macros.jar_dir}/junit-platform-console-standalone-1.9.0-RC1.jar:{Macros.raninline_jar}:$(< {deps_file}) {file_path}"
+                    try:
+                        se.bash.run(comp_str, 0)
+                    except Exception as e:
+                        print(e)
+                        if log_path:
+                            se.io.dump(
+                                log_path,
+                                [
+                                    f"{project_name} {sha} {file_path}",
+                                    traceback.format_exc(),
+                                ],
+                                se.io.Fmt.txtList,
+                                append=True,
+                            )
+                        # report the original file path, as run_inline_tests does
+                        rel_dir, file_name = os.path.split(file_path)
+                        file_name = file_name[
+                            len(cls.get_combined_test_class_prefix(tag)) :
+                        ]
+                        tag_to_comp_failed_tests[tag].append(
+                            f"{rel_dir}/{file_name}," + traceback.format_exc()
+                        )
+                        se.bash.run(f"rm {file_path}")
+            for tag in tags:
+                comp_failed_tests_file = cls.get_comp_failed_tests_file(
+                    project_name, tag_to_inlinetest_dir[tag]
+                )
+                if comp_failed_tests_file is not None:
+                    if os.path.exists(comp_failed_tests_file):
+                        os.remove(comp_failed_tests_file)
+                    if tag_to_comp_failed_tests[tag]:
+                        se.io.dump(
+                            comp_failed_tests_file,
+                            tag_to_comp_failed_tests[tag],
+                            se.io.Fmt.txtList,
+                        )
+                if tag_to_num_files[tag] > 0 and len(
+                    tag_to_comp_failed_tests[tag]
+                ) == tag_to_num_files[tag]:
+                    tag_to_result[tag] = ("compilation failure", -1)
+            tags = [tag for tag in tags if tag not in tag_to_result]
+            if not tags:
+                return tag_to_result
+            # get package list
+            package_list = []
+            for dir in os.listdir(inline_test_package_dir):
+                if os.path.isdir(inline_test_package_dir / dir):
+                    package_list.append(f"--select-package {dir}")
+            # run tests
+            deps = se.io.load(deps_file, se.io.Fmt.txt)
+            if "testng" in deps:
+                deps_str = ":".join(
+                    [dep for dep in deps.split(":") if "testng" not in dep]
+                )
+                deps_file = "deps.txt"
+                se.io.dump(deps_file, deps_str, se.io.Fmt.txt)
+            run_str = f"java -jar {Macros.jar_dir}/junit-platform-console-standalone-1.9.0-RC1.jar -cp {Macros.itest_jar}:{Macros.INLINE_TEST_PACKAGE}:{Macros.raninline_jar}:$(< {deps_file}) {' '.join(package_list)} --reports-dir reports"
+            run_res = se.bash.run(run_str)
+            junit_report_file = "reports/TEST-junit-jupiter.xml"
+            if os.path.exists(junit_report_file):
+                records = cls.parse_junit_report(junit_report_file)
+                tag_to_result.update(cls.split_combined_report(records, tags))
+            else:
+                for tag in tags:
+                    tag_to_result[tag] = (None, run_res.returncode)
+        return tag_to_result
+
     @classmethod
     def get_deps_file_path(cls, project_name: str, sha: str):
         # by default, return the deps file in the generated tests dir
         deps_file = Macros.unit_tests_dir / f"{project_name}-{sha}" / "deps.txt"
         if not deps_file.exists():
-            Util.prepare_project_for_test_generation(
-                project_name, sha, deps_file, None, None
-            )
+            dependencies = ClasspathCache().get_deps(project_name, sha)
+            if dependencies is not None:
+                se.io.mkdir(deps_file.parent)
+                se.io.dump(deps_file, dependencies, se.io.Fmt.txt)
+            else:
+                Util.prepare_project_for_test_generation(
+                    project_name, sha, deps_file, None, None
+                )
         return deps_file
 
+    @classmethod
+    def cache_classpath(cls, project_name: str, sha: str) -> bool:
+        """
+        Compute the dependency classpath and the class list of the project version if they are not in the classpath cache.
+
+        Returns:
+            bool: Whether the cache has the dependency classpath of the project version afterwards.
+        """
+        classpath_cache = ClasspathCache()
+        entry = classpath_cache.get(project_name, sha)
+        if entry is not None and "deps" in entry and "classpath_list" in entry:
+            return True
+        tmp_dir = Path(se.io.mktmp_dir(prefix="cp-cache"))
+        try:
+            cls.prepare_project_for_test_generation(
+                project_name,
+                sha,
+                tmp_dir / "deps.txt",
+                tmp_dir / "classpath-list.txt",
+                Macros.log_dir / "classpath-cache.log",
+            )
+        finally:
+            se.io.rm(tmp_dir)
+        return classpath_cache.get_deps(project_name, sha) is not None
+
     @classmethod
     def find_inline_test(cls, test_name: str, inline_test_dir: str = None):
-        with se.io.cd(inline_test_dir):
-            test_path = se.bash.run(f"find . -name {test_name}").stdout.strip()
-            if test_path == "":
-                return False, None
-        return True, test_path
+        if inline_test_dir is None:
+            inline_test_dir = os.getcwd()
+        # same matches as find, which does not skip the hidden directories
+        test_paths = SourceIndex.of(inline_test_dir, include_hidden=True).find(
+            test_name
+        )
+        if not test_paths:
+            return False, None
+        # relative to the inline test dir, as printed by find
+        return True, f"./{test_paths[0]}"
 
     @classmethod
     def get_maven_project(cls, parsed_project_name: str):
@@ -555,19 +971,41 @@ class Util:
         log_file_path: str,
         maven_project: MavenProject = None,
         timeout: int = 600,
+        tests: List[str] = None,
+        compile_project: bool = True,
+        mutant_id: int = None,
+        fail_fast: bool = False,
     ):
-        if maven_project is None:
-            maven_project = cls.get_maven_project(project_name)
-        Util.configure_tests_for_jacoco_agent(project_name, Macros.dev, maven_project)
+        """
+        Run the developer-written unit tests with maven.
+
+        Args:
+            tests (List[str], optional): Only run these test classes. Defaults to None, which runs all test classes.
+            compile_project (bool, optional): Whether to configure and clean build the project. If False, the project must have been built by a previous run, e.g., of a mutant schemata build. Defaults to True.
+            mutant_id (int, optional): The mutant to select in a mutant schemata build. Defaults to None.
+            fail_fast (bool, optional): Whether to skip the remaining tests after the first failing test. Defaults to False.
+        """
+        if compile_project:
+            if maven_project is None:
+                maven_project = cls.get_maven_project(project_name)
+            Util.configure_tests_for_jacoco_agent(
+                project_name, Macros.dev, maven_project
+            )
         print("compiling and executing developer-written unit tests...")
         se.io.dump(log_file_path, [Macros.Dev], se.io.Fmt.txtList, append=True)
+        goals = "clean test" if compile_project else "test"
         with se.io.cd(Macros.downloads_dir / project_name):
-            if project_name == "cyclopsgroup_jcli":
-                se.bash.run("mvn com.coveo:fmt-maven-plugin:format", 0)
+            if project_name == "cyclopsgroup_jcli" and compile_project:
+                se.bash.run(mvn_cmd("com.coveo:fmt-maven-plugin:format"), 0)
             try:
-                with se.TimeUtils.time_limit(timeout):
+                with se.TimeUtils.time_limit(timeout + 2 * Macros.TIMEOUT_KILL_AFTER):
                     run_res = se.bash.run(
-                        f"mvn clean test {Macros.SKIPS_NO_JACOCO} &>> {log_file_path}"
+                        cls.get_mutant_env(mutant_id)
+                        + cls.get_timeout_prefix(timeout)
+                        + mvn_cmd(
+                            f"{goals} {Macros.SKIPS_NO_JACOCO} {cls.get_surefire_test_filter(tests, fail_fast)} &>> {log_file_path}",
+                            backend=Macros.MAVEN_BACKEND_MVN,
+                        )
                     )
             except se.TimeoutException:
                 return -1
@@ -585,7 +1023,7 @@ class Util:
         if not os.path.exists(generated_tests_dir):
             return -1
         with se.io.cd(Macros.downloads_dir / project_name):
-            se.bash.run(f"mvn test-compile {Macros.SKIPS}")
+            se.bash.run(mvn_cmd(f"test-compile {Macros.SKIPS}"))
         print("copying Randoop test cases...")
         se.bash.run(
             f"cp -r {generated_tests_dir} {Macros.downloads_dir/project_name}/randoop-tests",
@@ -626,32 +1064,104 @@ class Util:
         log_file_path: str,
         maven_project: MavenProject = None,
         timeout: int = 600,
+        tests: List[str] = None,
+        compile_project: bool = True,
+        mutant_id: int = None,
+        fail_fast: bool = False,
     ):
+        """
+        Copy the Randoop tests into the project and run them with maven.
+
+        Args:
+            tests (List[str], optional): Only run these test classes. Defaults to None, which runs all test classes.
+            compile_project (bool, optional): Whether to configure the project, copy the tests and clean build the project. If False, the project must have been built by a previous run, e.g., of a mutant schemata build. Defaults to True.
+            mutant_id (int, optional): The mutant to select in a mutant schemata build. Defaults to None.
+            fail_fast (bool, optional): Whether to skip the remaining tests after the first failing test. Defaults to False.
+        """
         if not os.path.exists(generated_tests_dir):
             return -1
-        if maven_project is None:
-            maven_project = cls.get_maven_project(project_name)
-        Util.configure_tests_for_jacoco_agent(
-            project_name, Macros.randoop, maven_project
-        )
-        try:
-            Util.copy_randoop_tests_to_src_test_java(project_name, generated_tests_dir)
-        except Exception as e:
-            se.io.dump(log_file_path, [f"{e}"], se.io.Fmt.txtList, append=True)
-            return -1
+        if compile_project:
+            if maven_project is None:
+                maven_project = cls.get_maven_project(project_name)
+            Util.configure_tests_for_jacoco_agent(
+                project_name, Macros.randoop, maven_project
+            )
+            try:
+                Util.copy_randoop_tests_to_src_test_java(
+                    project_name, generated_tests_dir
+                )
+            except Exception as e:
+                se.io.dump(log_file_path, [f"{e}"], se.io.Fmt.txtList, append=True)
+                return -1
         print("compiling and executing Randoop tests...")
         se.io.dump(log_file_path, ["Randoop"], se.io.Fmt.txtList, append=True)
+        goals = "clean test" if compile_project else "test"
         with se.io.cd(Macros.downloads_dir / project_name):
             try:
-                with se.TimeUtils.time_limit(timeout):
+                with se.TimeUtils.time_limit(timeout + 2 * Macros.TIMEOUT_KILL_AFTER):
                     run_res = se.bash.run(
-                        f"mvn clean test {Macros.SKIPS_NO_JACOCO} &>> {log_file_path}"
+                        cls.get_mutant_env(mutant_id)
+                        + cls.get_timeout_prefix(timeout)
+                        + mvn_cmd(
+                            f"{goals} {Macros.SKIPS_NO_JACOCO} {cls.get_surefire_test_filter(tests, fail_fast)} &>> {log_file_path}",
+                            backend=Macros.MAVEN_BACKEND_MVN,
+                        )
                     )
             except se.TimeoutException as e:
                 se.io.dump(log_file_path, [e], se.io.Fmt.txtList, append=True)
                 return -1
             return run_res.returncode
 
+    @classmethod
+    def get_surefire_test_filter(
+        cls, tests: List[str] = None, fail_fast: bool = False
+    ) -> str:
+        # only run the given test classes, no filter if None
+        options = []
+        if tests is not None:
+            options.append(
+                f"-Dtest={','.join(tests)} -DfailIfNoTests=false -Dsurefire.failIfNoSpecifiedTests=false"
+            )
+        if fail_fast:
+            options.append("-Dsurefire.skipAfterFailureCount=1")
+        return " ".join(options)
+
+    @classmethod
+    def get_mutant_env(cls, mutant_id: int = None) -> str:
+        # JAVA_TOOL_OPTIONS also reaches the JVMs forked by surefire
+        if mutant_id is None:
+            return ""
+        return f'JAVA_TOOL_OPTIONS="$JAVA_TOOL_OPTIONS -D{Macros.MUTANT_PROPERTY}={mutant_id}" '
+
+    @classmethod
+    def get_timeout_prefix(cls, timeout: int = None) -> str:
+        # GNU timeout signals its whole process group, so the JVMs forked by maven and surefire are killed too, not those forked by a maven daemon (use Macros.MAVEN_BACKEND_MVN)
+        if timeout is None:
+            return ""
+        return f"timeout -k {Macros.TIMEOUT_KILL_AFTER} {timeout} "
+
+    @classmethod
+    def is_timeout_returncode(
+        cls, returncode: int, elapsed: float = None, timeout: int = None
+    ) -> bool:
+        """
+        Whether a command run with get_timeout_prefix was killed by the timeout.
+
+        Args:
+            returncode (int): The return code of the command.
+            elapsed (float, optional): The time (s) of the command. Defaults to None.
+            timeout (int, optional): The timeout of the command. Defaults to None.
+        """
+        if returncode == Macros.TIMEOUT_RETURNCODE:
+            return True
+        # SIGKILL if the processes survive SIGTERM for Macros.TIMEOUT_KILL_AFTER, but also if the JVM is killed by the OOM killer before the timeout
+        return (
+            returncode == 128 + signal.SIGKILL
+            and elapsed is not None
+            and timeout is not None
+            and elapsed >= timeout
+        )
+
     @classmethod
     def run_with_jacoco(
         cls,
@@ -676,7 +1186,7 @@ class Util:
                     project_name, test_type, maven_project
                 )
                 test_rr = se.bash.run(
-                    f"mvn clean test {Macros.SKIPS_NO_JACOCO} > {jacoco_log_dir}/{project_name}-{sha}-{test_type}-tests.log",
+                    mvn_cmd(f"clean test {Macros.SKIPS_NO_JACOCO} > {jacoco_log_dir}/{project_name}-{sha}-{test_type}-tests.log"),
                     0,
                     timeout=timeout,
                 )
@@ -723,6 +1233,9 @@ class Util:
         time_limit: int = 100,
         dep_file_path: str = None,
         classpath_file_path: str = None,
+        num_workers: int = 1,
+        class_to_time_limit: Dict[str, int] = None,
+        shards: List[List[str]] = None,
     ):
         print("run randoop...")
         res = {}
@@ -744,13 +1257,30 @@ class Util:
                 print("running randoop...")
                 try:
                     classpath_list = se.io.load(classpath_file_path, se.io.Fmt.txtList)
-                    total_time_limit = min(len(classpath_list) * time_limit, 10800)
-                    print(f"total time limit: {total_time_limit}")
-                    se.bash.run(
-                        f"java -cp {Macros.randoop_jar}:$(< {dep_file_path}) randoop.main.Main gentests --time-limit={total_time_limit} --usethreads=true --randomseed={seed} --classlist={classpath_file_path} &> {log_path}",
-                        0,
-                        timeout=total_time_limit + 1800,
-                    )
+                    if num_workers > 1 and len(classpath_list) > 1:
+                        cls.generate_randoop_tests_in_shards(
+                            classpath_list,
+                            seed,
+                            randoop_tests_dir,
+                            randoop_log_dir,
+                            project_name,
+                            time_limit,
+                            dep_file_path,
+                            error_log_path,
+                            num_workers,
+                            shards,
+                            class_to_time_limit,
+                        )
+                    else:
+                        total_time_limit = cls.get_randoop_time_limit(
+                            classpath_list, time_limit, class_to_time_limit
+                        )
+                        print(f"total time limit: {total_time_limit}")
+                        se.bash.run(
+                            f"java -cp {Macros.randoop_jar}:$(< {dep_file_path}) randoop.main.Main gentests --time-limit={total_time_limit} --usethreads=true --randomseed={seed} --classlist={classpath_file_path} &> {log_path}",
+                            0,
+                            timeout=total_time_limit + 1800,
+                        )
                 except (subprocess.TimeoutExpired, Exception) as e:
                     se.io.dump(
                         f"{error_log_path}",
@@ -776,6 +1306,83 @@ class Util:
             )
         return res
 
+    @classmethod
+    def generate_randoop_tests_in_shards(
+        cls,
+        classpath_list: List[str],
+        seed: int,
+        randoop_tests_dir: Path,
+        log_dir: str,
+        project_name: str,
+        time_limit: int,
+        dep_file_path: str,
+        error_log_path: str,
+        num_shards: int,
+        shards: List[List[str]] = None,
+        class_to_time_limit: Dict[str, int] = None,
+    ):
+        """
+        Split the classes into shards and run one Randoop process per shard at the same time. Shard i uses the seed seed + i and writes RegressionTestShard{i}_*.java, so the shards can be merged into randoop_tests_dir without name clashes.
+
+        Args:
+            classpath_list(List[str]): Classes to generate tests for.
+            seed(int): Seed of the first shard.
+            randoop_tests_dir(Path): Directory to collect the generated tests.
+            log_dir(str): Directory for the Randoop log of each shard.
+            project_name(str): Name of the project.
+            time_limit(int): Time limit (seconds) per class.
+            dep_file_path(str): Dependencies file path.
+            error_log_path(str): Path for the log file of failed runs.
+            num_shards(int): Number of shards.
+            shards(List[List[str]]): Classes of each shard. Defaults to a round-robin split of classpath_list.
+            class_to_time_limit(Dict[str, int]): Time limit (seconds) of each class, a shard runs for the sum of its classes. Defaults to time_limit for every class.
+        """
+        if shards is None:
+            shards = [classpath_list[i::num_shards] for i in range(num_shards)]
+        shards = [shard for shard in shards if shard]
+        dep_file_path = os.path.abspath(dep_file_path)
+
+        def run_shard(index: int, shard: List[str]):
+            shard_dir = Path(randoop_tests_dir) / f"shard{index}"
+            se.io.mkdir(shard_dir, fresh=True)
+            shard_classpath_file = shard_dir / "classpath-list.txt"
+            se.io.dump(shard_classpath_file, shard, se.io.Fmt.txtList)
+            shard_time_limit = cls.get_randoop_time_limit(
+                shard, time_limit, class_to_time_limit
+            )
+            log_path = f"{log_dir}/{project_name}-{Macros.randoop}-shard{index}.log"
+            try:
+                se.bash.run(
+                    f"cd {shard_dir} && java -cp {Macros.randoop_jar}:$(< {dep_file_path}) randoop.main.Main gentests --time-limit={shard_time_limit} --usethreads=true --randomseed={seed + index} --classlist={shard_classpath_file} --regression-test-basename=RegressionTestShard{index}_ --error-test-basename=ErrorTestShard{index}_ &> {log_path}",
+                    0,
+                    timeout=shard_time_limit + 1800,
+                )
+            except (subprocess.TimeoutExpired, Exception) as e:
+                se.io.dump(error_log_path, [f"{e}"], se.io.Fmt.txtList, append=True)
+            return shard_dir
+
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            shard_dirs = list(executor.map(run_shard, range(len(shards)), shards))
+        for shard_dir in shard_dirs:
+            se.bash.run(
+                f"find {shard_dir} -maxdepth 1 -name '*.java' -exec mv {{}} {randoop_tests_dir} \\;"
+            )
+            se.bash.run(f"rm -rf {shard_dir}")
+
+    @classmethod
+    def get_randoop_time_limit(
+        cls,
+        classpath_list: List[str],
+        time_limit: int,
+        class_to_time_limit: Dict[str, int] = None,
+    ) -> int:
+        # one Randoop process for all classes, at most 3 hours
+        if class_to_time_limit is None:
+            return min(len(classpath_list) * time_limit, 10800)
+        return min(
+            sum(class_to_time_limit.get(c, time_limit) for c in classpath_list), 10800
+        )
+
     @classmethod
     def generate_evosuite_tests(
         cls,
@@ -786,6 +1393,8 @@ class Util:
         time_limit: int = 120,
         dep_file_path: str = None,
         classpath_file_path: str = None,
+        num_workers: int = 1,
+        class_to_time_limit: Dict[str, int] = None,
     ):
         print("run evosuite...")
         res = {}
@@ -803,44 +1412,29 @@ class Util:
                 if classpath_file_path is not None:
                     print("find classes...")
                     classpath_list = se.io.load(classpath_file_path, se.io.Fmt.txtList)
-                    for classpath in tqdm(classpath_list):
-                        """
-                        Have to skip some classes:
-                        "jenkinsci_email-ext-plugin",  # evosuite generated tests removed the whole directory
-                        "phax_ph-pdf-layout", # evosuite generated tests changed the permission of the whole directory, f2d7b98d
-                        "red6_pdfcompare", # evosuite generated tests changed the permission of the whole directory, 1259ef2e
-                        """
-                        if classpath in [
-                            "de.redsix.pdfcompare.PdfComparator$InputStreamSupplier",
-                            "de.redsix.pdfcompare.PdfComparator",
-                            "de.redsix.pdfcompare.AbstractCompareResultWithSwap",
-                            "com.helger.pdflayout.spec.LoadedFont$1",
-                            "hudson.plugins.emailext.plugins.content.AbstractEvalContent",
-                            "hudson.plugins.emailext.watching.EmailExtWatchJobProperty",
-                            "hudson.plugins.emailext.plugins.content.AbstractEvalContent$IsChildFileCallable",
-                            "hudson.plugins.emailext.plugins.ZipDataSource",
-                            "hudson.plugins.emailext.EmailRecipientUtils",
-                        ]:
-                            continue
-                        command = f"java -jar {Macros.evosuite_jar} -DCP_file_path {dep_file_path} -class {classpath} -seed {seed} -Dsearch_budget={time_limit} -Duse_separate_classloader=false -Dminimize=false -Dassertion_strategy=all -Dfilter_assertions=true -Dvirtual_fs=false -Dvirtual_net=false -Dsandbox_mode=OFF -Dfilter_sandbox_tests=true -Dmax_loop_iterations=-1 &> {log_path}"
-                        print(command)
-                        try:
-                            se.bash.run(command, 0, timeout=5 * time_limit)
-                            Util.avoid_permission_error(project_name)
-                        except (subprocess.TimeoutExpired, Exception) as e:
-                            print(traceback.format_exc())
-                            res["evosuite"] = False
-                            se.io.dump(
-                                f"{error_log_path}",
-                                [f"{e}"],
-                                se.io.Fmt.txtList,
-                                append=True,
-                            )
+                    manifest = cls.generate_evosuite_tests_per_class(
+                        project_name,
+                        classpath_list,
+                        seed,
+                        time_limit,
+                        dep_file_path,
+                        evosuite_log_dir,
+                        error_log_path,
+                        num_workers,
+                        class_to_time_limit,
+                    )
+                    if output_dir is not None:
+                        se.io.mkdir(output_dir)
+                        se.io.dump(
+                            Path(output_dir) / "evosuite-manifest.json",
+                            manifest,
+                            se.io.Fmt.jsonPretty,
+                        )
                 else:
                     # target is whole project
                     # check if target/classes exists
                     if not os.path.exists("target/classes"):
-                        se.bash.run("mvn compile", 0)
+                        se.bash.run(mvn_cmd("compile"), 0)
                     command = f"java -jar {Macros.evosuite_jar} -DCP_file_path {dep_file_path} -target {Macros.downloads_dir}/{project_name}/target/classes -seed {seed} -Dsearch_budget={time_limit} -Dassertion_timeout={time_limit} -Dminimization_timeout={time_limit} -Duse_separate_classloader=false -Dminimize=false -Dassertion_strategy=all -Dfilter_assertions=true -Dfilter_sandbox_tests=true -Dvirtual_fs=false -Dvirtual_net=false -Dsandbox_mode=OFF -Dmax_loop_iterations=-1 &> {log_path}"
                     print(command)
                     try:
@@ -883,6 +1477,146 @@ class Util:
             )
         return res
 
+    @classmethod
+    def generate_evosuite_tests_per_class(
+        cls,
+        project_name: str,
+        classpath_list: List[str],
+        seed: int,
+        time_limit: int,
+        dep_file_path: str,
+        log_dir: str,
+        error_log_path: str,
+        num_workers: int = 1,
+        class_to_time_limit: Dict[str, int] = None,
+    ):
+        """
+        Run EvoSuite for each class with a pool of num_workers processes. Each run has its own working directory, the generated tests and reports are merged into evosuite-tests and evosuite-report of the project.
+
+        Args:
+            project_name(str): Name of the project.
+            classpath_list(List[str]): Classes to generate tests for.
+            seed(int): Seed of EvoSuite.
+            time_limit(int): Search budget (seconds) per class.
+            dep_file_path(str): Dependencies file path.
+            log_dir(str): Directory for the EvoSuite log of each class.
+            error_log_path(str): Path for the log file of failed runs.
+            num_workers(int): Number of EvoSuite processes running at the same time. Defaults to 1.
+            class_to_time_limit(Dict[str, int]): Search budget (seconds) of each class. Defaults to time_limit for every class.
+
+        Returns:
+            dict: Manifest mapping each class to its status (generated, no-tests, skipped, timeout or failed) and time.
+        """
+        project_dir = Macros.downloads_dir / project_name
+        # the runs do not share the working directory
+        dep_file_path = os.path.abspath(dep_file_path)
+        work_dir = project_dir / "evosuite-work"
+        se.io.mkdir(work_dir, fresh=True)
+        class_log_dir = Path(log_dir) / project_name
+        se.io.mkdir(class_log_dir)
+        """
+        Have to skip some classes:
+        "jenkinsci_email-ext-plugin",  # evosuite generated tests removed the whole directory
+        "phax_ph-pdf-layout", # evosuite generated tests changed the permission of the whole directory, f2d7b98d
+        "red6_pdfcompare", # evosuite generated tests changed the permission of the whole directory, 1259ef2e
+        """
+        skipped_classes = [
+            "de.redsix.pdfcompare.PdfComparator$InputStreamSupplier",
+            "de.redsix.pdfcompare.PdfComparator",
+            "de.redsix.pdfcompare.AbstractCompareResultWithSwap",
+            "com.helger.pdflayout.spec.LoadedFont$1",
+            "hudson.plugins.emailext.plugins.content.AbstractEvalContent",
+            "hudson.plugins.emailext.watching.EmailExtWatchJobProperty",
+            "hudson.plugins.emailext.plugins.content.AbstractEvalContent$IsChildFileCallable",
+            "hudson.plugins.emailext.plugins.ZipDataSource",
+            "hudson.plugins.emailext.EmailRecipientUtils",
+        ]
+
+        def run_one(index: int, classpath: str):
+            class_work_dir = work_dir / str(index)
+            se.io.mkdir(class_work_dir)
+            log_path = class_log_dir / f"{classpath}.log"
+            class_time_limit = (
+                class_to_time_limit.get(classpath, time_limit)
+                if class_to_time_limit is not None
+                else time_limit
+            )
+            command = f"cd {class_work_dir} && java -jar {Macros.evosuite_jar} -DCP_file_path {dep_file_path} -class '{classpath}' -seed {seed} -Dsearch_budget={class_time_limit} -Duse_separate_classloader=false -Dminimize=false -Dassertion_strategy=all -Dfilter_assertions=true -Dvirtual_fs=false -Dvirtual_net=false -Dsandbox_mode=OFF -Dfilter_sandbox_tests=true -Dmax_loop_iterations=-1 &> '{log_path}'"
+            print(command)
+            start_time = time.time()
+            try:
+                se.bash.run(
+                    command,
+                    0,
+                    timeout=Macros.EVOSUITE_TIMEOUT_FACTOR * class_time_limit
+                    + Macros.EVOSUITE_TIMEOUT_CONSTANT,
+                )
+                if glob.glob(
+                    f"{class_work_dir}/evosuite-tests/**/*.java", recursive=True
+                ):
+                    status = "generated"
+                else:
+                    status = "no-tests"
+            except subprocess.TimeoutExpired as e:
+                status = "timeout"
+                se.io.dump(error_log_path, [f"{e}"], se.io.Fmt.txtList, append=True)
+            except Exception as e:
+                print(traceback.format_exc())
+                status = "failed"
+                se.io.dump(error_log_path, [f"{e}"], se.io.Fmt.txtList, append=True)
+            return {
+                "class": classpath,
+                "status": status,
+                "budget": class_time_limit,
+                "time": time.time() - start_time,
+                "work_dir": str(class_work_dir),
+            }
+
+        manifest = {}
+        with ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+            futures = []
+            for index, classpath in enumerate(classpath_list):
+                if classpath in skipped_classes:
+                    manifest[classpath] = {"status": "skipped", "time": 0}
+                    continue
+                futures.append(executor.submit(run_one, index, classpath))
+            for future in tqdm(as_completed(futures), total=len(futures)):
+                result = future.result()
+                manifest[result["class"]] = {
+                    "status": result["status"],
+                    "budget": result["budget"],
+                    "time": result["time"],
+                }
+                if result["status"] == "generated":
+                    cls.merge_evosuite_outputs(Path(result["work_dir"]), project_dir)
+        Util.avoid_permission_error(project_name)
+        se.bash.run(f"rm -rf {work_dir}")
+        return manifest
+
+    @classmethod
+    def merge_evosuite_outputs(cls, class_work_dir: Path, project_dir: Path):
+        """
+        Merge the evosuite-tests and evosuite-report of one EvoSuite run into the project.
+
+        Args:
+            class_work_dir(Path): Working directory of the EvoSuite run.
+            project_dir(Path): Directory of the project.
+        """
+        se.io.mkdir(project_dir / "evosuite-tests")
+        se.bash.run(
+            f"cp -r {class_work_dir}/evosuite-tests/. {project_dir}/evosuite-tests/", 0
+        )
+        statistics_file = class_work_dir / "evosuite-report" / "statistics.csv"
+        if statistics_file.exists():
+            merged_statistics_file = project_dir / "evosuite-report" / "statistics.csv"
+            lines = se.io.load(statistics_file, se.io.Fmt.txtList)
+            if merged_statistics_file.exists():
+                # keep the header only once
+                lines = lines[1:]
+            else:
+                se.io.mkdir(merged_statistics_file.parent)
+            se.io.dump(merged_statistics_file, lines, se.io.Fmt.txtList, append=True)
+
     @classmethod
     def run_evosuite_command_line(
         cls,
@@ -892,17 +1626,33 @@ class Util:
         log_file_path: str,
         time_limit: int = 600,
         use_jacoco: bool = True,
+        tests: List[str] = None,
+        per_test_exec_dir: str = None,
+        compile_project: bool = True,
+        mutant_id: int = None,
+        fail_fast: bool = False,
     ):
+        """
+        Compile the EvoSuite tests and run them with JUnitCore.
+
+        Args:
+            tests (List[str], optional): Only run these test classes. Defaults to None, which runs all test classes.
+            per_test_exec_dir (str, optional): If set, run each test class in its own JVM with the jacoco agent writing <test class>.exec to this directory, and its log to <test class>.log. Defaults to None.
+            compile_project (bool, optional): Whether to build the project, copy and compile the tests. If False, they must have been compiled by a previous run, e.g., of a mutant schemata build. Defaults to True.
+            mutant_id (int, optional): The mutant to select in a mutant schemata build. Defaults to None.
+            fail_fast (bool, optional): Whether to stop at the first failing test (org.raninline.FailFastJUnitCore). Defaults to False.
+        """
         if not os.path.exists(generated_tests_dir):
             return -1
-        with se.io.cd(Macros.downloads_dir / project_name):
-            se.bash.run(f"mvn test-compile {Macros.SKIPS}")
-        print("copying EvoSuite test cases...")
         se.io.dump(log_file_path, [Macros.EvoSuite], se.io.Fmt.txtList, append=True)
-        se.bash.run(
-            f"cp -r {generated_tests_dir} {Macros.downloads_dir/project_name}/{Macros.evosuite}-tests",
-            0,
-        )
+        if compile_project:
+            with se.io.cd(Macros.downloads_dir / project_name):
+                se.bash.run(mvn_cmd(f"test-compile {Macros.SKIPS}"))
+            print("copying EvoSuite test cases...")
+            se.bash.run(
+                f"cp -r {generated_tests_dir} {Macros.downloads_dir/project_name}/{Macros.evosuite}-tests",
+                0,
+            )
 
         # 1. change separateClassLoader = true into separateClassLoader = false
         # 2. collect class names
@@ -917,21 +1667,26 @@ class Util:
                     )
 
         # TODO: hacky way to fix EvoSuite issue: comment out org.evosuite.runtime.GuiSupport
-        with se.io.cd(f"{Macros.downloads_dir/project_name}"):
-            for f in glob.glob("evosuite-tests/**/*_scaffolding.java", recursive=True):
-                content = se.io.load(f, se.io.Fmt.txt)
-                se.io.dump(
-                    f,
-                    content.replace(
-                        "org.evosuite.runtime.GuiSupport",
-                        "//org.evosuite.runtime.GuiSupport",
-                    ).replace(
-                        "org.evosuite.runtime.jvm.ShutdownHookHandler",
-                        "//org.evosuite.runtime.jvm.ShutdownHookHandler",
-                    ),
-                    se.io.Fmt.txt,
-                )
+        if compile_project:
+            with se.io.cd(f"{Macros.downloads_dir/project_name}"):
+                for f in glob.glob(
+                    "evosuite-tests/**/*_scaffolding.java", recursive=True
+                ):
+                    content = se.io.load(f, se.io.Fmt.txt)
+                    se.io.dump(
+                        f,
+                        content.replace(
+                            "org.evosuite.runtime.GuiSupport",
+                            "//org.evosuite.runtime.GuiSupport",
+                        ).replace(
+                            "org.evosuite.runtime.jvm.ShutdownHookHandler",
+                            "//org.evosuite.runtime.jvm.ShutdownHookHandler",
+                        ),
+                        se.io.Fmt.txt,
+                    )
 
+        if tests is not None:
+            classes = classes & set(tests)
         if not classes:
             return 0
         ################################## Execute tests ##################################
@@ -946,34 +1701,62 @@ class Util:
             comp_str = f"shopt -s globstar; javac -cp {Macros.evosuite_runtime_jar}:{Macros.junit_jar}:{Macros.raninline_jar}:$(< {deps_file}) evosuite-tests/**/*.java"
             print(comp_str)
             try:
-                se.bash.run(comp_str, 0)
+                # compiled by a previous run otherwise
+                if compile_project:
+                    se.bash.run(comp_str, 0)
             except Exception as e:
                 se.io.dump(log_file_path, traceback.format_exc(), se.io.Fmt.txt)
                 return -1
+            # =inclbootstrapclasses=true
+            # for each class in classes, build a string like: -c class_name
+            class_str = ""
+            for c in classes:
+                # TODO: hacky way to comment out a class that causes the tests to disappear
+                if c == "de.redsix.pdfcompare.CompareResultImpl_ESTest":
+                    continue
+                # class_str += f"-c {c} "
+                class_str += f"{c} "
+
+            # run_str = f"java -javaagent:{Macros.jacoco_agent_jar} -jar {Macros.junit_jar} -cp evosuite-tests:{Macros.evosuite_runtime_jar}:$(< {deps_file}) {class_str} --details=none &>> {log_file_path}"
+            # need to use &>> instead of &> because we want to save EvoSuite, Randoop and Dev tests' logs into one file
+            if project_name not in ["awslabs_amazon-sqs-java-extended-client-lib"]:
+                log_config = (
+                    f"-Dlogback.configurationFile={Macros.project_dir}/poms/logback.xml"
+                )
+            else:
+                log_config = ""
+            if per_test_exec_dir is not None:
+                returncode = 0
+                for c in sorted(classes):
+                    if c == "de.redsix.pdfcompare.CompareResultImpl_ESTest":
+                        continue
+                    run_str = f"{cls.get_timeout_prefix(time_limit)}java -javaagent:{Macros.jacoco_agent_jar}=destfile={per_test_exec_dir}/{c}.exec {log_config} -cp evosuite-tests:{Macros.evosuite_runtime_jar}:{Macros.junit_jar}:{Macros.raninline_jar}:$(< {deps_file}) org.junit.runner.JUnitCore {c} &> {per_test_exec_dir}/{c}.log"
+                    # one time limit per test class, so that a slow class does not leave the next ones without coverage
+                    try:
+                        with se.TimeUtils.time_limit(
+                            time_limit + 2 * Macros.TIMEOUT_KILL_AFTER
+                        ):
+                            rc = se.bash.run(run_str).returncode
+                    except se.TimeoutException:
+                        rc = -1
+                    returncode = max(returncode, rc)
+                return returncode
             try:
-                with se.TimeUtils.time_limit(time_limit):
-                    # =inclbootstrapclasses=true
-                    # for each class in classes, build a string like: -c class_name
-                    class_str = ""
-                    for c in classes:
-                        # TODO: hacky way to comment out a class that causes the tests to disappear
-                        if c == "de.redsix.pdfcompare.CompareResultImpl_ESTest":
-                            continue
-                        # class_str += f"-c {c} "
-                        class_str += f"{c} "
-
-                    # run_str = f"java -javaagent:{Macros.jacoco_agent_jar} -jar {Macros.junit_jar} -cp evosuite-tests:{Macros.evosuite_runtime_jar}:$(< {deps_file}) {class_str} --details=none &>> {log_file_path}"
-                    # need to use &>> instead of &> because we want to save EvoSuite, Randoop and Dev tests' logs into one file
-                    if project_name not in [
-                        "awslabs_amazon-sqs-java-extended-client-lib"
-                    ]:
-                        log_config = f"-Dlogback.configurationFile={Macros.project_dir}/poms/logback.xml"
-                    else:
-                        log_config = ""
+                with se.TimeUtils.time_limit(time_limit + 2 * Macros.TIMEOUT_KILL_AFTER):
+                    java = (
+                        cls.get_mutant_env(mutant_id)
+                        + cls.get_timeout_prefix(time_limit)
+                        + "java"
+                    )
+                    junit_core = (
+                        "org.raninline.FailFastJUnitCore"
+                        if fail_fast
+                        else "org.junit.runner.JUnitCore"
+                    )
                     if use_jacoco:
-                        run_str = f"java -javaagent:{Macros.jacoco_agent_jar} {log_config} -cp evosuite-tests:{Macros.evosuite_runtime_jar}:{Macros.junit_jar}:{Macros.raninline_jar}:$(< {deps_file}) org.junit.runner.JUnitCore {class_str} &>> {log_file_path}"
+                        run_str = f"{java} -javaagent:{Macros.jacoco_agent_jar} {log_config} -cp evosuite-tests:{Macros.evosuite_runtime_jar}:{Macros.junit_jar}:{Macros.raninline_jar}:$(< {deps_file}) {junit_core} {class_str} &>> {log_file_path}"
                     else:
-                        run_str = f"java {log_config} -cp evosuite-tests:{Macros.evosuite_runtime_jar}:{Macros.junit_jar}:{Macros.raninline_jar}:$(< {deps_file}) org.junit.runner.JUnitCore {class_str} &>> {log_file_path}"
+                        run_str = f"{java} {log_config} -cp evosuite-tests:{Macros.evosuite_runtime_jar}:{Macros.junit_jar}:{Macros.raninline_jar}:$(< {deps_file}) {junit_core} {class_str} &>> {log_file_path}"
                     print(run_str)
                     run_res = se.bash.run(run_str)
             except se.TimeoutException:
@@ -981,9 +1764,34 @@ class Util:
         return run_res.returncode
 
     @classmethod
-    def configure_file(cls, test_name: str):
+    def configure_file(
+        cls,
+        test_name: str,
+        log_buffer_size: int = Macros.LOG_BUFFER_SIZE,
+        log_flush_interval: int = Macros.LOG_FLUSH_INTERVAL,
+        reduction: str = Macros.REDUCTION_FULL,
+    ):
         test_path = expanduser("~") + "/.inlinegenrc"
-        se.io.dump(test_path, f"inlinetestname={test_name}", se.io.Fmt.txt)
+        se.io.dump(
+            test_path,
+            [
+                f"inlinetestname={test_name}",
+                f"logbuffersize={log_buffer_size}",
+                f"logflushinterval={log_flush_interval}",
+                f"reduction={reduction}",
+            ],
+            se.io.Fmt.txtList,
+        )
+
+    @classmethod
+    def is_evaluated_mutant(cls, mutant: dict) -> bool:
+        # mutants that do not compile or are equivalent by TCE are not evaluated
+        if mutant.get("compilation_failure", False):
+            return False
+        return mutant.get("tce_status") not in [
+            Macros.TCE_EQUIVALENT,
+            Macros.TCE_DUPLICATE,
+        ]
 
     @classmethod
     def get_killed_mutants(
@@ -1003,12 +1811,19 @@ class Util:
             timeout = 600
             if test_type == Macros.evosuite:
                 timeout = 3600
-            killed_mutants_set = {
-                index
-                for index, mutated_result in enumerate(mutated_results)
-                if mutated_result[f"{test_type}-killed"]
-                or mutated_result[f"{test_type}-time"] >= timeout
-            }
+            killed_mutants_set = set()
+            for index, mutated_result in enumerate(mutated_results):
+                if mutated_result[f"{test_type}-killed"]:
+                    killed_mutants_set.add(index)
+                elif f"{test_type}-kill-category" in mutated_result:
+                    # the timeout of the mutant was derived from the time of the tests without mutant
+                    if (
+                        mutated_result[f"{test_type}-kill-category"]
+                        == Macros.KILL_CATEGORY_TIMEOUT
+                    ):
+                        killed_mutants_set.add(index)
+                elif mutated_result[f"{test_type}-time"] >= timeout:
+                    killed_mutants_set.add(index)
             # if len(killed_mutants_set) == 0:
             #     continue
             results_list.append(killed_mutants_set)
@@ -1083,14 +1898,7 @@ class Util:
 
     @classmethod
     def get_excluded_projects(cls):
-        return (
-            Macros.projects_without_target_stmts
-            + Macros.projects_without_covered_stmts
-            + Macros.projects_needs_to_be_excluded
-            + Macros.projects_with_jacoco_exception
-            + Macros.project_with_timeout
-            + Macros.projects_with_no_inline_tests
-        )
+        return Macros.excluded_projects
 
     @classmethod
     def get_projs_to_stmts_and_inline_tests(cls, data_file: str):
@@ -1236,7 +2044,7 @@ class Util:
             with se.TimeUtils.time_limit(timeout):
                 with se.io.cd(Macros.java_raninline_dir):
                     se.bash.run(
-                        f'mvn exec:java -Dexec.mainClass="org.raninline.App" -Dexec.args="a {inline_test_log_path}"',
+                        mvn_cmd(f'exec:java -Dexec.mainClass="org.raninline.App" -Dexec.args="a {inline_test_log_path}"'),
                         0,
                     )
         except se.TimeoutException as e:
@@ -1303,14 +2111,22 @@ class Util:
             return
 
         regression_test_file = generated_tests_dir / "RegressionTest.java"
+        regression_test_java_files = [
+            file
+            for file in generated_tests_dir.glob("RegressionTest*.java")
+            if file != regression_test_file
+        ]
+        # sharded generation: each shard has a suite RegressionTestShard{i}_ of its own tests
+        shard_suite_files = [
+            file
+            for file in regression_test_java_files
+            if re.fullmatch(r"RegressionTestShard\d+_", file.stem)
+        ]
+        if shard_suite_files:
+            regression_test_java_files = shard_suite_files
 
-        if not regression_test_file.exists():
+        if not regression_test_file.exists() or len(regression_test_java_files) > 1:
             print(f"fixing {project_name}...")
-            # list all java files
-            regression_test_java_files = generated_tests_dir.glob(
-                "RegressionTest*.java"
-            )
-            regression_test_java_files = list(regression_test_java_files)
             if regression_test_java_files:
                 # create a RegressionTest.java file
                 with open(regression_test_file, "w") as f:
@@ -1322,7 +2138,7 @@ class Util:
                         + ", ".join(
                             [
                                 f"{file.stem}.class"
-                                for file in regression_test_java_files
+                                for file in sorted(regression_test_java_files)
                             ]
                         )
                         + r"})"
@@ -1330,37 +2146,13 @@ class Util:
                     )
                     f.write(r"public class RegressionTest {}")
         else:
-            # check if there are multiple RegressionTest*.java files
-            regression_test_java_files = generated_tests_dir.glob(
-                "RegressionTest*.java"
-            )
-            regression_test_java_files = list(regression_test_java_files)
-            if len(regression_test_java_files) > 1:
-                # create a RegressionTest.java file
-                with open(regression_test_file, "w") as f:
-                    f.write(r"import org.junit.runner.RunWith;" + "\n")
-                    f.write(r"import org.junit.runners.Suite;" + "\n")
-                    f.write(r"@RunWith(Suite.class)" + "\n")
-                    f.write(
-                        r"@Suite.SuiteClasses({"
-                        + ", ".join(
-                            [
-                                f"{file.stem}.class"
-                                for file in regression_test_java_files
-                            ]
-                        )
-                        + r"})"
-                        + "\n"
-                    )
-                    f.write(r"public class RegressionTest {}")
-            else:
-                print(f"skip {project_name}")
+            print(f"skip {project_name}")
 
     @classmethod
     def get_dependencies(cls, project_name: str, sha: str, clazz: str):
         Util.prepare_project(project_name, sha)
         with se.io.cd(Macros.downloads_dir / project_name):
-            se.bash.run("mvn clean compile test-compile", 0)
+            se.bash.run(mvn_cmd("clean compile test-compile"), 0)
             # copy the randoop-deps.txt file to the project root
             deps_file = Util.get_deps_file_path(project_name, sha)
             se.bash.run(f"cp {deps_file} .")
@@ -1399,7 +2191,7 @@ class Util:
     @classmethod
     def compile_raninline(cls):
         with se.io.cd(Macros.java_raninline_dir):
-            se.bash.run("mvn clean package", 0)
+            se.bash.run(mvn_cmd("clean package"), 0)
 
     @classmethod
     def get_auto_generated_files(cls):
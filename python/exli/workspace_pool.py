@@ -0,0 +1,88 @@
+import shutil
+from pathlib import Path
+
+import seutil as se
+from exli.macros import Macros
+from exli.maven import mvn_cmd
+
+
+class WorkspacePool:
+    """
+    Pristine, pre-built git worktrees of the project versions, used to reset the working copy of a project (_downloads/<project>) instead of checking out and cleaning it.
+
+    A pristine worktree is created once per project version with `git worktree add --detach` and compiled. Resetting the working copy restores its files (except .git) from the pristine worktree, with rsync if available, otherwise with a copy-on-write copy (cp --reflink=auto), so build outputs stay warm and only changed files are written.
+    """
+
+    PRISTINE_MARKER = ".exli-pristine"
+
+    def __init__(self, pool_dir: str = None):
+        """
+        Args:
+            pool_dir (str, optional): The directory of the pristine worktrees. Defaults to Macros.workspace_pool_dir.
+        """
+        if pool_dir is None:
+            pool_dir = Macros.workspace_pool_dir
+        self.pool_dir = Path(pool_dir)
+
+    def get_pristine_dir(self, project_name: str, sha: str) -> Path:
+        return self.pool_dir / f"{project_name}-{sha}"
+
+    def has_pristine(self, project_name: str, sha: str) -> bool:
+        pristine_dir = self.get_pristine_dir(project_name, sha)
+        return (pristine_dir / self.PRISTINE_MARKER).exists()
+
+    def build_pristine(self, project_name: str, sha: str) -> Path:
+        """
+        Create and compile the pristine worktree of the project version, the project must be cloned in Macros.downloads_dir.
+
+        Returns:
+            Path: The pristine worktree.
+        """
+        clone_dir = Macros.downloads_dir / project_name
+        pristine_dir = self.get_pristine_dir(project_name, sha)
+        if pristine_dir.exists():
+            se.bash.run(f"git -C {clone_dir} worktree remove --force {pristine_dir}")
+            se.io.rm(pristine_dir)
+        se.bash.run(f"git -C {clone_dir} worktree prune")
+        se.io.mkdir(self.pool_dir)
+        se.bash.run(f"git -C {clone_dir} worktree add --detach {pristine_dir} {sha}", 0)
+        with se.io.cd(pristine_dir):
+            # a failed build still gives a pristine source tree
+            rr = se.bash.run(mvn_cmd(f"test-compile {Macros.SKIPS}"))
+            if rr.returncode != 0:
+                print(f"failed to build the pristine worktree of {project_name}-{sha}")
+        # written last, a partially built worktree is rebuilt
+        se.io.dump(pristine_dir / self.PRISTINE_MARKER, sha, se.io.Fmt.txt)
+        return pristine_dir
+
+    def reset(self, project_name: str, sha: str):
+        """
+        Reset the working copy of the project to the pristine worktree of the project version, building it first if needed.
+        """
+        if not self.has_pristine(project_name, sha):
+            self.build_pristine(project_name, sha)
+        clone_dir = Macros.downloads_dir / project_name
+        pristine_dir = self.get_pristine_dir(project_name, sha)
+        # move HEAD and the index, only the files that differ from the current checkout are written
+        se.bash.run(f"git -C {clone_dir} checkout -f --detach {sha}", 0)
+        if shutil.which("rsync") is not None:
+            se.bash.run(
+                f"rsync -a --delete --exclude=/.git --exclude=/{self.PRISTINE_MARKER} {pristine_dir}/ {clone_dir}/",
+                0,
+            )
+        else:
+            se.bash.run(
+                f"find {clone_dir} -mindepth 1 -maxdepth 1 ! -name .git -exec rm -rf {{}} +",
+                0,
+            )
+            se.bash.run(
+                f"find {pristine_dir} -mindepth 1 -maxdepth 1 ! -name .git ! -name {self.PRISTINE_MARKER} -exec cp -a --reflink=auto {{}} {clone_dir}/ \\;",
+                0,
+            )
+
+    def remove(self, project_name: str, sha: str):
+        clone_dir = Macros.downloads_dir / project_name
+        pristine_dir = self.get_pristine_dir(project_name, sha)
+        se.bash.run(f"git -C {clone_dir} worktree remove --force {pristine_dir}")
+        se.io.rm(pristine_dir)
+        se.bash.run(f"git -C {clone_dir} worktree prune")